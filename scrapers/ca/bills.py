@@ -4,12 +4,12 @@ import pytz
 import operator
 import itertools
 import datetime
-from lxml import etree, html
+from lxml import html
 from utils import LXMLMixin
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, selectinload
 from sqlalchemy import create_engine
 from openstates.scrape import Scraper, Bill, VoteEvent
-from .models import CABill
+from .models import CABill, CAVoteSummary
 from .actions import CACategorizer
 
 SPONSOR_TYPES = {
@@ -22,6 +22,20 @@ MYSQL_HOST = os.environ.get("MYSQL_HOST", "localhost")
 MYSQL_USER = os.environ.get("MYSQL_USER", "root")
 MYSQL_PASSWORD = os.environ.get("MYSQL_PASSWORD", "")
 
+# bills are loaded this many at a time, along with everything below
+BILL_CHUNK_SIZE = 500
+
+# every relation scrape_bill_type walks, so a chunk of bills costs one
+# query per relation instead of several per bill (authors and the vote
+# records are backrefs, which only exist once the mappers are configured)
+BILL_LOAD_OPTIONS = (
+    selectinload(CABill.versions).selectinload("authors"),
+    selectinload(CABill.actions),
+    selectinload(CABill.votes).joinedload(CAVoteSummary.location),
+    selectinload(CABill.votes).joinedload(CAVoteSummary.motion),
+    selectinload(CABill.votes).selectinload("votes"),
+)
+
 
 def clean_title(s):
     # replace smart quote characters
@@ -244,7 +258,7 @@ class CABillScraper(Scraper, LXMLMixin):
                 raise KeyError
             return committee_abbr_to_name[other_chamber][slugify(abbr)]
 
-    def scrape(self, chamber=None, session=None):
+    def scrape(self, chamber=None, session=None, chunk_size=BILL_CHUNK_SIZE):
         if session is None:
             session = self.jurisdiction.legislative_sessions[-1]["identifier"]
             self.info("no session specified, using %s", session)
@@ -269,7 +283,9 @@ class CABillScraper(Scraper, LXMLMixin):
 
         for chamber in chambers:
             for abbr, type_ in bill_types[chamber].items():
-                yield from self.scrape_bill_type(chamber, session, type_, abbr)
+                yield from self.scrape_bill_type(
+                    chamber, session, type_, abbr, chunk_size=int(chunk_size)
+                )
 
     def scrape_bill_type(
         self,
@@ -278,11 +294,17 @@ class CABillScraper(Scraper, LXMLMixin):
         bill_type,
         type_abbr,
         committee_abbr_regex=get_committee_name_regex(),
+        chunk_size=BILL_CHUNK_SIZE,
     ):
         bills = (
             self.session.query(CABill)
             .filter_by(session_year=session)
             .filter_by(measure_type=type_abbr)
+            .options(*BILL_LOAD_OPTIONS)
+            .yield_per(chunk_size)
+            # yield_per asks for a server-side cursor, which MySQL won't
+            # let the eager loads share; bill rows are small, so buffer them
+            .execution_options(stream_results=False)
         )
 
         archive_year = int(session[0:4])
@@ -321,17 +343,7 @@ class CABillScraper(Scraper, LXMLMixin):
 
             # Get digest test (aka "summary") from latest version.
             if bill.versions and not_archive_year:
-                version = bill.versions[-1]
-                nsmap = version.xml.nsmap
-                xpath = "//caml:DigestText/xhtml:p"
-                els = version.xml.xpath(xpath, namespaces=nsmap)
-                chunks = []
-                for el in els:
-                    t = etree_text_content(el)
-                    t = re.sub(r"\s+", " ", t)
-                    t = re.sub(r"\)(\S)", lambda m: ") %s" % m.group(1), t)
-                    chunks.append(t)
-                summary = "\n\n".join(chunks)
+                summary = bill.versions[-1].digest
 
             for version in bill.versions:
                 if not version.bill_xml:
@@ -706,8 +718,3 @@ class CABillScraper(Scraper, LXMLMixin):
                         yield fsvote
 
             yield fsbill
-            self.session.expire_all()
-
-
-def etree_text_content(el):
-    return html.fromstring(etree.tostring(el)).text_content()
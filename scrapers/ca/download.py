@@ -5,12 +5,18 @@ The workflow is:
  - Drop & recreate the local capublic database.
  - Inspect the site with regex and determine which files have been updated, if any.
  - For each such file, unzip it & call import.
+
+With --incremental the database is kept, and only the daily archives newer
+than everything recorded in the manifest of applied archives are loaded.
 """
 import os
 import re
 import glob
+import json
+import time
 import os.path
-import subprocess
+import zipfile
+import itertools
 import logging
 import lxml.html
 import argparse
@@ -18,10 +24,20 @@ from datetime import datetime
 from os.path import join, split
 from functools import partial
 from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
 import MySQLdb
 
+try:
+    from ..utils.files import atomic_write
+    from ..utils.settings import cache_path
+except (ImportError, ValueError):
+    # imported as ca.download, with scrapers/ on the path, as in the tests
+    # (Python before 3.9 raises ValueError for a relative import from there)
+    from utils.files import atomic_write
+    from utils.settings import cache_path
+
 
 MYSQL_HOST = os.environ.get("MYSQL_HOST", "localhost")
 MYSQL_USER = os.environ.get("MYSQL_USER", "root")
@@ -29,6 +45,14 @@ MYSQL_PASSWORD = os.environ.get("MYSQL_PASSWORD", "")
 
 BASE_URL = "https://downloads.leginfo.legislature.ca.gov/"
 
+# rows per multi-row REPLACE and threads reading bill xml files
+LOAD_BATCH_SIZE = int(os.environ.get("CA_LOAD_BATCH_SIZE", 500))
+LOAD_XML_WORKERS = int(os.environ.get("CA_LOAD_XML_WORKERS", 8))
+
+# archives loaded into capublic and the timestamps they had on the site
+MANIFEST_PATH = cache_path("ca", "capublic_manifest.json")
+MANIFEST_DATE_FORMAT = "%Y-%m-%d %H:%M"
+
 
 # ----------------------------------------------------------------------------
 # Logging config
@@ -61,7 +85,7 @@ def db_drop():
         connection = MySQLdb.connect(
             host=MYSQL_HOST, user=MYSQL_USER, passwd=MYSQL_PASSWORD, db="capublic"
         )
-    except MySQLdb._exceptions.OperationalError:
+    except MySQLdb.OperationalError:
         # The database doesn't exist.
         logger.info("...no such database. Bailing.")
         return
@@ -75,6 +99,38 @@ def db_drop():
     logger.info("...done.")
 
 
+def db_exists():
+    """Check whether the capublic database exists."""
+    try:
+        connection = MySQLdb.connect(
+            host=MYSQL_HOST, user=MYSQL_USER, passwd=MYSQL_PASSWORD, db="capublic"
+        )
+    except MySQLdb.OperationalError:
+        return False
+    connection.close()
+    return True
+
+
+def read_manifest(path=MANIFEST_PATH):
+    try:
+        with open(path) as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return {}
+    return {
+        filename: datetime.strptime(date, MANIFEST_DATE_FORMAT)
+        for filename, date in manifest.items()
+    }
+
+
+def write_manifest(manifest, path=MANIFEST_PATH):
+    manifest = {
+        filename: date.strftime(MANIFEST_DATE_FORMAT)
+        for filename, date in manifest.items()
+    }
+    atomic_write(path, manifest)
+
+
 # ---------------------------------------------------------------------------
 # Functions for updating the data.
 DatRow = namedtuple(
@@ -122,66 +178,110 @@ def encode_or_none(value):
     return value.encode() if value else None
 
 
-def load_bill_versions(connection):
-    """
-    Given a data folder, read its BILL_VERSION_TBL.dat file in python,
-    construct individual REPLACE statements and execute them one at
-    a time. This method is slower that letting mysql do the import,
-    but doesn't fail mysteriously.
+BILL_VERSION_SQL = """
+    REPLACE INTO capublic.bill_version_tbl (
+        BILL_VERSION_ID,
+        BILL_ID,
+        VERSION_NUM,
+        BILL_VERSION_ACTION_DATE,
+        BILL_VERSION_ACTION,
+        REQUEST_NUM,
+        SUBJECT,
+        VOTE_REQUIRED,
+        APPROPRIATION,
+        FISCAL_COMMITTEE,
+        LOCAL_PROGRAM,
+        SUBSTANTIVE_CHANGES,
+        URGENCY,
+        TAXLEVY,
+        BILL_XML,
+        ACTIVE_FLG,
+        TRANS_UID,
+        TRANS_UPDATE)
+
+    VALUES (%s)
     """
+BILL_VERSION_SQL = BILL_VERSION_SQL % ", ".join(["%s"] * 18)
 
-    sql = """
-        REPLACE INTO capublic.bill_version_tbl (
-            BILL_VERSION_ID,
-            BILL_ID,
-            VERSION_NUM,
-            BILL_VERSION_ACTION_DATE,
-            BILL_VERSION_ACTION,
-            REQUEST_NUM,
-            SUBJECT,
-            VOTE_REQUIRED,
-            APPROPRIATION,
-            FISCAL_COMMITTEE,
-            LOCAL_PROGRAM,
-            SUBSTANTIVE_CHANGES,
-            URGENCY,
-            TAXLEVY,
-            BILL_XML,
-            ACTIVE_FLG,
-            TRANS_UID,
-            TRANS_UPDATE)
-
-        VALUES (%s)
-        """
-    sql = sql % ", ".join(["%s"] * 18)
 
+def bill_version_values(row):
+    """Turn a line of BILL_VERSION_TBL.dat into the values to insert,
+    with the referenced xml file read in place of its filename.
+    """
+    # The files are supposedly already in utf-8, but with
+    # copious bogus characters.
+    row = dat_row_2_tuple(clean_text(row))
+    with open(row.bill_xml) as f:
+        text = clean_text(f.read())
+    row = row._replace(bill_xml=text)
+    return [encode_or_none(column) for column in row]
+
+
+def chunks(iterable, size):
+    iterator = iter(iterable)
+    chunk = list(itertools.islice(iterator, size))
+    while chunk:
+        yield chunk
+        chunk = list(itertools.islice(iterator, size))
+
+
+def load_bill_versions(
+    connection, batch_size=LOAD_BATCH_SIZE, xml_workers=LOAD_XML_WORKERS
+):
+    """
+    Given a data folder, read its BILL_VERSION_TBL.dat file in python
+    and REPLACE its rows `batch_size` at a time, reading the xml files
+    they reference with `xml_workers` threads. This method is slower
+    that letting mysql do the import, but doesn't fail mysteriously.
+    """
     cursor = connection.cursor()
-    with open("BILL_VERSION_TBL.dat") as f:
-        for row in f:
-            # The files are supposedly already in utf-8, but with
-            # copious bogus characters.
-            row = clean_text(row)
-            row = dat_row_2_tuple(row)
-            with open(row.bill_xml) as f:
-                text = f.read()
-                text = clean_text(text)
-                row = row._replace(bill_xml=text)
-                cursor.execute(sql, [encode_or_none(column) for column in row])
+    start = time.time()
+    rows = 0
+
+    def write(futures):
+        # executemany turns this into one multi-row REPLACE
+        cursor.executemany(BILL_VERSION_SQL, [future.result() for future in futures])
+        return len(futures)
+
+    with open("BILL_VERSION_TBL.dat") as f, ThreadPoolExecutor(xml_workers) as pool:
+        pending = []
+        for lines in chunks(f, batch_size):
+            # read the next batch of xml while the previous one is written
+            submitted = [pool.submit(bill_version_values, line) for line in lines]
+            if pending:
+                rows += write(pending)
+            pending = submitted
+        if pending:
+            rows += write(pending)
 
     cursor.close()
+    elapsed = time.time() - start
+    logger.info(
+        "loaded %d bill versions in %.1fs (%.0f rows/sec)"
+        % (rows, elapsed, rows / elapsed if elapsed else rows)
+    )
 
 
-def load(folder, sql_name=partial(re.compile(r"\.dat$").sub, ".sql")):
+def load(
+    folder,
+    sql_name=partial(re.compile(r"\.dat$").sub, ".sql"),
+    batch_size=LOAD_BATCH_SIZE,
+    xml_workers=LOAD_XML_WORKERS,
+    filenames=None,
+):
     """
     Import into mysql any .dat files located in `folder`.
 
-    First get a list of filenames like *.dat, then for each, execute
-    the corresponding .sql file after swapping out windows paths for
-    `folder`.
+    First get a list of filenames like *.dat (unless an iterable of them
+    is passed in as `filenames`, which is consumed as the files are
+    loaded), then for each, execute the corresponding .sql file after
+    swapping out windows paths for `folder`.
 
-    This function doesn't bother to delete the imported data files
-    afterwards; they'll be overwritten within a week, and leaving them
-    around makes testing easier (they're huge).
+    This function doesn't delete the imported data files itself. They're
+    kept by default, since they'll be overwritten within a week and
+    leaving them around makes testing easier (they're huge), but with
+    --low-disk the `filenames` from extract_zip(keep_dat=False) delete
+    each one as soon as it has been loaded.
     """
 
     logger.info("Loading data from %s..." % folder)
@@ -196,7 +296,8 @@ def load(folder, sql_name=partial(re.compile(r"\.dat$").sub, ".sql")):
     )
     connection.autocommit(True)
 
-    filenames = glob.glob("*.dat")
+    if filenames is None:
+        filenames = glob.glob("*.dat")
 
     for filename in filenames:
 
@@ -212,7 +313,7 @@ def load(folder, sql_name=partial(re.compile(r"\.dat$").sub, ".sql")):
         logger.info("loading " + sql_filename)
         if sql_filename == "bill_version_tbl.sql":
             logger.info("inserting xml files (slow)")
-            load_bill_versions(connection)
+            load_bill_versions(connection, batch_size, xml_workers)
         else:
             cursor = connection.cursor()
             cursor.execute(script)
@@ -223,8 +324,8 @@ def load(folder, sql_name=partial(re.compile(r"\.dat$").sub, ".sql")):
     logging.info("...Done loading from %s" % folder)
 
 
-def db_create():
-    """Create the database"""
+def db_create(manifest_path=MANIFEST_PATH):
+    """Create the database, and an empty manifest to go with it"""
 
     logger.info("Creating capublic...")
 
@@ -258,6 +359,9 @@ def db_create():
     connection.close()
     os.chdir("..")
 
+    # none of the archives in the old manifest are in the new database
+    write_manifest({}, manifest_path)
+
 
 def get_contents():
     resp = {}
@@ -274,21 +378,114 @@ def get_contents():
     return resp
 
 
-def _check_call(*args):
-    logging.info("calling " + " ".join(args))
-    subprocess.check_call(args)
+def fetch_zip(filename, chunk_size=1024 * 1024):
+    """Download `filename` from the downloads site into the current directory."""
+    logger.info("downloading " + BASE_URL + filename)
+    with requests.get(BASE_URL + filename, stream=True, verify=False) as response:
+        response.raise_for_status()
+        with open(filename, "wb") as f:
+            for chunk in response.iter_content(chunk_size):
+                f.write(chunk)
+    return filename
+
+
+CRC_INDEX = ".crc.json"
+
+
+def extract_zip(path, dirname, keep_dat=True):
+    """
+    Extract the archive at `path` into `dirname`, returning an iterator
+    over the names of its .dat members that yields each one as soon as
+    it's written. Everything else is extracted first, since .dat rows
+    refer to those files.
+
+    Members with the same CRC and size as the file left by the previous
+    extraction are not written again, and files that are no longer in
+    the archive are removed. With `keep_dat` false each .dat file is
+    deleted once the caller asks for the next one, so only one is on
+    disk at a time.
+    """
+    # resolve paths now, the loader changes directory before iterating
+    return _extract_members(os.path.abspath(path), os.path.abspath(dirname), keep_dat)
+
+
+def _extract_members(path, dirname, keep_dat):
+    index_path = join(dirname, CRC_INDEX)
+    os.makedirs(dirname, exist_ok=True)
+    try:
+        with open(index_path) as f:
+            previous = json.load(f)
+        # only trusted again once this extraction finishes
+        os.remove(index_path)
+    except FileNotFoundError:
+        previous = {}
+
+    index = {}
+    with zipfile.ZipFile(path) as archive:
+        members = [member for member in archive.infolist() if not member.is_dir()]
+        members.sort(key=lambda member: member.filename.lower().endswith(".dat"))
+
+        for member in members:
+            target = join(dirname, member.filename)
+            index[member.filename] = [member.CRC, member.file_size]
+            if not (
+                previous.get(member.filename) == index[member.filename]
+                and os.path.isfile(target)
+                and os.path.getsize(target) == member.file_size
+            ):
+                archive.extract(member, dirname)
+
+            if member.filename.lower().endswith(".dat"):
+                yield member.filename
+                if not keep_dat:
+                    os.remove(target)
+
+    for root, _, files in os.walk(dirname):
+        for name in files:
+            name = os.path.relpath(join(root, name), dirname)
+            if name != CRC_INDEX and name.replace(os.sep, "/") not in index:
+                os.remove(join(dirname, name))
+
+    with open(index_path, "w") as f:
+        json.dump(index, f)
 
 
 def get_zip(filename):
     dirname = filename.replace(".zip", "")
-    _check_call("wget", "--no-check-certificate", BASE_URL + filename)
-    _check_call("rm", "-rf", dirname)
-    _check_call("unzip", filename, "-d", dirname)
-    _check_call("rm", "-rf", filename)
+    fetch_zip(filename)
+    for _ in extract_zip(filename, dirname):
+        pass
+    os.remove(filename)
     return dirname
 
 
-def get_data(contents, year):
+def load_zip(
+    filename, batch_size=LOAD_BATCH_SIZE, xml_workers=LOAD_XML_WORKERS, keep_dat=True
+):
+    """Download `filename` and load each of its tables as it's extracted."""
+    dirname = filename.replace(".zip", "")
+    fetch_zip(filename)
+    load(
+        dirname,
+        batch_size=batch_size,
+        xml_workers=xml_workers,
+        filenames=extract_zip(filename, dirname, keep_dat),
+    )
+    os.remove(filename)
+
+
+def is_daily(filename):
+    date_part = filename.replace("pubinfo_", "").replace(".zip", "")
+    return date_part.startswith("daily")
+
+
+def get_data(
+    contents,
+    year,
+    batch_size=LOAD_BATCH_SIZE,
+    xml_workers=LOAD_XML_WORKERS,
+    keep_dat=True,
+):
     newest_file = "2000"
     newest_file_date = datetime(2000, 1, 1)
     files_to_get = []
@@ -298,24 +495,97 @@ def get_data(contents, year):
     else:
         # get file for latest date
         for filename, date in contents.items():
-            date_part = filename.replace("pubinfo_", "").replace(".zip", "")
-            if date_part.startswith("daily") and date > newest_file_date:
+            if is_daily(filename) and date > newest_file_date:
                 newest_file = filename
                 newest_file_date = date
         files_to_get.append(newest_file)
 
+    # the database was just recreated, so start a new manifest
+    manifest = {}
     for file in files_to_get:
-        dirname = get_zip(file)
-        load(dirname)
+        load_zip(file, batch_size, xml_workers, keep_dat)
+        if file in contents:
+            manifest[file] = contents[file]
+    write_manifest(manifest)
+
+
+def get_updates(contents, manifest):
+    """
+    Return the daily archives in `contents` that haven't been applied yet,
+    oldest first.
+
+    Daily archives are named after the weekday and replaced every week, so
+    one is skipped if its timestamp is the one recorded in `manifest`, and
+    anything older than the newest archive already applied would undo
+    newer data.
+    """
+    applied = max(manifest.values()) if manifest else None
+    return [
+        filename
+        for filename, date in sorted(contents.items(), key=lambda item: item[1])
+        if is_daily(filename)
+        and manifest.get(filename) != date
+        and (applied is None or date > applied)
+    ]
+
+
+def get_incremental_data(
+    contents,
+    manifest,
+    batch_size=LOAD_BATCH_SIZE,
+    xml_workers=LOAD_XML_WORKERS,
+    keep_dat=True,
+):
+    updates = get_updates(contents, manifest)
+    if not updates:
+        logger.info("capublic is up to date")
+
+    for file in updates:
+        load_zip(file, batch_size, xml_workers, keep_dat)
+        # record each archive as soon as it's in, so a failed run picks up
+        # where it left off
+        manifest[file] = contents[file]
+        write_manifest(manifest)
 
 
 if __name__ == "__main__":
     my_parser = argparse.ArgumentParser()
     my_parser.add_argument("--year", action="store", type=int)
+    my_parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="apply new daily archives on top of the existing database",
+    )
+    my_parser.add_argument(
+        "--low-disk",
+        action="store_true",
+        help="delete each extracted .dat file once it has been loaded",
+    )
+    my_parser.add_argument(
+        "--batch-size", action="store", type=int, default=LOAD_BATCH_SIZE
+    )
+    my_parser.add_argument(
+        "--xml-workers", action="store", type=int, default=LOAD_XML_WORKERS
+    )
     args = my_parser.parse_args()
     year = args.year
-
-    db_drop()
-    db_create()
-    contents = get_contents()
-    get_data(contents, year)
+    if args.incremental and year:
+        my_parser.error("--incremental can't be combined with --year")
+
+    if args.incremental:
+        if not db_exists():
+            # a database from scratch, so every archive is loaded afresh
+            db_create()
+        contents = get_contents()
+        get_incremental_data(
+            contents,
+            read_manifest(),
+            args.batch_size,
+            args.xml_workers,
+            not args.low_disk,
+        )
+    else:
+        db_drop()
+        db_create()
+        contents = get_contents()
+        get_data(contents, year, args.batch_size, args.xml_workers, not args.low_disk)
@@ -1,3 +1,8 @@
+import os
+import re
+import json
+from collections import OrderedDict
+
 from sqlalchemy import (
     Column,
     Integer,
@@ -11,10 +16,31 @@ from sqlalchemy.sql import and_
 from sqlalchemy.orm import backref, relation, foreign
 from sqlalchemy.ext.declarative import declarative_base
 
-from lxml import etree
+from lxml import etree, html
+
+from utils.files import atomic_write
+from utils.settings import cache_path, truthy
 
 Base = declarative_base()
 
+# Parsed bill_xml documents, shared by every CABillVersion loaded for the
+# same version, and the most that are kept around at once.
+XML_CACHE_SIZE = 256
+_parsed_xml = OrderedDict()
+
+# With CA_XML_FIELDS_CACHE=1 the fields read from each version's bill_xml
+# are stored here, so later scrapes of an unchanged version don't parse it
+# at all.
+XML_FIELDS_CACHE_DIR = (
+    cache_path("ca", "xml_fields")
+    if truthy(os.environ.get("CA_XML_FIELDS_CACHE"))
+    else None
+)
+
+
+def etree_text_content(el):
+    return html.fromstring(etree.tostring(el)).text_content()
+
 
 class CABill(Base):
     __tablename__ = "bill_tbl"
@@ -81,23 +107,77 @@ class CABillVersion(Base):
     trans_uid = Column(String(30))
     trans_update = Column(DateTime)
 
+    @property
+    def cache_key(self):
+        # trans_update changes whenever the row, and so bill_xml, does
+        return (self.bill_version_id, self.trans_update)
+
     @property
     def xml(self):
-        if "_xml" not in self.__dict__:
-            self._xml = etree.fromstring(
+        key = self.cache_key
+        try:
+            doc = _parsed_xml[key]
+            _parsed_xml.move_to_end(key)
+        except KeyError:
+            doc = _parsed_xml[key] = etree.fromstring(
                 self.bill_xml.encode("utf-8"), etree.XMLParser(recover=True)
             )
-        return self._xml
+            if len(_parsed_xml) > XML_CACHE_SIZE:
+                _parsed_xml.popitem(last=False)
+        return doc
+
+    @property
+    def fields(self):
+        """The title, short title and digest from bill_xml."""
+        if "_fields" not in self.__dict__:
+            path = self._fields_cache_path()
+            if path and os.path.exists(path):
+                with open(path) as f:
+                    self._fields = json.load(f)
+            else:
+                self._fields = self._read_fields()
+                if path:
+                    atomic_write(path, self._fields)
+        return self._fields
+
+    def _fields_cache_path(self):
+        if not XML_FIELDS_CACHE_DIR or self.trans_update is None:
+            return None
+        return os.path.join(
+            XML_FIELDS_CACHE_DIR,
+            "%s-%s.json"
+            % (self.bill_version_id, self.trans_update.strftime("%Y%m%d%H%M%S")),
+        )
+
+    def _read_fields(self):
+        title = self.xml.xpath("string(//*[local-name() = 'Title'])") or ""
+        short_title = self.xml.xpath("string(//*[local-name() = 'Subject'])") or ""
+
+        chunks = []
+        els = self.xml.xpath("//caml:DigestText/xhtml:p", namespaces=self.xml.nsmap)
+        for el in els:
+            t = etree_text_content(el)
+            t = re.sub(r"\s+", " ", t)
+            t = re.sub(r"\)(\S)", lambda m: ") %s" % m.group(1), t)
+            chunks.append(t)
+
+        return {
+            "title": title.strip(),
+            "short_title": short_title.strip(),
+            "digest": "\n\n".join(chunks),
+        }
 
     @property
     def title(self):
-        text = self.xml.xpath("string(//*[local-name() = 'Title'])") or ""
-        return text.strip()
+        return self.fields["title"]
 
     @property
     def short_title(self):
-        text = self.xml.xpath("string(//*[local-name() = 'Subject'])") or ""
-        return text.strip()
+        return self.fields["short_title"]
+
+    @property
+    def digest(self):
+        return self.fields["digest"]
 
 
 class CABillVersionAuthor(Base):
@@ -0,0 +1,188 @@
+"""
+Count the SQL statements CABillScraper.scrape_bill_type issues per 1,000
+bills, with and without eager loading, against a SQLite copy of the
+capublic models.
+
+    $ cd scrapers && python -m ca.tests.bench_bill_queries --bills 1000
+"""
+
+import argparse
+import datetime
+import sqlite3
+import tempfile
+import time
+import warnings
+from unittest import mock
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from openstates.scrape import Scraper
+
+from ca import bills
+from ca.models import (
+    Base,
+    CABill,
+    CABillAction,
+    CABillVersion,
+    CABillVersionAuthor,
+    CALocation,
+    CAMotion,
+    CAVoteDetail,
+    CAVoteSummary,
+)
+
+SESSION = "20192020"
+BILL_XML = (
+    '<caml:MeasureDoc xmlns:caml="http://lc.ca.gov/legalservices/schemas/caml.1#" '
+    'xmlns:xhtml="http://www.w3.org/1999/xhtml">'
+    "<caml:Title>An act to add Section %d to the Health Code.</caml:Title>"
+    "<caml:Subject>Public health.</caml:Subject>"
+    "<caml:DigestText><xhtml:p>Existing law ...</xhtml:p></caml:DigestText>"
+    "</caml:MeasureDoc>"
+)
+
+
+def populate(session, count, versions=3, actions=10, votes=3, voters=40):
+    date = datetime.datetime(2019, 1, 7)
+    session.add(CAMotion(motion_id=1, motion_text="AB Third Reading"))
+    session.add(
+        CALocation(
+            session_year=SESSION,
+            location_code="AFLOOR",
+            location_type="F",
+            consent_calendar_code="0",
+            description="Asm Floor",
+        )
+    )
+    history_id = 0
+    for num in range(1, count + 1):
+        bill_id = "%s0AB%d" % (SESSION, num)
+        session.add(
+            CABill(
+                bill_id=bill_id,
+                session_year=SESSION,
+                session_num="0",
+                measure_type="AB",
+                measure_num=num,
+            )
+        )
+        for v in range(versions):
+            version_id = "%sV%d" % (bill_id, v)
+            session.add(
+                CABillVersion(
+                    bill_version_id=version_id,
+                    bill_id=bill_id,
+                    version_num=v,
+                    bill_version_action_date=date,
+                    bill_version_action="Introduced",
+                    vote_required="Majority",
+                    bill_xml=BILL_XML % num,
+                    trans_update=date,
+                )
+            )
+            session.add(
+                CABillVersionAuthor(
+                    bill_version_id=version_id,
+                    name="Author %d-%d" % (num, v),
+                    contribution="LEAD_AUTHOR",
+                    primary_author_flg="Y",
+                    trans_update=date,
+                )
+            )
+        for a in range(actions):
+            history_id += 1
+            session.add(
+                CABillAction(
+                    bill_id=bill_id,
+                    bill_history_id=history_id,
+                    action_date=date + datetime.timedelta(days=a),
+                    action="Read first time. To print.",
+                    primary_location="Assembly",
+                )
+            )
+        for seq in range(votes):
+            vote_date = date + datetime.timedelta(days=seq)
+            session.add(
+                CAVoteSummary(
+                    bill_id=bill_id,
+                    location_code="AFLOOR",
+                    vote_date_time=vote_date,
+                    vote_date_seq=seq,
+                    motion_id=1,
+                    vote_result="(PASS)",
+                    trans_update=vote_date,
+                )
+            )
+            for voter in range(voters):
+                session.add(
+                    CAVoteDetail(
+                        bill_id=bill_id,
+                        location_code="AFLOOR",
+                        vote_date_time=vote_date,
+                        vote_date_seq=seq,
+                        motion_id=1,
+                        legislator_name="Member%d" % voter,
+                        vote_code="AYE",
+                        trans_uid="LEGI",
+                        trans_update=vote_date,
+                    )
+                )
+    session.commit()
+
+
+def run(engine, count, load_options, chunk_size):
+    scraper = bills.CABillScraper.__new__(bills.CABillScraper)
+    Scraper.__init__(scraper, None, tempfile.mkdtemp())
+    scraper.session = sessionmaker(bind=engine)()
+
+    statements = [0]
+
+    def count_statement(*args):
+        statements[0] += 1
+
+    event.listen(engine, "before_cursor_execute", count_statement)
+    start = time.time()
+    with mock.patch.object(bills, "BILL_LOAD_OPTIONS", load_options):
+        scraped = sum(
+            1
+            for obj in scraper.scrape_bill_type(
+                "lower", SESSION, "bill", "AB", chunk_size=chunk_size
+            )
+            if isinstance(obj, bills.Bill)
+        )
+    elapsed = time.time() - start
+    event.remove(engine, "before_cursor_execute", count_statement)
+    scraper.session.close()
+
+    assert scraped == count, scraped
+    return statements[0] * 1000 / count, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bills", type=int, default=1000)
+    parser.add_argument("--chunk-size", type=int, default=bills.BILL_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    # sqlite has no native Numeric, which bill_history_id is declared as
+    warnings.filterwarnings("ignore", "Dialect sqlite")
+    # the composite IN that loads vote records binds raw datetimes, make
+    # sqlite3 format them the way SQLAlchemy stored them
+    sqlite3.register_adapter(
+        datetime.datetime, lambda value: value.strftime("%Y-%m-%d %H:%M:%S.%f")
+    )
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    populate(sessionmaker(bind=engine)(), args.bills)
+
+    for name, options in (("lazy", ()), ("eager", bills.BILL_LOAD_OPTIONS)):
+        per_thousand, elapsed = run(engine, args.bills, options, args.chunk_size)
+        print(
+            "%-5s %8.0f statements per 1,000 bills  %6.2fs"
+            % (name, per_thousand, elapsed)
+        )
+
+
+if __name__ == "__main__":
+    main()
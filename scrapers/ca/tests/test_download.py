@@ -0,0 +1,154 @@
+import os
+import shutil
+import tempfile
+import unittest
+import zipfile
+from datetime import datetime
+from unittest import mock
+
+from ca import download
+from utils.tests.fixture_server import FixtureServer
+
+here = os.path.dirname(__file__)
+fixtures = os.path.join(here, "fixtures")
+
+
+class TestExtractZip(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.zip = os.path.join(fixtures, "pubinfo_daily_Mon.zip")
+        self.dirname = os.path.join(self.tmp, "pubinfo_daily_Mon")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_dat_members_come_last(self):
+        extracted = []
+        for name in download.extract_zip(self.zip, self.dirname):
+            # whatever the rows refer to is already on disk
+            self.assertTrue(
+                os.path.exists(os.path.join(self.dirname, "BILL_VERSION_TBL_1.lob"))
+            )
+            extracted.append(name)
+        self.assertEqual(sorted(extracted), ["BILL_TBL.dat", "BILL_VERSION_TBL.dat"])
+
+    def test_unchanged_members_are_skipped(self):
+        list(download.extract_zip(self.zip, self.dirname))
+        with mock.patch.object(zipfile.ZipFile, "extract") as extract:
+            list(download.extract_zip(self.zip, self.dirname))
+        self.assertEqual(extract.call_count, 0)
+
+    def test_changed_and_stale_files(self):
+        list(download.extract_zip(self.zip, self.dirname))
+        with open(os.path.join(self.dirname, "BILL_TBL.dat"), "w") as f:
+            f.write("truncated")
+        with open(os.path.join(self.dirname, "OLD_TBL.dat"), "w") as f:
+            f.write("from last week")
+
+        list(download.extract_zip(self.zip, self.dirname))
+        with zipfile.ZipFile(self.zip) as archive:
+            expected = archive.read("BILL_TBL.dat").decode()
+        with open(os.path.join(self.dirname, "BILL_TBL.dat")) as f:
+            self.assertEqual(f.read(), expected)
+        self.assertFalse(os.path.exists(os.path.join(self.dirname, "OLD_TBL.dat")))
+
+    def test_low_disk(self):
+        for name in download.extract_zip(self.zip, self.dirname, keep_dat=False):
+            on_disk = [n for n in os.listdir(self.dirname) if n.endswith(".dat")]
+            self.assertEqual(on_disk, [name])
+        self.assertEqual(
+            [n for n in os.listdir(self.dirname) if n.endswith(".dat")], []
+        )
+
+
+class TestLoadZip(unittest.TestCase):
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmp = tempfile.mkdtemp()
+        os.chdir(self.tmp)
+        self.server = FixtureServer(fixtures).start()
+        self.base_url = self.server.base_url
+
+    def tearDown(self):
+        self.server.stop()
+        os.chdir(self.cwd)
+        shutil.rmtree(self.tmp)
+
+    def test_tables_loaded_as_extracted(self):
+        loaded = []
+
+        def load(dirname, filenames, **kwargs):
+            self.assertEqual(dirname, "pubinfo_daily_Mon")
+            for filename in filenames:
+                path = os.path.join(self.tmp, dirname, filename)
+                loaded.append((filename, os.path.exists(path)))
+
+        with mock.patch.object(download, "BASE_URL", self.base_url), mock.patch.object(
+            download, "load", load
+        ):
+            download.load_zip("pubinfo_daily_Mon.zip", keep_dat=False)
+
+        self.assertEqual(
+            sorted(loaded), [("BILL_TBL.dat", True), ("BILL_VERSION_TBL.dat", True)]
+        )
+        self.assertEqual(os.listdir(self.tmp), ["pubinfo_daily_Mon"])
+
+
+class TestManifest(unittest.TestCase):
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmp = tempfile.mkdtemp()
+        os.chdir(self.tmp)
+        self.manifest_path = os.path.join(self.tmp, "manifest.json")
+        self.contents = {
+            "pubinfo_daily_Mon.zip": datetime(2021, 3, 1, 23),
+            "pubinfo_daily_Tue.zip": datetime(2021, 3, 2, 23),
+            "pubinfo_daily_Wed.zip": datetime(2021, 3, 3, 23),
+            "pubinfo_2021.zip": datetime(2021, 3, 3, 22),
+        }
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.tmp)
+
+    def test_updates(self):
+        everything = [
+            "pubinfo_daily_Mon.zip",
+            "pubinfo_daily_Tue.zip",
+            "pubinfo_daily_Wed.zip",
+        ]
+        self.assertEqual(download.get_updates(self.contents, {}), everything)
+        # only what's newer than the newest archive applied
+        manifest = {"pubinfo_daily_Mon.zip": self.contents["pubinfo_daily_Mon.zip"]}
+        self.assertEqual(download.get_updates(self.contents, manifest), everything[1:])
+        manifest["pubinfo_daily_Wed.zip"] = self.contents["pubinfo_daily_Wed.zip"]
+        self.assertEqual(download.get_updates(self.contents, manifest), [])
+        # Monday's archive has been replaced since it was applied, but the
+        # new one is older than Wednesday's, which it would partly undo
+        contents = dict(self.contents)
+        contents["pubinfo_daily_Mon.zip"] = datetime(2021, 3, 3, 12)
+        self.assertEqual(download.get_updates(contents, manifest), [])
+        # next week's Monday
+        contents["pubinfo_daily_Mon.zip"] = datetime(2021, 3, 8, 23)
+        self.assertEqual(
+            download.get_updates(contents, manifest), ["pubinfo_daily_Mon.zip"]
+        )
+
+    def test_new_database_starts_a_new_manifest(self):
+        download.write_manifest(self.contents, self.manifest_path)
+        os.mkdir("pubinfo_load")
+        with open(os.path.join("pubinfo_load", "capublic.sql"), "w") as f:
+            f.write("CREATE DATABASE capublic")
+
+        with mock.patch.object(
+            download, "get_zip", return_value="pubinfo_load"
+        ), mock.patch.object(download.MySQLdb, "connect", create=True):
+            download.db_create(self.manifest_path)
+
+        manifest = download.read_manifest(self.manifest_path)
+        self.assertEqual(manifest, {})
+        self.assertEqual(len(download.get_updates(self.contents, manifest)), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import datetime
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from ca import models
+from ca.models import CABillVersion
+
+BILL_XML = (
+    '<caml:MeasureDoc xmlns:caml="http://lc.ca.gov/legalservices/schemas/caml.1#" '
+    'xmlns:xhtml="http://www.w3.org/1999/xhtml">'
+    "<caml:Title> An act to add Section %d to the Health Code. </caml:Title>"
+    "<caml:Subject>Public health.</caml:Subject>"
+    "<caml:DigestText><xhtml:p>Existing law (1)requires   this.</xhtml:p>"
+    "<xhtml:p>This bill would not.</xhtml:p></caml:DigestText>"
+    "</caml:MeasureDoc>"
+)
+
+
+def version(num=1, updated=datetime.datetime(2021, 1, 5)):
+    return CABillVersion(
+        bill_version_id="20210AB%d99INT" % num,
+        bill_xml=BILL_XML % num,
+        trans_update=updated,
+    )
+
+
+class TestBillXmlCache(unittest.TestCase):
+    def setUp(self):
+        models._parsed_xml.clear()
+
+    def test_fields(self):
+        v = version()
+        self.assertEqual(v.title, "An act to add Section 1 to the Health Code.")
+        self.assertEqual(v.short_title, "Public health.")
+        self.assertEqual(
+            v.digest, "Existing law (1) requires this.\n\nThis bill would not."
+        )
+
+    def test_parsed_once_per_version(self):
+        self.assertIs(version().xml, version().xml)
+        updated = version(updated=datetime.datetime(2021, 2, 1))
+        self.assertIsNot(version().xml, updated.xml)
+
+    def test_cache_is_bounded(self):
+        with mock.patch.object(models, "XML_CACHE_SIZE", 2):
+            for num in range(5):
+                version(num).xml
+        self.assertEqual(len(models._parsed_xml), 2)
+
+    def test_fields_cached_on_disk(self):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        with mock.patch.object(models, "XML_FIELDS_CACHE_DIR", tmp):
+            expected = version().fields
+            models._parsed_xml.clear()
+            with mock.patch.object(models.etree, "fromstring") as parse:
+                self.assertEqual(version().fields, expected)
+            self.assertEqual(parse.call_count, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -77,6 +77,7 @@ committees_rgx = "(%s)" % "|".join(sorted(committees, key=len, reverse=True))
 
 class Categorizer(BaseCategorizer):
     rules = rules
+    compiled = True
 
     def categorize(self, text):
         """Wrap categorize and add boilerplate committees.
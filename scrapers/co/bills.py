@@ -32,6 +32,8 @@ BAD_URLS = [
 
 
 class COBillScraper(Scraper, LXMLMixin):
+    # each vote page is parsed by scrape_votes and again by scrape_vote
+    lxmlize_memo_size = 128
     _tz = pytz.timezone("US/Mountain")
     categorizer = Categorizer()
 
@@ -6,6 +6,8 @@ from utils import LXMLMixin
 
 
 class COEventScraper(Scraper, LXMLMixin):
+    # hearings held jointly are linked from each committee's page
+    lxmlize_memo_size = 128
     _tz = pytz.timezone("America/Denver")
 
     def scrape(self, chamber=None, session=None):
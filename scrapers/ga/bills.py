@@ -2,6 +2,7 @@ import re
 from collections import defaultdict
 
 from openstates.scrape import Scraper, Bill, VoteEvent
+from utils.governor import governor
 
 from .util import get_client, get_url, backoff, SESSION_SITE_IDS
 
@@ -281,3 +282,5 @@ class GABillScraper(Scraper):
             bill.add_source(SOURCE_URL.format(**{"session": session, "bid": guid}))
 
             yield bill
+
+        governor.log_metrics(self.logger)
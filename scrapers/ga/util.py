@@ -2,9 +2,10 @@ from suds.client import Client
 import logging
 import socket
 import urllib.error
-import time
 import suds
 
+from utils.governor import governor
+
 logging.getLogger("suds").setLevel(logging.WARNING)
 log = logging.getLogger("openstates")
 
@@ -21,29 +22,29 @@ def get_url(service):
     return url % (service)
 
 
-def backoff(function, *args, **kwargs):
-    retries = 5
+# their server can't handle much load, so one request a second, backing
+# off from 15 seconds when it breaks
+governor_host = governor.host(url, rate=1, backoff_base=15.0)
 
-    def _():
-        time.sleep(1)  # Seems like their server can't handle the load.
-        return function(*args, **kwargs)
 
-    for attempt in range(retries):
+def backoff(function, *args, **kwargs):
+    def _():
         try:
-            return _()
-        except (socket.timeout, urllib.error.URLError, suds.WebFault) as e:
+            return function(*args, **kwargs)
+        except suds.WebFault as e:
             if "This Roll Call Vote is not published." in str(e):
                 raise ValueError("Roll Call Vote isn't published")
-
-            backoff = (attempt + 1) * 15
-            log.warning(
-                "[attempt %s]: Connection broke. Backing off for %s seconds."
-                % (attempt, backoff)
-            )
-            log.info(str(e))
-            time.sleep(backoff)
-
-    raise ValueError("The server's not playing nice. We can't keep slamming it.")
+            raise
+
+    try:
+        return governor_host.call(
+            _,
+            retries=4,
+            retry_on=(socket.timeout, urllib.error.URLError, suds.WebFault),
+        )
+    except (socket.timeout, urllib.error.URLError, suds.WebFault) as e:
+        log.info(str(e))
+        raise ValueError("The server's not playing nice. We can't keep slamming it.")
 
 
 # available via the session dropdown on
@@ -1,12 +1,11 @@
 # -*- coding: utf-8 -*-
 import re
-import os
 import datetime
 import pytz
 import scrapelib
 import lxml.html
 from openstates.scrape import Scraper, Bill, VoteEvent
-from openstates.utils import convert_pdf
+from utils import HTTPCacheMixin, PDFTextMixin
 
 central = pytz.timezone("US/Central")
 
@@ -266,7 +265,9 @@ def chamber_slug(chamber):
     return "S"
 
 
-class IlBillScraper(Scraper):
+class IlBillScraper(HTTPCacheMixin, PDFTextMixin, Scraper):
+    # roll call PDFs never change once they're posted
+    http_cache_ttls = [(r"/votehistory/.*\.pdf$", None)]
     LEGISLATION_URL = "http://ilga.gov/legislation/grplist.asp"
     localize = pytz.timezone("America/Chicago").localize
 
@@ -609,7 +610,11 @@ class IlBillScraper(Scraper):
         doc = lxml.html.fromstring(html)
         doc.make_links_absolute(votes_url)
 
-        for link in doc.xpath('//a[contains(@href, "votehistory")]'):
+        links = doc.xpath('//a[contains(@href, "votehistory")]')
+        self.prefetch_pdfs(
+            link.get("href") for link in links if link.get("href") not in DUPE_VOTES
+        )
+        for link in links:
 
             if link.get("href") in DUPE_VOTES:
                 continue
@@ -682,11 +687,9 @@ class IlBillScraper(Scraper):
     def fetch_pdf_lines(self, href):
         # download the file
         try:
-            fname, resp = self.urlretrieve(href)
             pdflines = [
-                line.decode("utf-8") for line in convert_pdf(fname, "text").splitlines()
+                line.decode("utf-8") for line in self.pdf_text(href).splitlines()
             ]
-            os.remove(fname)
             return pdflines
         except scrapelib.HTTPError as e:
             assert "404" in e.args[0], "File not found: {}".format(e)
@@ -886,21 +889,18 @@ def find_columns_and_parse(vote_lines):
     return votes
 
 
-def _is_potential_column(line, i):
-    for val in VOTE_VALUES:
-        if re.search(r"^%s\s{2,10}(\w.).*" % val, line[i:]):
-            return True
-    return False
+# where a column could start: a vote value, 2-10 spaces, then a name. As a
+# lookahead, finditer tries it at every position in one pass over the line.
+POTENTIAL_COLUMN = re.compile(
+    r"(?=(?:%s)\s{2,10}\w.)" % "|".join(re.escape(val) for val in VOTE_VALUES)
+)
 
 
 def find_columns(vote_lines):
     potential_columns = []
 
     for line in vote_lines:
-        pcols = set()
-        for i, x in enumerate(line):
-            if _is_potential_column(line, i):
-                pcols.add(i)
+        pcols = {match.start() for match in POTENTIAL_COLUMN.finditer(line)}
         potential_columns.append(pcols)
 
     starter = potential_columns[0]
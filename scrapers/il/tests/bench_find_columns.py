@@ -0,0 +1,84 @@
+"""
+Time finding the columns of IL roll call pages the old way (a regex built
+and run for every vote value at every character) vs. find_columns' single
+pass per line, checking both find the same columns.
+
+    $ cd scrapers && python -m il.tests.bench_find_columns --pages 2000
+"""
+
+import argparse
+import random
+import re
+import string
+import time
+
+from il.bills import VOTE_VALUES, find_columns
+
+
+def _is_potential_column(line, i):
+    for val in VOTE_VALUES:
+        if re.search(r"^%s\s{2,10}(\w.).*" % val, line[i:]):
+            return True
+    return False
+
+
+def per_character(vote_lines):
+    potential_columns = []
+    for line in vote_lines:
+        pcols = set()
+        for i, x in enumerate(line):
+            if _is_potential_column(line, i):
+                pcols.add(i)
+        potential_columns.append(pcols)
+
+    starter = potential_columns[0]
+    for pc in potential_columns[1:-1]:
+        starter.intersection_update(pc)
+    return sorted(starter)
+
+
+def name():
+    last = random.choice(string.ascii_uppercase) + "".join(
+        random.choice(string.ascii_lowercase) for _ in range(random.randint(3, 11))
+    )
+    if random.random() < 0.1:
+        last += ", " + random.choice(string.ascii_uppercase) + "."
+    return last
+
+
+def page(members=118, columns=4):
+    """A roll call page laid out like the House and Senate PDFs."""
+    members = [name() for _ in range(members)]
+    rows = (len(members) + columns - 1) // columns
+    # room for "NV" and at least two spaces
+    vote_width = random.choice((4, 5))
+    name_width = max(len(member) for member in members) + random.randint(2, 4)
+    lines = []
+    for row in range(rows):
+        cells = []
+        for member in members[row::rows]:
+            vote = random.choice(VOTE_VALUES + ["Y"] * 20)
+            cells.append(vote.ljust(vote_width) + member.ljust(name_width))
+        lines.append("".join(cells).rstrip())
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=2000)
+    args = parser.parse_args()
+
+    random.seed(0)
+    pages = [page(random.choice((59, 118))) for _ in range(args.pages)]
+
+    results = {}
+    for label, func in (("per-char", per_character), ("one-pass", find_columns)):
+        start = time.perf_counter()
+        results[label] = [func(lines) for lines in pages]
+        elapsed = time.perf_counter() - start
+        print("%-8s %5d pages  %8.3fs" % (label, len(pages), elapsed))
+    assert results["per-char"] == results["one-pass"]
+
+
+if __name__ == "__main__":
+    main()
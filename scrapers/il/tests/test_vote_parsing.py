@@ -1,12 +1,6 @@
-#!/usr/bin/env python
-# -*- coding: utf-8 -*-
-from nose.tools import *
 import unittest
-from .il import metadata
-from .il.bills import find_columns, find_columns_and_parse
-import logging
 
-log = logging.getLogger("openstates.il.tests.test_bill_metadata")
+from il.bills import find_columns, find_columns_and_parse
 
 TEST_LINES1 = [
     "E   Acevedo        Y   Davis,Monique   Y   Jefferson        Y   Reboletti",
@@ -45,70 +39,66 @@ TEST_LINES3 = [
     "Y    Crotty        Y    Johnson, T.   Y    Meeks         Y   Silverstein",
     "Y    Cultra        Y    Jones, E.     Y    Millner       Y   Steans",
     "Y    Delgado       Y    Jones, J.     Y    Mulroe        Y   Sullivan",
-    "Y    Dillard       Y    Koehler       Y    Mu\xc3\xb1oz         Y   Syverson",
+    "Y    Dillard       Y    Koehler       Y    Muñoz         Y   Syverson",
     "Y    Duffy         NV   Kotowski      Y    Murphy        Y   Trotter",
     "Y    Forby         Y    LaHood        Y    Noland        Y   Wilhelmi",
     "Y    Frerichs      Y    Landek        Y    Pankau        Y   Mr. President",
     "NV   Garrett       Y    Lauzen        Y    Radogno",
 ]
 
-TEST_LINES1 = map(lambda x: x.decode("utf-8"), TEST_LINES1)
-TEST_LINES2 = map(lambda x: x.decode("utf-8"), TEST_LINES2)
-TEST_LINES3 = map(lambda x: x.decode("utf-8"), TEST_LINES3)
 
-
-class TestVoteParsing(object):
+class TestVoteParsing(unittest.TestCase):
     def test_find_and_parse1(self):
         d = find_columns_and_parse(TEST_LINES1)
-        eq_("E", d["Acevedo"])
-        eq_("Y", d["Davis,William"])
-        eq_("Y", d["Dunkin"])
-        eq_("N", d["Durkin"])
-        eq_("Y", d["Lyons"])
-        eq_("N", d["Reis"])
+        self.assertEqual("E", d["Acevedo"])
+        self.assertEqual("Y", d["Davis,William"])
+        self.assertEqual("Y", d["Dunkin"])
+        self.assertEqual("N", d["Durkin"])
+        self.assertEqual("Y", d["Lyons"])
+        self.assertEqual("N", d["Reis"])
 
-    def test_find_and_parse1(self):
+    def test_find_and_parse2(self):
         d = find_columns_and_parse(TEST_LINES2)
-        eq_("NV", d["Cronin"])
-        eq_("Y", d["Holmes"])
-        eq_("N", d["Murphy"])
-        eq_("Y", d["Mr. President"])
-        eq_("P", d["Peterson"])
+        self.assertEqual("NV", d["Cronin"])
+        self.assertEqual("Y", d["Holmes"])
+        self.assertEqual("N", d["Murphy"])
+        self.assertEqual("Y", d["Mr. President"])
+        self.assertEqual("P", d["Peterson"])
 
-    def test_find_and_parse1(self):
+    def test_find_and_parse3(self):
         d = find_columns_and_parse(TEST_LINES3)
-        eq_("Y", d["Collins, A."])
-        eq_("NV", d["Garrett"])
-        eq_("Y", d[u"Muñoz"])
-        eq_("Y", d["Syverson"])
-        eq_("NV", d["Link"])
+        self.assertEqual("Y", d["Collins, A."])
+        self.assertEqual("NV", d["Garrett"])
+        self.assertEqual("Y", d["Muñoz"])
+        self.assertEqual("Y", d["Syverson"])
+        self.assertEqual("NV", d["Link"])
 
     def test_find_columns1(self):
         columns = find_columns(TEST_LINES1)
-        eq_(4, len(columns))
+        self.assertEqual(4, len(columns))
         a, b, c, d = columns
-        eq_(0, a)
-        eq_(19, b)
-        eq_(39, c)
-        eq_(60, d)
+        self.assertEqual(0, a)
+        self.assertEqual(19, b)
+        self.assertEqual(39, c)
+        self.assertEqual(60, d)
 
     def test_find_columns2(self):
         columns = find_columns(TEST_LINES2)
-        eq_(4, len(columns))
+        self.assertEqual(4, len(columns))
         a, b, c, d = columns
-        eq_(0, a)
-        eq_(17, b)
-        eq_(34, c)
-        eq_(52, d)
+        self.assertEqual(0, a)
+        self.assertEqual(17, b)
+        self.assertEqual(34, c)
+        self.assertEqual(52, d)
 
     def test_find_columns3(self):
         columns = find_columns(TEST_LINES3)
-        eq_(4, len(columns))
+        self.assertEqual(4, len(columns))
         a, b, c, d = columns
-        eq_(0, a)
-        eq_(19, b)
-        eq_(38, c)
-        eq_(57, d)
+        self.assertEqual(0, a)
+        self.assertEqual(19, b)
+        self.assertEqual(38, c)
+        self.assertEqual(57, d)
 
 
 if __name__ == "__main__":
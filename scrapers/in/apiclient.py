@@ -1,8 +1,9 @@
 import os
-import time
 from urllib.parse import urljoin
 import functools
 
+from utils.governor import governor
+
 """
 API key must be passed as a header. You need the following headers to get JSON:
 Authorization = your_apikey
@@ -31,12 +32,9 @@ def check_response(method):
 
     @functools.wraps(method)
     def wrapped(self, *args, **kwargs):
-        resp = method(self, *args, **kwargs)
+        resp = self.governor.call(lambda: method(self, *args, **kwargs))
         status = resp.status_code
         if 400 < status:
-            if resp.status_code == 429:
-                self.handle_429(resp, *args, **kwargs)
-                return method(self, *args, **kwargs).json()
             msg_args = (resp, resp.text, resp.headers)
             msg = "Bad api response: %r %r %r" % msg_args
             raise BadApiResponse(resp, msg)
@@ -73,6 +71,8 @@ class ApiClient(object):
         self.scraper = scraper
         self.apikey = os.environ["INDIANA_API_KEY"]
         self.user_agent = os.getenv("USER_AGENT", "openstates")
+        # no limit of our own, only the one the API asks for with 429s
+        self.governor = governor.host(self.root)
 
     @check_response
     def geturl(self, url):
@@ -142,19 +142,3 @@ class ApiClient(object):
                     yield data
             else:
                 return
-
-    def handle_429(self, resp, *args, **kwargs):
-        """According to the docs:
-
-        "If the rate limit is exceeded, we will respond with a HTTP 429 Too Many
-        Requests response code and a body that details the reason for the rate
-        limiter kicking in. Further, the response will have a Retry-After
-        header that tells you for how many seconds to sleep before retrying.
-        You should anticipate this in your API client for the smoothest user
-        experience."
-        """
-        seconds = int(resp.headers["retry-after"])
-        self.scraper.info(
-            "Got a 429: Sleeping %s seconds per retry-after header." % seconds
-        )
-        time.sleep(seconds)
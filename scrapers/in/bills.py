@@ -9,6 +9,7 @@ import pytz
 
 from openstates.scrape import Scraper, Bill, VoteEvent
 from openstates.utils import convert_pdf
+from utils.governor import governor
 
 from .apiclient import ApiClient
 
@@ -562,3 +563,5 @@ class INBillScraper(Scraper):
                 self.scrape_web_versions(session, bill, bill_id)
 
             yield bill
+
+        governor.log_metrics(self.logger)
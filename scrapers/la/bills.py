@@ -1,15 +1,14 @@
 import datetime as dt
 import lxml.html
-import tempfile
-import os
 import re
 from collections import defaultdict
 from openstates.scrape import Scraper, Bill, VoteEvent
-from openstates.utils import convert_pdf
-from utils import LXMLMixin
+from utils import LXMLMixin, PDFTextMixin
 
+VOTE_NAME = re.compile("^(Senate|House) Vote on [^,]*,(.*)$")
 
-class LABillScraper(Scraper, LXMLMixin):
+
+class LABillScraper(Scraper, LXMLMixin, PDFTextMixin):
     _chambers = {"S": "upper", "H": "lower", "J": "legislature"}
 
     _bill_types = {
@@ -35,8 +34,8 @@ class LABillScraper(Scraper, LXMLMixin):
         "2021": "21RS",
     }
 
-    def pdf_to_lxml(self, filename, type="html"):
-        text = convert_pdf(filename, type)
+    def pdf_to_lxml(self, url, type="html"):
+        text = self.pdf_text(url, type)
         return lxml.html.fromstring(text)
 
     def _get_bill_abbreviations(self, session_id):
@@ -148,11 +147,15 @@ class LABillScraper(Scraper, LXMLMixin):
         page = lxml.html.fromstring(text)
         page.make_links_absolute(url)
 
-        for a in page.xpath("//a[contains(@href, 'ViewDocument.aspx')]"):
+        links = page.xpath("//a[contains(@href, 'ViewDocument.aspx')]")
+        self.prefetch_pdfs(
+            (a.attrib["href"] for a in links if VOTE_NAME.match(a.text)), "html"
+        )
+        for a in links:
             yield from self.scrape_vote(bill, a.text, a.attrib["href"])
 
     def scrape_vote(self, bill, name, url):
-        match = re.match("^(Senate|House) Vote on [^,]*,(.*)$", name)
+        match = VOTE_NAME.match(name)
 
         if not match:
             return
@@ -169,12 +172,7 @@ class LABillScraper(Scraper, LXMLMixin):
         else:
             type = []
 
-        (fd, temp_path) = tempfile.mkstemp()
-        self.urlretrieve(url, temp_path)
-
-        html = self.pdf_to_lxml(temp_path)
-        os.close(fd)
-        os.remove(temp_path)
+        html = self.pdf_to_lxml(url)
 
         vote_type = None
         body = html.xpath("string(/html/body)")
@@ -109,3 +109,4 @@ _categorizer_rules = (
 
 class Categorizer(BaseCategorizer):
     rules = _categorizer_rules
+    compiled = True
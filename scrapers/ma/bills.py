@@ -1,16 +1,20 @@
 import re
 import requests
-import os
 from datetime import datetime
 import lxml.html
 from openstates.scrape import Scraper, Bill, VoteEvent
-from openstates.utils import convert_pdf
+from utils import HTTPCacheMixin, PDFTextMixin
 
 from .actions import Categorizer
 
 
-class MABillScraper(Scraper):
+class MABillScraper(HTTPCacheMixin, PDFTextMixin, Scraper):
     verify = False
+    # with the HTTP cache on, a re-run within the hour (after a parser fix,
+    # say) fetches nothing again, and a roll call PDF never changes once
+    # it's posted; the House journal's RollCalls page is HTML that grows
+    http_cache_ttl = 60 * 60
+    http_cache_ttls = [(r"\.pdf$", None)]
 
     categorizer = Categorizer()
     session_filters = {}
@@ -426,9 +430,7 @@ class MABillScraper(Scraper):
     def get_house_pdf(self, vurl):
         """ cache house PDFs since they are done by year """
         if vurl not in self.house_pdf_cache:
-            (path, resp) = self.urlretrieve(vurl)
-            pdflines = convert_pdf(path, "text")
-            os.remove(path)
+            pdflines = self.pdf_text(vurl)
             self.house_pdf_cache[vurl] = pdflines.decode("utf-8").replace(
                 u"\u2019", "'"
             )
@@ -486,10 +488,7 @@ class MABillScraper(Scraper):
                 vote.vote("other", tup1[0])
 
     def scrape_senate_vote(self, vote, vurl):
-        # download file to server
-        (path, resp) = self.urlretrieve(vurl)
-        pdflines = convert_pdf(path, "text")
-        os.remove(path)
+        pdflines = self.pdf_text(vurl)
 
         # for y, n
         mode = None
@@ -1,13 +1,12 @@
 import re
 import datetime
 from collections import defaultdict
-from utils import LXMLMixin
+from utils import LXMLMixin, PDFTextMixin
 from utils.votes import check_counts
 from openstates.scrape import Scraper, VoteEvent
-from openstates.utils import convert_pdf
 
 
-class MDVoteScraper(Scraper, LXMLMixin):
+class MDVoteScraper(Scraper, LXMLMixin, PDFTextMixin):
     def scrape(self, chamber=None, session=None):
         if session is None:
             session = self.latest_session()
@@ -28,7 +27,9 @@ class MDVoteScraper(Scraper, LXMLMixin):
         for link in links:
             doc = self.lxmlize(link)
 
-            for vote_url in doc.xpath('//a[contains(@href, "/votes/")]/@href'):
+            vote_urls = doc.xpath('//a[contains(@href, "/votes/")]/@href')
+            self.prefetch_pdfs(url for url in vote_urls if url not in seen_urls)
+            for vote_url in vote_urls:
                 if vote_url not in seen_urls:
                     v = self.scrape_vote(vote_url, session)
                     if v:
@@ -36,8 +37,7 @@ class MDVoteScraper(Scraper, LXMLMixin):
                     seen_urls.add(vote_url)
 
     def scrape_vote(self, url, session):
-        fname, _ = self.urlretrieve(url)
-        text = convert_pdf(fname, type="text").decode()
+        text = self.pdf_text(url).decode()
         lines = text.splitlines()
 
         chamber = "upper" if "senate" in url else "lower"
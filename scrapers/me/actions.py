@@ -51,6 +51,7 @@ rules = (
 
 class Categorizer(BaseCategorizer):
     rules = rules
+    compiled = True
 
     def categorize(self, text):
         """Wrap categorize and add boilerplate committees.
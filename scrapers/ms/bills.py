@@ -1,9 +1,8 @@
 from openstates.scrape import Scraper, Bill, VoteEvent
-from openstates.utils import convert_pdf
 from datetime import datetime
+from utils import PDFTextMixin
 from .utils import append_parens
 import lxml.etree
-import os
 import re
 import pytz
 import scrapelib
@@ -21,7 +20,7 @@ def _combine_lines(lines):
     return newlines
 
 
-class MSBillScraper(Scraper):
+class MSBillScraper(Scraper, PDFTextMixin):
     _tz = pytz.timezone("CST6CDT")
     _action_types = (
         ("Died in Committee", "committee-failure"),
@@ -254,7 +253,17 @@ class MSBillScraper(Scraper):
             seen_votes = set()
 
             # Actions
-            for action in details_root.xpath("//HISTORY/ACTION"):
+            actions = details_root.xpath("//HISTORY/ACTION")
+            # convert this bill's roll calls while the actions are processed
+            self.prefetch_pdfs(
+                "http://billstatus.ls.state.ms.us%s" % act_vote
+                for act_vote in (
+                    action.xpath("string(ACT_VOTE)").replace("../../../..", "")
+                    for action in actions
+                )
+                if act_vote
+            )
+            for action in actions:
                 # action_num  = action.xpath('string(ACT_NUMBER)').strip()
                 # action_num = int(action_num)
                 act_vote = action.xpath("string(ACT_VOTE)").replace("../../../..", "")
@@ -344,14 +353,11 @@ class MSBillScraper(Scraper):
 
     def scrape_votes(self, url, motion, date, chamber, bill):
         try:
-            vote_pdf, resp = self.urlretrieve(url)
+            text = self.pdf_text(url)
         except scrapelib.HTTPError:
             self.warning("Can't find vote file {}, skipping".format(url))
             return
 
-        text = convert_pdf(vote_pdf, "text")
-        os.remove(vote_pdf)
-
         # this way we get a key error on a missing vote type
         motion, passed = self._vote_mapping[motion]
 
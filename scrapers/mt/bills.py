@@ -1,19 +1,17 @@
-import os
 import re
 import itertools
 import copy
-import tempfile
 import urllib
 from datetime import datetime
 from collections import defaultdict
 
 from openstates.scrape import Scraper, Bill, VoteEvent
-from openstates.utils import convert_pdf
 from scrapelib import HTTPError
 
 import lxml.html
 
 from utils import LXMLMixin
+from utils.pdf import get_converter
 from . import actions
 
 # from https://stackoverflow.com/questions/38015537/python-requests-exceptions-sslerror-dh-key-too-small
@@ -637,23 +635,13 @@ class PDFCommitteeVote(object):
         self.url = url
         self.bill = bill
 
-        # Fetch the document and put it into tempfile.
-        fd, filename = tempfile.mkstemp()
-
-        with open(filename, "wb") as f:
-            f.write(resp)
-
         # Convert it to text.
         try:
-            text = convert_pdf(filename, type="text")
+            text = get_converter().convert(resp, type="text")
         except Exception:
             msg = "couldn't convert pdf."
             raise PDFCommitteeVoteParseError(msg)
 
-        # Get rid of the temp file.
-        os.close(fd)
-        os.remove(filename)
-
         if not text.strip():
             msg = "PDF file was empty."
             raise PDFCommitteeVoteParseError(msg)
@@ -5,6 +5,8 @@ import pytz
 
 from openstates.scrape import Scraper, Bill, VoteEvent as Vote
 
+from . import datafiles
+from .datafiles import DATA_CACHE_DIR, DATA_URL, DataFiles
 from .legacyBills import NHLegacyBillScraper
 
 
@@ -50,16 +52,76 @@ def extract_amendment_id(action):
 
 
 class NHBillScraper(Scraper):
-    cachebreaker = dt.datetime.now().strftime("%Y%d%d%H%I%s")
+    data_url = DATA_URL
+    data_cache_dir = DATA_CACHE_DIR
 
     def scrape(self, chamber=None, session=None):
         if not session:
             session = self.latest_session()
             self.info("no session specified, using %s", session)
         chambers = [chamber] if chamber else ["upper", "lower"]
+
+        if int(session) >= 2017:
+            # read every data file once, for both chambers
+            self.data = DataFiles(self, self.data_cache_dir, self.data_url)
+            self.load_tables(session)
+
         for chamber in chambers:
             yield from self.scrape_chamber(chamber, session)
 
+    def load_tables(self, session):
+        """
+        Read the data files into tables keyed by LSR and bill id, keeping
+        only this session's records.
+        """
+        amendment_regex = re.compile(r"Amendment # (\d{4}-\d+\w)", re.IGNORECASE)
+
+        # LSR records, and the version and amendment ids for each LSR
+        self.lsrs = []
+        self.versions_by_lsr = {}
+        self.amendments_by_lsr = {}
+        # employee number -> name and seat
+        self.legislators = {}
+        # sponsor and docket records for each LSR
+        self.sponsors_by_lsr = defaultdict(list)
+        self.actions_by_lsr = defaultdict(list)
+        # roll call summaries for each bill id, and the members' votes in
+        # each roll call, by body + vote number
+        self.roll_calls_by_bill = defaultdict(list)
+        self.roll_call_votes = defaultdict(list)
+
+        for record in self.data.records("LsrsOnly.txt", datafiles.LSR_VERSION):
+            self.versions_by_lsr[record.lsr] = record.file_id
+
+        for record in self.data.records("LSRs.txt", datafiles.LSR):
+            if record.session == session:
+                self.lsrs.append(record)
+
+        for record in self.data.records("legislators.txt", datafiles.LEGISLATOR):
+            # first, middle, last
+            name = "%s %s %s" % (record.first, record.middle, record.last)
+            self.legislators[record.employee] = {"name": name, "seat": record.seat}
+
+        for record in self.data.records("LsrSponsors.txt", datafiles.LSR_SPONSOR):
+            if record.session == session:
+                self.sponsors_by_lsr[record.lsr].append(record)
+
+        for record in self.data.records("Docket.txt", datafiles.DOCKET):
+            for match in amendment_regex.finditer(record.action):
+                self.amendments_by_lsr[record.lsr] = match.group(1)
+            if record.session == session:
+                self.actions_by_lsr[record.lsr].append(record)
+
+        for record in self.data.records("RollCallSummary.txt", datafiles.ROLL_CALL):
+            if record.session == session:
+                self.roll_calls_by_bill[record.bill_id].append(record)
+
+        for record in self.data.records(
+            "RollCallHistory.txt", datafiles.ROLL_CALL_VOTE
+        ):
+            if record.session == session and record.bill_id:
+                self.roll_call_votes[record.body + record.vote_num].append(record)
+
     def scrape_chamber(self, chamber, session):
         if int(session) < 2017:
             legacy = NHLegacyBillScraper(self.metadata, self.datadir)
@@ -72,45 +134,15 @@ class NHBillScraper(Scraper):
         # bill basics
         self.bills = {}  # LSR->Bill
         self.bills_by_id = {}  # need a second table to attach votes
-        self.versions_by_lsr = {}  # mapping of bill ID to lsr
-        self.amendments_by_lsr = {}
 
-        # pre load the mapping table of LSR -> version id
-        self.scrape_version_ids()
-        self.scrape_amendments()
-
-        last_line = []
-        for line in (
-            self.get(
-                f"http://gencourt.state.nh.us/dynamicdatafiles/LSRs.txt?x={self.cachebreaker}"
-            )
-            .content.decode("utf-8")
-            .split("\n")
-        ):
-            line = line.split("|")
-            if len(line) < 1:
-                continue
-
-            if len(line) < 36:
-                if len(last_line + line[1:]) == 36:
-                    # combine two lines for processing
-                    # (skip an empty entry at beginning of second line)
-                    line = last_line + line
-                    self.warning("used bad line")
-                else:
-                    # skip this line, maybe we'll use it later
-                    self.warning("bad line: %s" % "|".join(line))
-                    last_line = line
-                    continue
-            session_yr = line[0]
-            lsr = line[1]
-            title = line[2]
-            body = line[3]
-            # type_num = line[4]
-            expanded_bill_id = line[9]
-            bill_id = line[10]
-
-            if body == body_code[chamber] and session_yr == session:
+        for record in self.lsrs:
+            lsr = record.lsr
+            title = record.title
+            body = record.body
+            expanded_bill_id = record.expanded_bill_id
+            bill_id = record.bill_id
+
+            if body == body_code[chamber]:
                 if expanded_bill_id.startswith("CACR"):
                     bill_type = "constitutional amendment"
                 elif expanded_bill_id.startswith("PET"):
@@ -183,85 +215,33 @@ class NHBillScraper(Scraper):
 
                 self.bills_by_id[bill_id] = self.bills[lsr]
 
-        # load legislators
-        self.legislators = {}
-        for line in (
-            self.get(
-                "http://gencourt.state.nh.us/dynamicdatafiles/legislators.txt?x={}".format(
-                    self.cachebreaker
-                )
-            )
-            .content.decode("utf-8")
-            .split("\n")
-        ):
-            if len(line) < 2:
-                continue
-
-            line = line.split("|")
-            employee_num = line[0].replace("\ufeff", "")
-
-            # first, last, middle
-            if len(line) > 2:
-                name = "%s %s %s" % (line[2], line[3], line[1])
-            else:
-                name = "%s %s" % (line[2], line[1])
-
-            self.legislators[employee_num] = {"name": name, "seat": line[5]}
-            # body = line[4]
-
         # sponsors
-        for line in (
-            self.get(
-                f"http://gencourt.state.nh.us/dynamicdatafiles/LsrSponsors.txt?x={self.cachebreaker}"
-            )
-            .content.decode("utf-8")
-            .split("\n")
-        ):
-            if len(line) < 1:
-                continue
-
-            session_yr, lsr, _seq, employee, primary = line.strip().split("|")
-            lsr = lsr.zfill(4)
-            if session_yr == session and lsr in self.bills:
-                sp_type = "primary" if primary == "1" else "cosponsor"
+        for lsr, bill in self.bills.items():
+            for record in self.sponsors_by_lsr.get(lsr, ()):
+                employee = record.employee
+                sp_type = "primary" if record.primary else "cosponsor"
                 try:
                     # Removes extra spaces in names
                     sponsor_name = self.legislators[employee]["name"].strip()
                     sponsor_name = " ".join(sponsor_name.split())
-                    self.bills[lsr].add_sponsorship(
+                    bill.add_sponsorship(
                         classification=sp_type,
                         name=sponsor_name,
                         entity_type="person",
                         primary=True if sp_type == "primary" else False,
                     )
-                    self.bills[lsr].extras = {
-                        "_code": self.legislators[employee]["seat"]
-                    }
+                    bill.extras = {"_code": self.legislators[employee]["seat"]}
                 except KeyError:
                     self.warning("Error, can't find person %s" % employee)
 
         # actions
-        for line in (
-            self.get(
-                f"http://gencourt.state.nh.us/dynamicdatafiles/Docket.txt?x={self.cachebreaker}"
-            )
-            .content.decode("utf-8")
-            .split("\n")
-        ):
-            if len(line) < 1:
-                continue
-            # a few blank/irregular lines, irritating
-            if "|" not in line:
-                continue
-
-            (session_yr, lsr, timestamp, bill_id, body, action, _) = line.split("|")
-
-            if session_yr == session and lsr in self.bills:
-                actor = "lower" if body == "H" else "upper"
-                time = dt.datetime.strptime(timestamp, "%m/%d/%Y %H:%M:%S %p")
-                action = action.strip()
+        for lsr, bill in self.bills.items():
+            for record in self.actions_by_lsr.get(lsr, ()):
+                actor = "lower" if record.body == "H" else "upper"
+                time = dt.datetime.strptime(record.timestamp, "%m/%d/%Y %H:%M:%S %p")
+                action = record.action.strip()
                 atype = classify_action(action)
-                self.bills[lsr].add_action(
+                bill.add_action(
                     chamber=actor,
                     description=action,
                     date=time.strftime("%Y-%m-%d"),
@@ -269,7 +249,7 @@ class NHBillScraper(Scraper):
                 )
                 amendment_id = extract_amendment_id(action)
                 if amendment_id:
-                    self.bills[lsr].add_document_link(
+                    bill.add_document_link(
                         note="amendment %s" % amendment_id,
                         url=AMENDMENT_URL % amendment_id,
                         on_duplicate="ignore",
@@ -290,90 +270,21 @@ class NHBillScraper(Scraper):
         )
         bill.add_source(bill_url)
 
-    def scrape_version_ids(self):
-
-        for line in (
-            self.get(
-                "http://gencourt.state.nh.us/dynamicdatafiles/LsrsOnly.txt?x={}".format(
-                    self.cachebreaker
-                )
-            )
-            .content.decode("utf-8")
-            .split("\n")
-        ):
-            if len(line) < 1:
-                continue
-            # a few blank/irregular lines, irritating
-            if "|" not in line:
-                continue
-
-            line = line.split("|")
-            file_id = line[2]
-            lsr = line[0].split("-")
-            lsr = lsr[1]
-            self.versions_by_lsr[lsr] = file_id
-
-    def scrape_amendments(self):
-        for line in (
-            self.get(
-                "http://gencourt.state.nh.us/dynamicdatafiles/Docket.txt?x={}".format(
-                    self.cachebreaker
-                )
-            )
-            .content.decode("utf-8")
-            .split("\n")
-        ):
-            if len(line) < 1:
-                continue
-            # a few blank/irregular lines, irritating
-            if "|" not in line:
-                continue
-
-            line = line.split("|")
-            lsr = line[1]
-
-            amendment_regex = re.compile(r"Amendment # (\d{4}-\d+\w)", re.IGNORECASE)
-
-            for match in amendment_regex.finditer(line[5]):
-                self.amendments_by_lsr[lsr] = match.group(1)
-
     def scrape_votes(self, session):
         votes = {}
         other_counts = defaultdict(int)
-        last_line = []
-        vote_url = f"http://gencourt.state.nh.us/dynamicdatafiles/RollCallSummary.txt?x={self.cachebreaker}"
-        lines = self.get(vote_url).content.decode("utf-8").splitlines()
-
-        for line in lines:
-
-            if len(line) < 2:
-                continue
+        vote_url = self.data.url("RollCallSummary.txt")
 
-            if line.strip() == "":
-                continue
+        for bill_id, bill in self.bills_by_id.items():
+            for record in self.roll_calls_by_bill.get(bill_id, ()):
+                body = record.body
+                vote_num = record.vote_num
+                yeas = record.yeas
+                nays = record.nays
+                motion = record.motion or "[not available]"
 
-            line = line.split("|")
-            if len(line) < 14:
-                if len(last_line + line[1:]) == 14:
-                    line = last_line
-                    self.warning("used bad vote line")
-                else:
-                    last_line = line
-                    self.warning("bad vote line %s" % "|".join(line))
-            session_yr = line[0].replace("\xef\xbb\xbf", "")
-            body = line[1]
-            vote_num = line[2]
-            timestamp = line[3]
-            bill_id = line[4].strip()
-            yeas = int(line[5])
-            nays = int(line[6])
-            # present = int(line[7])
-            # absent = int(line[8])
-            motion = line[11].strip() or "[not available]"
-
-            if session_yr == session and bill_id in self.bills_by_id:
                 actor = "lower" if body == "H" else "upper"
-                time = dt.datetime.strptime(timestamp, "%m/%d/%Y %I:%M:%S %p")
+                time = dt.datetime.strptime(record.timestamp, "%m/%d/%Y %I:%M:%S %p")
                 time = pytz.timezone("America/New_York").localize(time).isoformat()
                 # TODO: stop faking passed somehow
                 passed = yeas > nays
@@ -383,32 +294,22 @@ class NHBillScraper(Scraper):
                     motion_text=motion,
                     result="pass" if passed else "fail",
                     classification="passage",
-                    bill=self.bills_by_id[bill_id],
+                    bill=bill,
                 )
                 vote.set_count("yes", yeas)
                 vote.set_count("no", nays)
                 vote.add_source(vote_url)
-                vote.dedupe_key = session_yr + body + vote_num  # unique ID for vote
+                # unique ID for vote
+                vote.dedupe_key = record.session + body + vote_num
                 votes[body + vote_num] = vote
 
-        for line in (
-            self.get(
-                f"http://gencourt.state.nh.us/dynamicdatafiles/RollCallHistory.txt?x={self.cachebreaker}"
-            )
-            .content.decode("utf-8")
-            .splitlines()
-        ):
-            if len(line) < 2:
-                continue
-
-            # 2016|H|2|330795||Yea|
-            # 2012    | H   | 2    | 330795  | 964 |  HB309  | Yea | 1/4/2012 8:27:03 PM
-            session_yr, body, v_num, _, employee, bill_id, vote, date = line.split("|")
-
-            if not bill_id:
-                continue
+        for key, rows in self.roll_call_votes.items():
+            for record in rows:
+                if record.bill_id not in self.bills_by_id:
+                    continue
+                employee = record.employee
+                vote = record.vote
 
-            if session_yr == session and bill_id.strip() in self.bills_by_id:
                 try:
                     leg = " ".join(self.legislators[employee]["name"].split())
                 except KeyError:
@@ -416,20 +317,20 @@ class NHBillScraper(Scraper):
                     continue
 
                 vote = vote.strip()
-                if body + v_num not in votes:
+                if key not in votes:
                     self.warning("Skipping processing this vote:")
-                    self.warning("Bad ID: %s" % (body + v_num))
+                    self.warning("Bad ID: %s" % key)
                     continue
                 # code = self.legislators[employee]['seat']
 
                 if vote == "Yea":
-                    votes[body + v_num].yes(leg)
+                    votes[key].yes(leg)
                 elif vote == "Nay":
-                    votes[body + v_num].no(leg)
+                    votes[key].no(leg)
                 else:
-                    votes[body + v_num].vote("other", leg)
+                    votes[key].vote("other", leg)
                     # hack-ish, but will keep the vote count sync'd
-                    other_counts[body + v_num] += 1
-                    votes[body + v_num].set_count("other", other_counts[body + v_num])
+                    other_counts[key] += 1
+                    votes[key].set_count("other", other_counts[key])
         for vote in votes.values():
             yield vote
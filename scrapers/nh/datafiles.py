@@ -0,0 +1,217 @@
+import json
+import logging
+import os
+from collections import namedtuple
+
+from utils.files import atomic_write
+from utils.settings import cache_path
+
+DATA_URL = "http://gencourt.state.nh.us/dynamicdatafiles/{}"
+DATA_CACHE_DIR = cache_path("nh", "dynamicdatafiles")
+
+logger = logging.getLogger("openstates")
+
+
+def text(value):
+    return value.strip()
+
+
+class Schema(object):
+    """
+    The layout of one pipe-delimited file: `width` fields per record (None
+    if it varies), and the (name, index, converter) of each field kept.
+    """
+
+    def __init__(self, name, width, columns):
+        self.name = name
+        self.width = width
+        self.columns = columns
+        self.min_width = max(index for _, index, _ in columns) + 1
+        self.record = namedtuple(name, [column for column, _, _ in columns])
+
+    def make(self, fields):
+        return self.record(
+            *(convert(fields[index]) for _, index, convert in self.columns)
+        )
+
+
+LSR = Schema(
+    "LSR",
+    36,
+    [
+        ("session", 0, text),
+        ("lsr", 1, text),
+        ("title", 2, str),
+        ("body", 3, text),
+        ("expanded_bill_id", 9, str),
+        ("bill_id", 10, str),
+    ],
+)
+# 2021-0001|HB1|101
+LSR_VERSION = Schema(
+    "LSRVersion", None, [("lsr", 0, lambda lsr: lsr.split("-")[1]), ("file_id", 2, str)]
+)
+LEGISLATOR = Schema(
+    "Legislator",
+    None,
+    [
+        ("employee", 0, text),
+        ("last", 1, str),
+        ("first", 2, str),
+        ("middle", 3, str),
+        ("seat", 5, str),
+    ],
+)
+LSR_SPONSOR = Schema(
+    "LSRSponsor",
+    5,
+    [
+        ("session", 0, text),
+        ("lsr", 1, lambda lsr: lsr.strip().zfill(4)),
+        ("employee", 3, text),
+        ("primary", 4, lambda primary: primary.strip() == "1"),
+    ],
+)
+DOCKET = Schema(
+    "Docket",
+    7,
+    [
+        ("session", 0, text),
+        ("lsr", 1, text),
+        ("timestamp", 2, str),
+        ("body", 4, str),
+        ("action", 5, str),
+    ],
+)
+ROLL_CALL = Schema(
+    "RollCall",
+    14,
+    [
+        ("session", 0, text),
+        ("body", 1, str),
+        ("vote_num", 2, str),
+        ("timestamp", 3, str),
+        ("bill_id", 4, text),
+        ("yeas", 5, int),
+        ("nays", 6, int),
+        ("motion", 11, text),
+    ],
+)
+# 2012    | H   | 2    | 330795  | 964 |  HB309  | Yea | 1/4/2012 8:27:03 PM
+ROLL_CALL_VOTE = Schema(
+    "RollCallVote",
+    8,
+    [
+        ("session", 0, text),
+        ("body", 1, str),
+        ("vote_num", 2, str),
+        ("employee", 4, text),
+        ("bill_id", 5, text),
+        ("vote", 6, text),
+    ],
+)
+
+
+def read_records(lines, schema):
+    """
+    Yield a `schema.record` for each record in an iterable of lines.
+
+    Records wrapped onto more than one line are joined back together, the
+    end of each line running into the first field of the next, until there
+    are `schema.width` fields; a line with more than that is a record with
+    extra fields on the end. Lines that can't be made into a record are
+    logged and skipped.
+    """
+    pending = None
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if not line.strip():
+            continue
+        fields = line.split("|")
+
+        if schema.width is None:
+            if len(fields) >= schema.min_width:
+                yield schema.make(fields)
+            else:
+                logger.warning("bad %s line: %s", schema.name, line)
+            continue
+
+        if pending is not None:
+            joined = pending[:-1] + [pending[-1] + fields[0]] + fields[1:]
+            if len(joined) <= schema.width:
+                fields = joined
+            else:
+                logger.warning("bad %s line: %s", schema.name, "|".join(pending))
+            pending = None
+
+        if len(fields) < schema.width:
+            # maybe the rest of it is on the next line
+            pending = fields
+        else:
+            # extra trailing fields are ignored, as the old parsing did
+            yield schema.make(fields)
+
+    if pending is not None:
+        logger.warning("bad %s line: %s", schema.name, "|".join(pending))
+
+
+class DataFiles(object):
+    """
+    The pipe-delimited dynamicdatafiles, each downloaded at most once per
+    run and only when it has changed since the copy kept in `cache_dir`.
+
+    Instead of a cache-busting query string, requests carry the ETag and
+    Last-Modified of that copy, and a 304 means the copy is used as is.
+    Records are read from the copy a line at a time.
+    """
+
+    def __init__(self, scraper, cache_dir=DATA_CACHE_DIR, data_url=DATA_URL):
+        self.scraper = scraper
+        self.cache_dir = cache_dir
+        self.data_url = data_url
+        self._fetched = set()
+
+    def url(self, name):
+        return self.data_url.format(name)
+
+    def records(self, name, schema):
+        if name not in self._fetched:
+            self.fetch(name)
+            self._fetched.add(name)
+        # utf-8-sig drops the byte order mark some of the files start with,
+        # and only \n ends a line, any \r is stripped from the end of it
+        with open(
+            os.path.join(self.cache_dir, name), encoding="utf-8-sig", newline="\n"
+        ) as f:
+            yield from read_records(f, schema)
+
+    def fetch(self, name):
+        path = os.path.join(self.cache_dir, name)
+        try:
+            with open(path + ".json") as f:
+                validators = json.load(f)
+        except FileNotFoundError:
+            validators = {}
+
+        headers = {}
+        if os.path.exists(path):
+            if validators.get("etag"):
+                headers["If-None-Match"] = validators["etag"]
+            if validators.get("last_modified"):
+                headers["If-Modified-Since"] = validators["last_modified"]
+
+        response = self.scraper.get(self.url(name), headers=headers, stream=True)
+        if response.status_code == 304:
+            self.scraper.info("%s unchanged since the last run", name)
+            return
+
+        # drop the validators before the body changes so they can never
+        # describe the wrong copy
+        if os.path.exists(path + ".json"):
+            os.remove(path + ".json")
+        atomic_write(path, response.iter_content(64 * 1024))
+        validators = {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        }
+        atomic_write(path + ".json", validators)
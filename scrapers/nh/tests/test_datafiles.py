@@ -0,0 +1,75 @@
+import collections
+import os
+import tempfile
+import unittest
+
+from nh.bills import NHBillScraper
+from utils.tests.fixture_server import FixtureServer, make_scraper
+
+fixtures = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+class TestDataFiles(unittest.TestCase):
+    def setUp(self):
+        self.server = FixtureServer(fixtures).start()
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def requests(self):
+        return collections.Counter(self.server.requests)
+
+    def scrape(self, **kwargs):
+        scraper = make_scraper(
+            NHBillScraper,
+            data_url=self.server.url("dynamicdatafiles/{}"),
+            data_cache_dir=self.cache_dir,
+        )
+        del self.server.requests[:]
+        objects = []
+        for obj in scraper.scrape(session="2021", **kwargs):
+            obj = obj.as_dict()
+            obj.pop("_id")
+            obj.pop("bill", None)
+            objects.append(obj)
+        return objects
+
+    def test_each_file_fetched_once_for_both_chambers(self):
+        objects = self.scrape()
+        self.assertEqual(
+            sorted(o["identifier"] for o in objects if "sponsorships" in o),
+            ["HB1", "HB2", "HCR1", "SB3", "SB5"],
+        )
+        self.assertEqual(set(self.requests().values()), {1})
+        self.assertEqual(len(self.requests()), 7)
+
+    def test_unchanged_files_come_from_the_cache(self):
+        first = self.scrape()
+        second = self.scrape()
+        self.assertEqual(first, second)
+        self.assertEqual(set(self.requests().values()), {1})
+        self.assertTrue(os.path.exists(os.path.join(self.cache_dir, "LSRs.txt")))
+
+    def test_tables(self):
+        bills = {
+            o["identifier"]: o
+            for o in self.scrape(chamber="lower")
+            if "sponsorships" in o
+        }
+        self.assertEqual(sorted(bills), ["HB1", "HB2", "HCR1"])
+        hb1 = bills["HB1"]
+        self.assertEqual(
+            [(s["name"], s["primary"]) for s in hb1["sponsorships"]],
+            [("Jane A Smith", True), ("Bob B Jones", False)],
+        )
+        self.assertEqual(len(hb1["actions"]), 3)
+        self.assertEqual(
+            [v["note"] for v in hb1["versions"]],
+            ["latest version", "Amendment #2021-0123h"],
+        )
+        self.assertEqual(bills["HB2"]["title"], "relative to fishing licenses.")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import io
+import unittest
+
+from nh.datafiles import (
+    LEGISLATOR,
+    LSR,
+    LSR_SPONSOR,
+    ROLL_CALL,
+    ROLL_CALL_VOTE,
+    read_records,
+)
+
+
+class ReadRecordsTest(unittest.TestCase):
+    def test_typed_fields(self):
+        lines = ["2021|12|0|330795|1\n", "2021|7|0|330796|0\n"]
+        records = list(read_records(lines, LSR_SPONSOR))
+        self.assertEqual(
+            [(r.lsr, r.employee, r.primary) for r in records],
+            [("0012", "330795", True), ("0007", "330796", False)],
+        )
+
+    def test_wrapped_record_is_rejoined(self):
+        fields = ["2021", "H", "12", "4/15/2021 2:02:10 PM", "HB1 ", "200", "150"]
+        fields += ["", "", "", "", "Ought to ", "", ""]
+        line = "|".join(fields)
+        # broken in the middle of the motion, the way the files sometimes are
+        head, tail = line.split("Ought to ")
+        lines = [head + "Ought\n", " to " + tail + "\r\n"]
+        (record,) = read_records(lines, ROLL_CALL)
+        self.assertEqual(record.bill_id, "HB1")
+        self.assertEqual((record.yeas, record.nays), (200, 150))
+        self.assertEqual(record.motion, "Ought to")
+
+    def test_bad_lines_are_skipped(self):
+        lines = [
+            "2021|12|0\n",
+            "\n",
+            "2021|7|0|330796|0\n",
+            "2021|8|0\n",
+        ]
+        with self.assertLogs("openstates", "WARNING") as logs:
+            records = list(read_records(lines, LSR_SPONSOR))
+        self.assertEqual([r.lsr for r in records], ["0007"])
+        self.assertEqual(len(logs.output), 2)
+
+    def test_extra_fields_are_ignored(self):
+        lsr = ["2021", "12", "Relative to things.", "H"] + [""] * 5
+        lsr += ["HB0001", "HB1"] + [""] * 25
+        roll_call = ["2021", "H", "12", "4/15/2021 2:02:10 PM", "HB1 ", "200"]
+        roll_call += ["150", "", "", "", "", "Ought to Pass", "", ""]
+        # a trailing | on the end of each line
+        (record,) = read_records(["|".join(lsr + [""]) + "\n"], LSR)
+        self.assertEqual((record.lsr, record.bill_id), ("12", "HB1"))
+        (record,) = read_records(["|".join(roll_call + ["", "x"]) + "\n"], ROLL_CALL)
+        self.assertEqual((record.bill_id, record.motion), ("HB1", "Ought to Pass"))
+
+    def test_padded_employee_ids(self):
+        line = "2012|H|2|330795| 964 |HB309|Yea|1/4/2012 8:27:03 PM\n"
+        (vote,) = read_records([line], ROLL_CALL_VOTE)
+        (legislator,) = read_records(["964 |Smith|Jane|Q|R|12\n"], LEGISLATOR)
+        # the employee id a vote is looked up by, as in the Legislator file
+        self.assertEqual(vote.employee, legislator.employee)
+        self.assertEqual(vote.employee, "964")
+
+    def test_byte_order_mark(self):
+        data = "330795|Smith|Jane|Q|R|12\n".encode("utf-8-sig")
+        lines = io.TextIOWrapper(io.BytesIO(data), encoding="utf-8-sig")
+        (record,) = read_records(lines, LEGISLATOR)
+        self.assertEqual(record.employee, "330795")
+        self.assertEqual(record.seat, "12")
+
+
+if __name__ == "__main__":
+    unittest.main()
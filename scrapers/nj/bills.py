@@ -16,6 +16,15 @@ TIMEZONE = pytz.timezone("US/Eastern")
 
 
 class NJBillScraper(Scraper, MDBMixin):
+    mdb_tables = ("MainBill", "BillSpon", "BillWP", "BillHist", "BillSubj", "Committee")
+    # a bill's sponsors, documents, actions and subjects are looked up by
+    # its number, and then its type
+    mdb_indexes = {
+        "BillSpon": ["BillNumber"],
+        "BillWP": ["BillNumber"],
+        "BillHist": ["BillNumber"],
+        "BillSubj": ["BillNumber"],
+    }
     _bill_types = {
         "": "bill",
         "R": "resolution",
@@ -288,78 +297,14 @@ class NJBillScraper(Scraper, MDBMixin):
                     relation_type="companion",
                 )
 
+            self.add_sponsors(bill, rec)
+            self.add_documents(bill, rec, year_abr)
+            self.add_actions(bill, rec)
+            self.add_subjects(bill, rec)
+
             # TODO: last session info is in there too
             bill_dict[bill_id] = bill
 
-        # Sponsors
-        bill_sponsors_csv = self.access_to_csv("BillSpon")
-
-        for rec in bill_sponsors_csv:
-            bill_type = rec["BillType"].strip()
-            bill_number = int(rec["BillNumber"])
-            bill_id = bill_type + str(bill_number)
-            if bill_id not in bill_dict:
-                self.warning("unknown bill %s in sponsor database" % bill_id)
-                continue
-            bill = bill_dict[bill_id]
-            name = rec["Sponsor"]
-            sponsor_type = rec["Type"]
-            if sponsor_type == "P":
-                sponsor_type = "primary"
-            else:
-                sponsor_type = "cosponsor"
-            bill.add_sponsorship(
-                name,
-                classification=sponsor_type,
-                entity_type="person",
-                primary=sponsor_type == "primary",
-            )
-
-        # Documents
-        bill_document_csv = self.access_to_csv("BillWP")
-
-        for rec in bill_document_csv:
-            bill_type = rec["BillType"].strip()
-            bill_number = int(rec["BillNumber"])
-            bill_id = bill_type + str(bill_number)
-            if bill_id not in bill_dict:
-                self.warning("unknown bill %s in document database" % bill_id)
-                continue
-            bill = bill_dict[bill_id]
-            document = rec["Document"]
-            document = document.split("\\")
-            document = document[-2] + "/" + document[-1]
-
-            # doc_url = "ftp://www.njleg.state.nj.us/%s/%s" % (year, document)
-            htm_url = "http://www.njleg.state.nj.us/{}/Bills/{}".format(
-                year_abr, document.replace(".DOC", ".HTM")
-            )
-
-            # name document based _doctype
-            try:
-                doc_name = self._doctypes[rec["DocType"]]
-            except KeyError:
-                raise Exception("unknown doctype %s on %s" % (rec["DocType"], bill_id))
-            if rec["Comment"]:
-                doc_name += " " + rec["Comment"]
-
-            # Clean HTMX links.
-            if htm_url.endswith("HTMX"):
-                htm_url = re.sub("X$", "", htm_url)
-
-            if rec["DocType"] in self._version_types:
-                if htm_url.lower().endswith("htm"):
-                    mimetype = "text/html"
-                elif htm_url.lower().endswith("wpd"):
-                    mimetype = "application/vnd.wordperfect"
-                try:
-                    bill.add_version_link(doc_name, htm_url, media_type=mimetype)
-                except ValueError:
-                    self.warning("Couldn't find a document for bill {}".format(bill_id))
-                    pass
-            else:
-                bill.add_document_link(doc_name, htm_url)
-
         # Votes
         next_year = int(year_abr) + 1
         vote_info_list = [
@@ -474,24 +419,89 @@ class NJBillScraper(Scraper, MDBMixin):
                 vote.add_source("http://www.njleg.state.nj.us/downloads.asp")
                 yield vote
 
-        # Actions
-        bill_action_csv = self.access_to_csv("BillHist")
-        actor_map = {"A": "lower", "G": "executive", "S": "upper"}
+        phony_bill_count = 0
+        # save all bills at the end
+        for bill in bill_dict.values():
+            # add sources
+            if not bill.actions and not bill.versions:
+                self.warning("probable phony bill detected %s", bill.identifier)
+                phony_bill_count += 1
+            else:
+                bill.add_source("http://www.njleg.state.nj.us/downloads.asp")
+                yield bill
 
-        for rec in bill_action_csv:
-            bill_type = rec["BillType"].strip()
-            bill_number = int(rec["BillNumber"])
-            bill_id = bill_type + str(bill_number)
-            if bill_id not in bill_dict:
-                self.warning("unknown bill %s in action database" % bill_id)
-                continue
-            bill = bill_dict[bill_id]
+        if phony_bill_count:
+            self.warning("%s total phony bills detected", phony_bill_count)
+
+    def bill_rows(self, table, bill_rec):
+        """The rows of `table` for the bill in the MainBill row `bill_rec`."""
+        return self.access_to_csv(
+            table,
+            '"BillNumber" = ? AND TRIM("BillType") = ?',
+            (bill_rec["BillNumber"], bill_rec["BillType"].strip()),
+        )
+
+    def add_sponsors(self, bill, bill_rec):
+        for rec in self.bill_rows("BillSpon", bill_rec):
+            name = rec["Sponsor"]
+            sponsor_type = rec["Type"]
+            if sponsor_type == "P":
+                sponsor_type = "primary"
+            else:
+                sponsor_type = "cosponsor"
+            bill.add_sponsorship(
+                name,
+                classification=sponsor_type,
+                entity_type="person",
+                primary=sponsor_type == "primary",
+            )
+
+    def add_documents(self, bill, bill_rec, year_abr):
+        bill_id = bill.identifier
+        for rec in self.bill_rows("BillWP", bill_rec):
+            document = rec["Document"]
+            document = document.split("\\")
+            document = document[-2] + "/" + document[-1]
+
+            # doc_url = "ftp://www.njleg.state.nj.us/%s/%s" % (year, document)
+            htm_url = "http://www.njleg.state.nj.us/{}/Bills/{}".format(
+                year_abr, document.replace(".DOC", ".HTM")
+            )
+
+            # name document based _doctype
+            try:
+                doc_name = self._doctypes[rec["DocType"]]
+            except KeyError:
+                raise Exception("unknown doctype %s on %s" % (rec["DocType"], bill_id))
+            if rec["Comment"]:
+                doc_name += " " + rec["Comment"]
+
+            # Clean HTMX links.
+            if htm_url.endswith("HTMX"):
+                htm_url = re.sub("X$", "", htm_url)
+
+            if rec["DocType"] in self._version_types:
+                if htm_url.lower().endswith("htm"):
+                    mimetype = "text/html"
+                elif htm_url.lower().endswith("wpd"):
+                    mimetype = "application/vnd.wordperfect"
+                try:
+                    bill.add_version_link(doc_name, htm_url, media_type=mimetype)
+                except ValueError:
+                    self.warning("Couldn't find a document for bill {}".format(bill_id))
+                    pass
+            else:
+                bill.add_document_link(doc_name, htm_url)
+
+    def add_actions(self, bill, bill_rec):
+        actor_map = {"A": "lower", "G": "executive", "S": "upper"}
+        for rec in self.bill_rows("BillHist", bill_rec):
             action = rec["Action"]
             date = rec["DateAction"]
             date = datetime.strptime(date, "%m/%d/%y %H:%M:%S")
             actor = actor_map[rec["House"]]
             comment = rec["Comment"]
-            action, atype = self.categorize_action(action, bill_id)
+            action, atype = self.categorize_action(action, bill.identifier)
             if comment:
                 action += " " + comment
             bill.add_action(
@@ -501,29 +511,6 @@ class NJBillScraper(Scraper, MDBMixin):
                 chamber=actor,
             )
 
-        # Subjects
-        subject_csv = self.access_to_csv("BillSubj")
-        for rec in subject_csv:
-            bill_id = rec["BillType"].strip() + str(int(rec["BillNumber"]))
-            if bill_id not in bill_dict:
-                self.warning("unknown bill %s in subject database" % bill_id)
-                continue
-            bill = bill_dict.get(bill_id)
-            if bill:
-                bill.subject.append(rec["SubjectKey"])
-            else:
-                self.warning("invalid bill id in BillSubj: %s" % bill_id)
-
-        phony_bill_count = 0
-        # save all bills at the end
-        for bill in bill_dict.values():
-            # add sources
-            if not bill.actions and not bill.versions:
-                self.warning("probable phony bill detected %s", bill.identifier)
-                phony_bill_count += 1
-            else:
-                bill.add_source("http://www.njleg.state.nj.us/downloads.asp")
-                yield bill
-
-        if phony_bill_count:
-            self.warning("%s total phony bills detected", phony_bill_count)
+    def add_subjects(self, bill, bill_rec):
+        for rec in self.bill_rows("BillSubj", bill_rec):
+            bill.subject.append(rec["SubjectKey"])
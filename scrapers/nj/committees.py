@@ -4,6 +4,8 @@ from .utils import MDBMixin
 
 
 class NJCommitteeScraper(Scraper, MDBMixin):
+    mdb_tables = ("Committee", "COMember")
+
     def scrape(self, session=None):
         if not session:
             session = self.jurisdiction.legislative_sessions[-1]["name"]
@@ -8,6 +8,7 @@ from .utils import MDBMixin
 
 
 class NJEventScraper(Scraper, MDBMixin):
+    mdb_tables = ("Committee", "Agendas")
     _tz = pytz.timezone("US/Eastern")
 
     def initialize_committees(self, year_abr):
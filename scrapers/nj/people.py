@@ -4,6 +4,8 @@ from .utils import MDBMixin
 
 
 class NJPersonScraper(Scraper, MDBMixin):
+    mdb_tables = ("Roster", "LegBio")
+
     def scrape(self, session=None):
         if not session:
             session = self.jurisdiction.legislative_sessions[-1]["name"]
@@ -1,8 +1,9 @@
 import os
 import re
-import csv
-import zipfile
-import subprocess
+
+import scrapelib
+
+from utils.mdb import MDB_CACHE_DIR, MDBStore, listing_entry
 
 
 def clean_committee_name(comm_name):
@@ -23,24 +24,38 @@ def chamber_name(chamber):
 
 
 class MDBMixin(object):
+    # the tables each scraper reads, added to the year's store the first
+    # time a scraper needs them, and the columns rows are looked up by
+    mdb_tables = ()
+    mdb_indexes = {}
+
     def _init_mdb(self, year):
+        year = int(year)
+        base = "ftp://www.njleg.state.nj.us/ag/%sdata/" % year
         if year < 2018:
-            self.mdbfile = "DB%s.mdb" % year
-            url = "ftp://www.njleg.state.nj.us/ag/%sdata/DB%s.zip" % (year, year)
-            fname, resp = self.urlretrieve(url)
-            zf = zipfile.ZipFile(fname)
-            zf.extract(self.mdbfile)
-            os.remove(fname)
+            fname = "DB%s.zip" % year
+            member = "DB%s.mdb" % year
         else:
-            url = "ftp://www.njleg.state.nj.us/ag/%sdata/DB%s.mdb" % (year, year)
-            fname, resp = self.urlretrieve(url)
-            self.mdbfile = fname
-            self.info("mdb filename = " + fname)
-
-    # stolen from nm/bills.py
-    def access_to_csv(self, table):
-        """ using mdbtools, read access tables as CSV """
-        commands = ["mdb-export", self.mdbfile, table]
-        pipe = subprocess.Popen(commands, stdout=subprocess.PIPE, close_fds=True).stdout
-        csvfile = csv.DictReader(line.decode() for line in pipe)
-        return csvfile
+            fname = "DB%s.mdb" % year
+            member = None
+
+        # the listing tells us whether the database changed since it was
+        # last exported, without downloading it
+        try:
+            validator = listing_entry(self.get(base).text, fname)
+        except scrapelib.FTPError:
+            validator = None
+
+        self.mdb = MDBStore(os.path.join(MDB_CACHE_DIR, "nj-%s.sqlite3" % year))
+        self.mdb.refresh(
+            self,
+            base + fname,
+            validator,
+            self.mdb_tables,
+            self.mdb_indexes,
+            member=member,
+        )
+
+    def access_to_csv(self, table, where=None, params=()):
+        """yields the rows of an access table as dicts"""
+        return self.mdb.rows(table, where, params)
@@ -1,8 +1,5 @@
 import os
 import re
-import csv
-import zipfile
-import subprocess
 from datetime import datetime
 
 import lxml.html
@@ -10,6 +7,8 @@ import lxml.etree
 
 from openstates.scrape import Scraper, Bill
 
+from utils.mdb import MDB_CACHE_DIR, MDBStore
+
 
 def session_slug(session):
     session_type = "Special" if "s" in session.lower() else "Regular"
@@ -22,6 +21,18 @@ def session_slug(session):
 
 
 class NMBillScraper(Scraper):
+    # the tables read from the LegInfo database, and the columns rows are
+    # looked up by (a BillID GLOB prefix uses the index)
+    mdb_tables = (
+        "tblSponsors",
+        "TblSubjects",
+        "Legislation",
+        "TblLocations",
+        "Actions",
+        "tblActions",
+    )
+    mdb_indexes = {"Legislation": ["BillID"], "Actions": ["BillID"]}
+
     def _init_mdb(self, session):
         ftp_base = "ftp://www.nmlegis.gov/other/"
         fname = "LegInfo{}".format(session[2:]).replace('S','s')
@@ -42,31 +53,23 @@ class NMBillScraper(Scraper):
         if not matches:
             raise ValueError("{} contains no matching files.".format(ftp_base))
 
-        remote_file = ftp_base + matches[-1][1]
-
-        # all of the data is in this Access DB, download & retrieve it
-        mdbfile = "{}.accdb".format(fname)
-
-        # if a new mdbfile or it has changed
-        if getattr(self, "mdbfile", None) != mdbfile:
-            self.mdbfile = mdbfile
-            fname, resp = self.urlretrieve(remote_file)
-            zf = zipfile.ZipFile(fname)
-            zf.extract(self.mdbfile)
-            os.remove(fname)
-
-    def access_to_csv(self, table):
-        """ using mdbtools, read access tables as CSV """
-        commands = ["mdb-export", self.mdbfile, table]
-        try:
-            pipe = subprocess.Popen(
-                commands, stdout=subprocess.PIPE, close_fds=True
-            ).stdout
-            csvfile = csv.DictReader([line.decode("utf8") for line in pipe.readlines()])
-            return csvfile
-        except OSError:
-            self.warning("Failed to read mdb file. Have you installed " "'mdbtools' ?")
-            raise
+        modified, remote_file = matches[-1]
+
+        # all of the data is in this Access DB, download & export it unless
+        # the latest zip is the one it was last exported from
+        self.mdb = MDBStore(os.path.join(MDB_CACHE_DIR, "nm-{}.sqlite3".format(fname)))
+        self.mdb.refresh(
+            self,
+            ftp_base + remote_file,
+            "{} {}".format(modified.isoformat(), remote_file),
+            self.mdb_tables,
+            self.mdb_indexes,
+            member="{}.accdb".format(fname),
+        )
+
+    def access_to_csv(self, table, where=None, params=()):
+        """ yields the rows of an access table as dicts """
+        return self.mdb.rows(table, where, params)
 
     def scrape(self, chamber=None, session=None):
         if not session:
@@ -112,11 +115,9 @@ class NMBillScraper(Scraper):
 
         # get all bills into this dict, fill in action/docs before saving
         bills = {}
-        for data in [
-            row
-            for row in self.access_to_csv("Legislation")
-            if row["BillID"].startswith(chamber_letter)
-        ]:
+        for data in self.access_to_csv(
+            "Legislation", "BillID GLOB ?", (chamber_letter + "*",)
+        ):
             # use their BillID for the key but build our own for storage
             bill_key = data["BillID"].replace(" ", "")
 
@@ -418,11 +419,9 @@ class NMBillScraper(Scraper):
         # these actions need a committee name spliced in
         actions_with_committee = ("SENT", "7650", "7654")
 
-        for action in [
-            row
-            for row in self.access_to_csv("Actions")
-            if row["BillID"].startswith(chamber_letter)
-        ]:
+        for action in self.access_to_csv(
+            "Actions", "BillID GLOB ?", (chamber_letter + "*",)
+        ):
             bill_key = action["BillID"].replace(" ", "")
 
             if bill_key not in bills:
@@ -450,12 +449,11 @@ class NMBillScraper(Scraper):
                 self.warning(
                     "unknown action code {} on {}".format(action_code, bill_key)
                 )
-                for row in self.access_to_csv("tblActions"):
-                    if action_code == row["ActionCode"]:
-                        self.warning(row)
-                        self.warning(
-                            "look up at http://www.nmlegis.gov/Legislation/Action_Abbreviations"
-                        )
+                for row in self.mdb.lookup("tblActions", "ActionCode", action_code):
+                    self.warning(row)
+                    self.warning(
+                        "look up at http://www.nmlegis.gov/Legislation/Action_Abbreviations"
+                    )
                 raise
 
             # if there's room in this action for a location name, map locations
@@ -0,0 +1,65 @@
+import sys
+import unittest
+from unittest import mock
+
+from nv import utils
+from nv.utils import PDFConversionError, pdfdata_to_lines, text_after_line_numbers
+
+# stand-ins for pdftotext reading stdin, so the tests don't need poppler
+CAT = [
+    sys.executable,
+    "-c",
+    "import shutil, sys; shutil.copyfileobj(sys.stdin.buffer, sys.stdout.buffer)",
+]
+SLOW = [sys.executable, "-c", "import time; time.sleep(30)"]
+FAIL = [sys.executable, "-c", "import sys; sys.stdin.read(); sys.exit(1)"]
+
+BILL = b"""ASSEMBLY BILL NO. 1
+  1   AN ACT relating to taxation;
+  2   providing for something.
+
+ 10   Sec. 2.  This act becomes effective
+"""
+
+
+class PDFLinesTest(unittest.TestCase):
+    def convert(self, command, data, **kwargs):
+        with mock.patch.object(utils, "PDFTOTEXT", command):
+            return list(pdfdata_to_lines(data, **kwargs))
+
+    def test_lines(self):
+        self.assertEqual(self.convert(CAT, BILL), BILL.splitlines(True))
+
+    def test_large_output(self):
+        # more than a pipe buffer each way
+        data = b"x" * 99 + b"\n"
+        lines = self.convert(CAT, data * 10000)
+        self.assertEqual(len(lines), 10000)
+
+    def test_max_size(self):
+        with self.assertRaises(PDFConversionError):
+            self.convert(CAT, b"x" * 1000, max_size=100)
+        with self.assertRaises(PDFConversionError):
+            self.convert(CAT, b"x\n" * 1000, max_size=100)
+
+    def test_timeout(self):
+        with self.assertRaises(PDFConversionError):
+            self.convert(SLOW, BILL, timeout=0.5)
+
+    def test_failure(self):
+        with self.assertRaises(PDFConversionError):
+            self.convert(FAIL, BILL)
+
+    def test_text_after_line_numbers(self):
+        expected = (
+            "AN ACT relating to taxation;\n"
+            "providing for something.\n"
+            "Sec. 2.  This act becomes effective"
+        )
+        with mock.patch.object(utils, "PDFTOTEXT", CAT):
+            self.assertEqual(text_after_line_numbers(pdfdata_to_lines(BILL)), expected)
+        self.assertEqual(text_after_line_numbers(BILL), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
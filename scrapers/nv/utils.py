@@ -1,6 +1,18 @@
 import re
-import tempfile
 import subprocess
+import threading
+
+# pdftotext reading the PDF from stdin and writing text to stdout
+PDFTOTEXT = ["pdftotext", "-layout", "-", "-"]
+# how long a conversion may take, and how much text it may produce
+PDF_TIMEOUT = 120
+PDF_MAX_SIZE = 64 * 1024 * 1024
+
+LINE_NUMBER = re.compile(r"\s*\d+\s+(.*)")
+
+
+class PDFConversionError(Exception):
+    pass
 
 
 def convert_pdf(filename, type="xml"):
@@ -23,21 +35,83 @@ def convert_pdf(filename, type="xml"):
     return data
 
 
+def pdfdata_to_lines(data, timeout=PDF_TIMEOUT, max_size=PDF_MAX_SIZE):
+    """
+    Yields the lines of text in PDF `data`, as bytes, while pdftotext is
+    still converting it, so neither the PDF nor its text has to be written
+    to disk. Raises PDFConversionError if the conversion takes longer than
+    `timeout` seconds or produces more than `max_size` bytes.
+    """
+    try:
+        proc = subprocess.Popen(
+            PDFTOTEXT,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+    except OSError as e:
+        raise EnvironmentError(
+            "error running %s, missing executable? [%s]" % (" ".join(PDFTOTEXT), e)
+        )
+
+    def feed():
+        # pdftotext may exit (or be killed) before reading all of it
+        try:
+            proc.stdin.write(data)
+            proc.stdin.close()
+        except OSError:
+            pass
+
+    # stdin is fed from another thread so that a full stdout pipe can't
+    # deadlock the two of us
+    writer = threading.Thread(target=feed, daemon=True)
+    writer.start()
+    timer = threading.Timer(timeout, proc.kill)
+    timer.start()
+    size = 0
+    try:
+        while True:
+            # a bounded read, so one enormous line can't get past max_size
+            line = proc.stdout.readline(max_size - size + 1)
+            if not line:
+                break
+            size += len(line)
+            if size > max_size:
+                raise PDFConversionError("pdftotext output is over %d bytes" % max_size)
+            yield line
+        returncode = proc.wait()
+        if not timer.is_alive():
+            raise PDFConversionError("pdftotext took longer than %s seconds" % timeout)
+        if returncode:
+            raise PDFConversionError("pdftotext exited with %d" % returncode)
+    finally:
+        timer.cancel()
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+        proc.stdout.close()
+        writer.join()
+
+
 def pdfdata_to_text(data):
-    with tempfile.NamedTemporaryFile(delete=True) as tmpf:
-        tmpf.write(data)
-        tmpf.flush()
-        return convert_pdf(tmpf.name, "text")
+    return b"".join(pdfdata_to_lines(data))
 
 
 def text_after_line_numbers(lines):
+    """
+    Returns the bill text in `lines`, either the output of pdfdata_to_text
+    or an iterable of lines such as pdfdata_to_lines yields, without the
+    line numbers.
+    """
+    if isinstance(lines, bytes):
+        lines = lines.splitlines()
     text = []
-    for line in lines.splitlines():
+    for line in lines:
         # real bill text starts with an optional space, line number
         # more spaces, then real text
-        match = re.match(r"\s*\d+\s+(.*)", line)
+        match = LINE_NUMBER.match(line.decode("utf-8", "ignore").rstrip("\r\n"))
         if match:
             text.append(match.group(1))
 
     # return all real bill text joined w/ newlines
-    return "\n".join(text).decode("utf-8", "ignore")
+    return "\n".join(text)
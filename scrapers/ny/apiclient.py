@@ -1,10 +1,11 @@
 import string
 import os
-import time
 import functools
 from collections import defaultdict
 from OpenSSL.SSL import SysCallError
 
+from utils.governor import governor
+
 
 class BadAPIResponse(Exception):
     """
@@ -25,13 +26,10 @@ def check_response(method):
 
     @functools.wraps(method)
     def wrapped(self, *args, **kwargs):
-        response = method(self, *args, **kwargs)
+        response = self.governor.call(lambda: method(self, *args, **kwargs))
         status = response.status_code
 
         if status >= 400:
-            if response.status_code == 429:
-                self.handle_429(response, *args, **kwargs)
-                return method(self, *args, **kwargs).json()
             msg_args = (response, response.text, response.headers)
             msg = "Bad api response: %r %r %r" % msg_args
             raise BadAPIResponse(response, msg)
@@ -87,9 +85,12 @@ class OpenLegislationAPIClient(object):
 
         return url
 
-    def __init__(self, scraper):
+    def __init__(self, scraper, rate=None):
         self.scraper = scraper
         self.api_key = os.environ["NEW_YORK_API_KEY"]
+        # at most `rate` requests per second, for a scraper that isn't
+        # throttling itself, and backing off whenever the API sends a 429
+        self.governor = governor.host(self.root, rate)
 
     @check_response
     def get(
@@ -136,20 +137,3 @@ class OpenLegislationAPIClient(object):
                     yield data
             else:
                 return
-
-    def handle_429(self, resp, *args, **kwargs):
-        """
-        According to the docs:
-
-        'If the rate limit is exceeded, we will respond with a HTTP 429 Too Many
-        Requests response code and a body that details the reason for the rate
-        limiter kicking in. Further, the response will have a Retry-After
-        header that tells you for how many seconds to sleep before retrying.
-        You should anticipate this in your API client for the smoothest user
-        experience.'
-        """
-        seconds = int(resp.headers["retry-after"])
-        self.scraper.info(
-            "Got a 429: Sleeping %s seconds per retry-after header." % seconds
-        )
-        time.sleep(seconds)
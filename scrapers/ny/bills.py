@@ -3,8 +3,11 @@ import datetime
 import lxml.html
 import pytz
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 from openstates.scrape import Scraper, Bill, VoteEvent
+from utils.futures import ordered_map
+from utils.governor import governor
 
 from .apiclient import OpenLegislationAPIClient
 from .actions import Categorizer
@@ -13,6 +16,11 @@ eastern = pytz.timezone("US/Eastern")
 
 
 class NYBillScraper(Scraper):
+    # how many bill details to fetch at once for a --window scrape
+    workers = 4
+    # requests per second to each host, for the governor to keep to when
+    # scrapelib isn't throttling
+    rate = None
     categorizer = Categorizer()
 
     def _parse_bill_number(self, bill_id):
@@ -216,20 +224,37 @@ class NYBillScraper(Scraper):
             else:
                 bills = response["result"]["items"]
 
+            if window:
+                # https://legislation.nysenate.gov/api/3/bills/2017/S8570
+                # unfortunately the updated bills since N api doesn't offer
+                # the full bill info, so get them individually
+                bills = self._fetch_bill_details(bills)
+            yield from bills
+
+    def _fetch_bill_detail(self, bill):
+        resp = self.api_client.get(
+            "bill",
+            session_year=bill["item"]["session"],
+            bill_id=bill["item"]["printNo"],
+            summary=False,
+            detail=True,
+        )
+        return resp["result"]
+
+    def _fetch_bill_details(self, bills):
+        """
+        Yield the full bill for each updated bill summary, in the same
+        order, fetching up to `self.workers` of them at once.
+        """
+        if self.workers <= 1:
             for bill in bills:
-                if window:
-                    # https://legislation.nysenate.gov/api/3/bills/2017/S8570
-                    # unfortunately the updated bills since N api doesn't offer
-                    # the full bill info, so get them individually
-                    resp = self.api_client.get(
-                        "bill",
-                        session_year=bill["item"]["session"],
-                        bill_id=bill["item"]["printNo"],
-                        summary=False,
-                        detail=True,
-                    )
-                    bill = resp["result"]
-                yield bill
+                yield self._fetch_bill_detail(bill)
+            return
+
+        with ThreadPoolExecutor(self.workers) as pool:
+            yield from ordered_map(
+                pool, self._fetch_bill_detail, bills, self.workers * 2
+            )
 
     def _scrape_bill(self, session, bill_data):
         details = self._parse_bill_details(bill_data)
@@ -379,7 +404,7 @@ class NYBillScraper(Scraper):
         # parse the bill data page, finding the latest html text
         url = assembly_url + "&Floor%26nbspVotes=Y"
 
-        data = self.get(url).text
+        data = governor.host(url, self.rate).call(lambda: self.get(url)).text
         doc = lxml.html.fromstring(data)
         doc.make_links_absolute(url)
 
@@ -466,8 +491,15 @@ class NYBillScraper(Scraper):
     # NEW_YORK_API_KEY=key os-update ny bills --scrape bill_no=S155
     # or
     # NEW_YORK_API_KEY=key os-update ny bills --scrape window=5d1h
-    def scrape(self, session=None, bill_no=None, window=None):
-        self.api_client = OpenLegislationAPIClient(self)
+    def scrape(self, session=None, bill_no=None, window=None, workers=None):
+        if workers is not None:
+            self.workers = int(workers)
+        if self.workers > 1:
+            # scrapelib's throttle isn't thread safe, so the governor keeps
+            # each host to the same rate instead
+            self.rate = self.requests_per_minute / 60
+            self.requests_per_minute = 0
+        self.api_client = OpenLegislationAPIClient(self, self.rate)
 
         if session is None:
             session = self.latest_session()
@@ -482,3 +514,5 @@ class NYBillScraper(Scraper):
                     return
             else:
                 yield from self._scrape_bill(session, bill)
+
+        governor.log_metrics(self.logger)
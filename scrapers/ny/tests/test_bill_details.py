@@ -0,0 +1,106 @@
+import json
+import os
+import threading
+import time
+import unittest
+from unittest import mock
+from urllib.parse import urlparse
+
+from ny.apiclient import OpenLegislationAPIClient
+from ny.bills import NYBillScraper
+from utils.tests.fixture_server import FixtureHandler, FixtureServer, make_scraper
+
+
+class FakeAPI(object):
+    """What the API answers: a 429 for the first request for `limited`,
+    and the time each request was made."""
+
+    def __init__(self, limited=None, retry_after=1):
+        self.limited = limited
+        self.retry_after = retry_after
+        self.lock = threading.Lock()
+        self.requests = []
+
+
+class BillDetailHandler(FixtureHandler):
+    def do_GET(self):
+        api = self.server.api
+        print_no = urlparse(self.path).path.rsplit("/", 1)[1]
+        with api.lock:
+            api.requests.append((time.monotonic(), print_no))
+            limited = print_no == api.limited
+            if limited:
+                api.limited = None
+                api.limited_at = time.monotonic()
+        if limited:
+            self.send_response(429)
+            self.send_header("Retry-After", str(api.retry_after))
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        # finish out of order, so ordering has to come from the scraper
+        time.sleep(0.01 * (int(print_no[1:]) % 3))
+        body = json.dumps({"result": {"printNo": print_no}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def summaries(count):
+    return [
+        {"item": {"session": 2021, "printNo": "S%d" % number}}
+        for number in range(1, count + 1)
+    ]
+
+
+class BillDetailsTest(unittest.TestCase):
+    def setUp(self):
+        self.server = FixtureServer(None, handler=BillDetailHandler).start()
+        self.addCleanup(self.server.stop)
+        # a fresh governor for each test, since the port is new
+        root = mock.patch.object(OpenLegislationAPIClient, "root", self.server.base_url)
+        root.start()
+        self.addCleanup(root.stop)
+
+    def make_scraper(self, api, workers):
+        self.server.httpd.api = api
+        # the scraper's own get, which raises scrapelib.HTTPError on a 429
+        scraper = make_scraper(NYBillScraper, workers=workers)
+        with mock.patch.dict(os.environ, {"NEW_YORK_API_KEY": "key"}):
+            scraper.api_client = OpenLegislationAPIClient(scraper)
+        return scraper
+
+    def test_details_in_api_order(self):
+        for workers in (1, 4):
+            api = FakeAPI()
+            scraper = self.make_scraper(api, workers)
+            bills = list(scraper._fetch_bill_details(summaries(20)))
+            self.assertEqual(
+                [bill["printNo"] for bill in bills],
+                ["S%d" % number for number in range(1, 21)],
+            )
+
+    def test_retry_after_pauses_every_worker(self):
+        api = FakeAPI(limited="S3", retry_after=1)
+        scraper = self.make_scraper(api, 4)
+        bills = list(scraper._fetch_bill_details(summaries(20)))
+
+        self.assertEqual(len(bills), 20)
+        self.assertEqual(bills[2]["printNo"], "S3")
+        self.assertEqual(scraper.api_client.governor.retries, 1)
+        # S3 is asked for twice; apart from requests already on their way
+        # when the 429 came back, nothing is sent until retry-after is up
+        self.assertEqual(len(api.requests), 21)
+        early = [
+            print_no
+            for when, print_no in api.requests
+            if api.limited_at < when < api.limited_at + 0.9
+        ]
+        self.assertLessEqual(len(early), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
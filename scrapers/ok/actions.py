@@ -117,6 +117,7 @@ _categorizer_rules = (
 
 class Categorizer(BaseCategorizer):
     rules = _categorizer_rules
+    compiled = True
 
     def post_categorize(self, attrs):
         res = set()
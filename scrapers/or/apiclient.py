@@ -1,5 +1,9 @@
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
 
+from utils.governor import governor
+
 
 class OregonLegislatorODataClient(object):
     """
@@ -35,6 +39,7 @@ class OregonLegislatorODataClient(object):
         if not scraper:
             scraper = requests.Session()
         self.scraper = scraper
+        self.governor = governor.host(self.root, max_backoff=60.0)
 
     def all_sessions(self):
         return self.get("sessions")
@@ -50,6 +55,76 @@ class OregonLegislatorODataClient(object):
         requests_args=None,
         requests_kwargs=None,
         **url_format_args
+    ):
+        """
+        Returns the records of a resource as a list, all of its pages if
+        `page` is given; paginate() yields them as they come instead.
+        """
+        if page:
+            return list(
+                self.paginate(
+                    resource_name,
+                    page,
+                    skip,
+                    requests_args=requests_args,
+                    requests_kwargs=requests_kwargs,
+                    **url_format_args
+                )
+            )
+        return self.get_page(
+            resource_name, None, skip, requests_args, requests_kwargs, **url_format_args
+        )
+
+    def paginate(
+        self,
+        resource_name,
+        page=500,
+        skip=0,
+        prefetch=False,
+        requests_args=None,
+        requests_kwargs=None,
+        **url_format_args
+    ):
+        """
+        Yields the records of a resource `page` ($top) at a time, until the
+        API returns an empty page. With `prefetch`, the next page is
+        requested while the caller works through the current one.
+        """
+
+        def fetch(skip):
+            return self.get_page(
+                resource_name,
+                page,
+                skip,
+                requests_args,
+                requests_kwargs,
+                **url_format_args
+            )
+
+        if not prefetch:
+            while True:
+                records = fetch(skip)
+                if not records:
+                    return
+                yield from records
+                skip += page
+
+        with ThreadPoolExecutor(1) as executor:
+            records = fetch(skip)
+            while records:
+                skip += page
+                next_records = executor.submit(fetch, skip)
+                yield from records
+                records = next_records.result()
+
+    def get_page(
+        self,
+        resource_name,
+        page=None,
+        skip=0,
+        requests_args=None,
+        requests_kwargs=None,
+        **url_format_args
     ):
         num_bad_packets_allowed = 10
         url = self._build_url(resource_name, **url_format_args)
@@ -58,37 +133,20 @@ class OregonLegislatorODataClient(object):
             url = "{url}&$top={page}&$skip={skip}".format(url=url, page=page, skip=skip)
 
         requests_args = requests_args or ()
-        requests_kwargs = requests_kwargs or {}
+        # copied, since prefetched pages are requested from another thread
+        requests_kwargs = dict(requests_kwargs or {})
         requests_kwargs.update(verify=True)
-        headers = requests_kwargs.get("headers", {})
+        headers = dict(requests_kwargs.get("headers", {}))
         headers["Accept"] = "application/json"
         requests_kwargs["headers"] = headers
 
-        response = None
-
-        tries = 0
-        while response is None and tries < num_bad_packets_allowed:
-            try:
-                response = self.scraper.get(url, *requests_args, **requests_kwargs)
-            except requests.exceptions.RequestException as e:
-                err, string = e.args
-                print("warn: retry")
-                tries += 1
-                if tries >= num_bad_packets_allowed:
-                    print(err, string)
-                    raise RuntimeError("Received too many bad packets from API.")
-
-        response = response.json()["value"]
-        if page and len(response) > 0:
-            skip += page
-            response.extend(
-                self.get(
-                    resource_name,
-                    page,
-                    skip,
-                    requests_args,
-                    requests_kwargs,
-                    **url_format_args
-                )
+        try:
+            response = self.governor.call(
+                lambda: self.scraper.get(url, *requests_args, **requests_kwargs),
+                retries=num_bad_packets_allowed - 1,
+                retry_on=requests.exceptions.RequestException,
             )
-        return response
+        except requests.exceptions.RequestException as e:
+            raise RuntimeError("Received too many bad packets from API.") from e
+
+        return response.json()["value"]
@@ -3,6 +3,8 @@ import logging
 import re
 
 from openstates.scrape import Scraper, Bill
+from utils.governor import governor
+
 from .apiclient import OregonLegislatorODataClient
 from .utils import index_legislators, get_timezone, url_fix, SESSION_KEYS
 
@@ -22,6 +24,8 @@ class ORBillScraper(Scraper):
     }
 
     chamber_code = {"S": "upper", "H": "lower"}
+    # measures per page ($top) of the OData API
+    page_size = 500
 
     action_classifiers = (
         (".*Presession Released to the Public.*", ["filing"]),
@@ -47,11 +51,12 @@ class ORBillScraper(Scraper):
             session = self.latest_session()
 
         yield from self.scrape_bills(session)
+        governor.log_metrics(self.logger)
 
     def scrape_bills(self, session):
         session_key = SESSION_KEYS[session]
-        measures_response = self.api_client.get(
-            "measures", page=500, session=session_key
+        measures_response = self.api_client.paginate(
+            "measures", page=self.page_size, prefetch=True, session=session_key
         )
 
         legislators = index_legislators(self, session_key)
@@ -0,0 +1,81 @@
+import importlib
+import json
+import threading
+import time
+import unittest
+from urllib.parse import parse_qs, urlparse
+
+# "or" is a keyword, so the package can't be imported by name
+apiclient = importlib.import_module("or.apiclient")
+
+
+class Response(object):
+    def __init__(self, records):
+        self.status_code = 200
+        self.text = json.dumps({"value": records})
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class FakeOData(object):
+    """Serves `total` measures, $top at a time, recording each request."""
+
+    def __init__(self, total, delay=0):
+        self.total = total
+        self.delay = delay
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def get(self, url, *args, **kwargs):
+        query = parse_qs(urlparse(url).query)
+        top, skip = int(query["$top"][0]), int(query["$skip"][0])
+        with self.lock:
+            self.requests.append((time.monotonic(), skip))
+        time.sleep(self.delay)
+        numbers = range(skip, min(skip + top, self.total))
+        return Response([{"MeasureNumber": number} for number in numbers])
+
+
+class PaginateTest(unittest.TestCase):
+    def test_pages(self):
+        for prefetch in (False, True):
+            api = FakeOData(25)
+            client = apiclient.OregonLegislatorODataClient(api)
+            records = client.paginate(
+                "measures", page=10, session="2021R1", prefetch=prefetch
+            )
+            self.assertEqual(
+                [record["MeasureNumber"] for record in records], list(range(25))
+            )
+            # the last, empty, page is how the end is found
+            self.assertEqual([skip for _, skip in api.requests], [0, 10, 20, 30])
+
+    def test_lazy(self):
+        api = FakeOData(25)
+        client = apiclient.OregonLegislatorODataClient(api)
+        records = client.paginate("measures", page=10, session="2021R1")
+        self.assertEqual(api.requests, [])
+        next(records)
+        self.assertEqual(len(api.requests), 1)
+
+    def test_prefetch_overlaps_processing(self):
+        api = FakeOData(30, delay=0.1)
+        client = apiclient.OregonLegislatorODataClient(api)
+        start = time.monotonic()
+        for record in client.paginate(
+            "measures", page=10, session="2021R1", prefetch=True
+        ):
+            if record["MeasureNumber"] % 10 == 0:
+                time.sleep(0.1)
+        # four requests and three pages of work, a tenth of a second each,
+        # take about 0.4s with them overlapped and 0.7s without
+        self.assertLess(time.monotonic() - start, 0.6)
+
+    def test_get_returns_every_page(self):
+        client = apiclient.OregonLegislatorODataClient(FakeOData(25))
+        self.assertEqual(len(client.get("measures", page=10, session="2021R1")), 25)
+
+
+if __name__ == "__main__":
+    unittest.main()
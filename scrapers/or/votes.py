@@ -13,6 +13,8 @@ logger = logging.getLogger("openstates")
 class ORVoteScraper(Scraper):
     tz = get_timezone()
     chamber_code = {"S": "upper", "H": "lower", "J": "legislature"}
+    # measures per page ($top) of the OData API
+    page_size = 500
     vote_code = {
         "Aye": "yes",
         "Nay": "no",
@@ -48,8 +50,8 @@ class ORVoteScraper(Scraper):
     def scrape_votes(self, session):
         self.session_key = SESSION_KEYS[session]
         self.legislators = index_legislators(self, self.session_key)
-        measures_response = self.api_client.get(
-            "votes", page=500, session=self.session_key
+        measures_response = self.api_client.paginate(
+            "votes", page=self.page_size, prefetch=True, session=self.session_key
         )
 
         for measure in measures_response:
@@ -359,7 +359,8 @@ class RIBillScraper(Scraper):
         return self.post(url, data=headers).text
 
     def get_vote_dates(self, page, session):
-        dates = url_xpath(page, "//select[@name='votedate']")[0].xpath("./*")
+        dates = url_xpath(page, "//select[@name='votedate']", session=self)[0]
+        dates = dates.xpath("./*")
         return [a.text for a in dates if a.text.endswith(session[-2:])]
 
     def get_votes(self, url, session):
@@ -1,13 +1,12 @@
 import scrapelib
 
 import datetime
-import os
 import re
 from collections import defaultdict
 from functools import wraps
 
 from openstates.scrape import Scraper, Bill, VoteEvent
-from openstates.utils import convert_pdf
+from utils import PDFTextMixin
 import lxml.html
 import urllib
 
@@ -90,7 +89,7 @@ def action_type(action):
     return None
 
 
-class SCBillScraper(Scraper):
+class SCBillScraper(Scraper, PDFTextMixin):
     """
     Bill scraper that pulls down all legislatition on from sc website.
     Used to pull in information regarding Legislation, and basic associated metadata,
@@ -200,7 +199,11 @@ class SCBillScraper(Scraper):
         doc.make_links_absolute(vurl)
 
         # skip first two rows
-        for row in doc.xpath("//table/tr")[2:]:
+        rows = doc.xpath("//table/tr")[2:]
+        self.prefetch_pdfs(
+            href for row in rows if len(row) == 11 for href in row[2].xpath("a/@href")
+        )
+        for row in rows:
             tds = row.getchildren()
             if len(tds) != 11:
                 self.warning("irregular vote row: %s" % vurl)
@@ -274,9 +277,7 @@ class SCBillScraper(Scraper):
         :param vote:  related voteEvent object
         :param vurl:  pdf source url
         """
-        (path, resp) = self.urlretrieve(vurl)
-        pdflines = convert_pdf(path, "text")
-        os.remove(path)
+        pdflines = self.pdf_text(vurl)
 
         current_vfunc = None
         option = None
@@ -25,7 +25,7 @@ class TNEventScraper(Scraper, LXMLMixin):
         return self._add_agenda_list(url, event)
 
     def _add_agenda_real(self, url, event):
-        trs = url_xpath(url, "//tr")
+        trs = url_xpath(url, "//tr", session=self)
         for tr in trs:
             tds = tr.xpath("./*")
             billinf = tds[0].attrib["id"]  # TN uses bill_ids as the id
@@ -37,7 +37,7 @@ class TNEventScraper(Scraper, LXMLMixin):
         return event
 
     def _add_agenda_list(self, url, event):
-        trs = url_xpath(url, "//tr")
+        trs = url_xpath(url, "//tr", session=self)
         for tr in trs:
             things = tr.xpath("./td/a")
             for thing in things:
@@ -58,7 +58,9 @@ class TNEventScraper(Scraper, LXMLMixin):
     def scrape_chamber(self, chamber=None):
         # If chamber is None, don't exclude any events from the results based on chamber
         chmbr = cal_chamber_text.get(chamber)
-        tables = url_xpath(cal_weekly_events, "//table[@class='date-table']")
+        tables = url_xpath(
+            cal_weekly_events, "//table[@class='date-table']", session=self
+        )
         for table in tables:
             date = table.xpath("../.")[0].getprevious().text_content()
             trs = table.xpath("./tr")
@@ -1,16 +1,18 @@
+import collections
 import datetime
-import ftplib
 import re
-import time
 from urllib import parse as urlparse
 import xml.etree.cElementTree as etree
 
 from openstates.scrape import Scraper, Bill
 from openstates.scrape.base import ScrapeError
-from utils import LXMLMixin
+from utils import IncrementalMixin, LXMLMixin, cache_path, truthy
+from .ftp import FTPWalker, ListingCache
 
+LISTING_CACHE_PATH = cache_path("tx", "ftp_listing.json")
 
-class TXBillScraper(Scraper, LXMLMixin):
+
+class TXBillScraper(IncrementalMixin, Scraper, LXMLMixin):
     _FTP_ROOT = "ftp.legis.state.tx.us"
     CHAMBERS = {"H": "lower", "S": "upper"}
     NAME_SLUGS = {
@@ -23,40 +25,9 @@ class TXBillScraper(Scraper, LXMLMixin):
     companion_url = (
         "https://capitol.texas.gov/BillLookup/Companions.aspx" "?LegSess={}&Bill={}"
     )
-
-    def _get_ftp_files(self, dir_):
-        """ Recursively traverse an FTP directory, returning all files """
-        for i in range(3):
-            try:
-                ftp = ftplib.FTP(self._FTP_ROOT)
-                break
-            except (EOFError, ftplib.error_temp):
-                time.sleep(2 ** i)
-        else:
-            raise Exception
-
-        ftp.login()
-        ftp.cwd("/" + dir_)
-        self.info("Searching an FTP folder for files ({})".format(dir_))
-
-        lines = []
-        ftp.retrlines("LIST", lines.append)
-        for line in lines:
-            (_date, _time, is_dir, _file_size, name) = re.search(
-                r"""(?x)
-                    ^(\d{2}-\d{2}-\d{2})\s+  # Date in mm-dd-yy
-                    (\d{2}:\d{2}[AP]M)\s+  # Time in hh:mmAM/PM
-                    (<DIR>)?\s+  # Directories will have an indicating flag
-                    (\d+)?\s+  # Files will have their size in bytes
-                    (.+?)\s*$  # Directory or file name is the remaining text
-                    """,
-                line,
-            ).groups()
-            if is_dir:
-                for item in self._get_ftp_files("/".join([dir_, name])):
-                    yield item
-            else:
-                yield "/".join(["ftp://" + self._FTP_ROOT, dir_, name])
+    # FTP directories listed at once, each over its own connection
+    ftp_workers = 4
+    listing_cache_path = LISTING_CACHE_PATH
 
     @staticmethod
     def _get_bill_id_from_file_path(file_path):
@@ -69,31 +40,74 @@ class TXBillScraper(Scraper, LXMLMixin):
             identifier += "R"
         return " ".join([identifier, number])
 
-    def scrape(self, session=None, chamber=None):
+    @staticmethod
+    def _normalize_bill_id(bill_id):
+        """HB 1, HB1 and hb 0001 all become HB 1."""
+        identifier, number = re.match(r"\s*([A-Za-z]+)\s*0*(\d+)", bill_id).groups()
+        return " ".join([identifier.upper(), number])
+
+    # files unchanged on the FTP server since the last run are skipped,
+    # unless full=true; a run where nothing changed saves nothing, and succeeds
+    def scrape(self, session=None, chamber=None, full=False):
         if not session:
             session = self.latest_session()
             self.info("No session specified; using %s", session)
 
         chambers = [chamber] if chamber else ["upper", "lower"]
+        full = truthy(full)
 
         session_code = self._format_session(session)
 
-        self.witnesses = []
-        witness_files = self._get_ftp_files(
-            "bills/{}/witlistbill/html".format(session_code)
-        )
-        for item in witness_files:
-            bill_id = self._get_bill_id_from_file_path(item)
-            self.witnesses.append((bill_id, item))
-
-        history_files = self._get_ftp_files("bills/{}/billhistory".format(session_code))
-        for bill_url in history_files:
-            if "house" in bill_url:
-                if "lower" in chambers:
-                    yield from self.scrape_bill(session, bill_url)
-            elif "senate" in bill_url:
-                if "upper" in chambers:
-                    yield from self.scrape_bill(session, bill_url)
+        walker = FTPWalker(self._FTP_ROOT, workers=self.ftp_workers)
+        listings = ListingCache(self.listing_cache_path)
+        try:
+            witness_files = walker.walk(
+                "bills/{}/witlistbill/html".format(session_code)
+            )
+            # start listing the histories while the witness lists are read
+            history_files = walker.walk("bills/{}/billhistory".format(session_code))
+
+            # witness list urls and companions, by normalized bill id
+            self.witnesses = collections.defaultdict(list)
+            self.companions = {}
+            witness_stats = {}
+            changed_witnesses = set()
+            for item, modified, size in witness_files:
+                bill_id = self._get_bill_id_from_file_path(item)
+                self.witnesses[bill_id].append(item)
+                witness_stats[item] = (modified, size)
+                if not listings.unchanged(item, modified, size):
+                    changed_witnesses.add(bill_id)
+
+            for bill_url, modified, size in history_files:
+                if "house" in bill_url:
+                    if "lower" not in chambers:
+                        continue
+                elif "senate" in bill_url:
+                    if "upper" not in chambers:
+                        continue
+                else:
+                    continue
+
+                bill_id = self._get_bill_id_from_file_path(bill_url)
+                if (
+                    not full
+                    and listings.unchanged(bill_url, modified, size)
+                    and bill_id not in changed_witnesses
+                ):
+                    self.unchanged += 1
+                    continue
+
+                yield from self.scrape_bill(session, bill_url)
+
+                listings.update(bill_url, modified, size)
+                for item in self.witnesses.get(bill_id, ()):
+                    listings.update(item, *witness_stats[item])
+        finally:
+            walker.close()
+
+        # only once everything has been scraped, so a failed run is retried
+        listings.save()
 
     def scrape_bill(self, session, history_url):
         history_xml = self.get(history_url).text
@@ -165,11 +179,10 @@ class TXBillScraper(Scraper, LXMLMixin):
                 media_type="text/html",
             )
 
-        witnesses = [x for x in self.witnesses if x[0] == bill_id]
-        for witness in witnesses:
+        for witness in self.witnesses.get(self._normalize_bill_id(bill_id), ()):
             bill.add_document_link(
-                note="Witness List ({})".format(self.NAME_SLUGS[witness[1][-5]]),
-                url=witness[1],
+                note="Witness List ({})".format(self.NAME_SLUGS[witness[-5]]),
+                url=witness,
                 media_type="text/html",
             )
 
@@ -294,21 +307,31 @@ class TXBillScraper(Scraper, LXMLMixin):
         yield bill
 
     def _get_companion(self, bill):
-        url = self.companion_url.format(
-            self._format_session(bill.legislative_session),
-            self._format_bill_id(bill.identifier),
-        )
-        page = self.lxmlize(url)
-        links = page.xpath('//table[@id="Table6"]//a')
-        for link in links:
-            parsed = urlparse.urlparse(link.attrib["href"])
-            query = urlparse.parse_qs(parsed.query)
+        session = self._format_session(bill.legislative_session)
+        companions = self.companions.setdefault(session, {})
+        bill_id = self._normalize_bill_id(bill.identifier)
+        # each bill's own companions page, fetched once however its id is
+        # written; a bill's page is the only complete list of its companions
+        if bill_id not in companions:
+            companions[bill_id] = self._fetch_companions(session, bill.identifier)
+
+        for identifier, legislative_session in companions[bill_id]:
             bill.add_related_bill(
-                identifier=query["Bill"][0],
-                legislative_session=query["LegSess"][0].replace("R", ""),
+                identifier=identifier,
+                legislative_session=legislative_session,
                 relation_type="companion",
             )
 
+    def _fetch_companions(self, session, bill_id):
+        url = self.companion_url.format(session, self._format_bill_id(bill_id))
+        page = self.lxmlize(url)
+        companions = []
+        for link in page.xpath('//table[@id="Table6"]//a'):
+            parsed = urlparse.urlparse(link.attrib["href"])
+            query = urlparse.parse_qs(parsed.query)
+            companions.append((query["Bill"][0], query["LegSess"][0].replace("R", "")))
+        return companions
+
     def _format_session(self, session):
         if len(session) == 2:
             session = session + "R"
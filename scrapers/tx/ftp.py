@@ -0,0 +1,172 @@
+import contextlib
+import ftplib
+import json
+import logging
+import queue
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.files import atomic_write
+
+logger = logging.getLogger("openstates.tx.ftp")
+
+# errors that mean a connection is no good any more, and the listing
+# should be retried on a fresh one
+CONNECTION_ERRORS = (EOFError, OSError, ftplib.error_temp)
+
+LIST_LINE = re.compile(
+    r"""(?x)
+        ^(\d{2}-\d{2}-\d{2})\s+  # Date in mm-dd-yy
+        (\d{2}:\d{2}[AP]M)\s+  # Time in hh:mmAM/PM
+        (<DIR>)?\s+  # Directories will have an indicating flag
+        (\d+)?\s+  # Files will have their size in bytes
+        (.+?)\s*$  # Directory or file name is the remaining text
+        """
+)
+
+
+def parse_list_line(line):
+    """Returns (name, is_dir, modified, size) for a line of the DOS-style
+    LIST output the TX server sends."""
+    date, time_, is_dir, size, name = LIST_LINE.search(line).groups()
+    return name, bool(is_dir), "{} {}".format(date, time_), size and int(size)
+
+
+class FTPPool(object):
+    """Logged-in connections to an FTP host (host or host:port), shared by
+    up to `size` threads listing directories at once.
+    """
+
+    def __init__(self, host, size=4, retries=3):
+        self.host = host
+        self.retries = retries
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+
+    def connect(self):
+        host, _, port = self.host.partition(":")
+        for i in range(self.retries):
+            try:
+                ftp = ftplib.FTP()
+                ftp.connect(host, int(port or ftplib.FTP_PORT))
+                break
+            except (EOFError, ftplib.error_temp):
+                time.sleep(2**i)
+        else:
+            raise Exception("unable to connect to {}".format(self.host))
+        ftp.login()
+        return ftp
+
+    @contextlib.contextmanager
+    def connection(self):
+        with self._slots:
+            try:
+                ftp = self._idle.get_nowait()
+            except queue.Empty:
+                ftp = self.connect()
+            try:
+                yield ftp
+            except CONNECTION_ERRORS:
+                ftp.close()
+                raise
+            except Exception:
+                self._idle.put(ftp)
+                raise
+            else:
+                self._idle.put(ftp)
+
+    def listdir(self, dir_):
+        """Returns the parsed LIST lines for a directory."""
+        # an idle connection may have been dropped by the server, so give
+        # it one more go on a new connection
+        for attempt in range(2):
+            try:
+                with self.connection() as ftp:
+                    ftp.cwd("/" + dir_)
+                    lines = []
+                    ftp.retrlines("LIST", lines.append)
+                    return [parse_list_line(line) for line in lines]
+            except CONNECTION_ERRORS:
+                if attempt:
+                    raise
+
+    def close(self):
+        while True:
+            try:
+                ftp = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                ftp.quit()
+            except ftplib.all_errors:
+                ftp.close()
+
+
+class FTPWalker(object):
+    """Recursively lists FTP directories, fetching every subdirectory's
+    listing in the background as soon as its parent has been listed.
+
+    Files come out in the same depth-first order as a serial walk.
+    """
+
+    def __init__(self, host, workers=4):
+        self.host = host
+        self.pool = FTPPool(host, size=workers)
+        self.executor = ThreadPoolExecutor(workers)
+
+    def walk(self, dir_):
+        """Yields (url, modified, size) for each file below `dir_`.
+
+        The listing starts right away, before the first item is asked for.
+        """
+        return self._walk(dir_, self.executor.submit(self.listdir, dir_))
+
+    def listdir(self, dir_):
+        logger.info("Searching an FTP folder for files ({})".format(dir_))
+        return self.pool.listdir(dir_)
+
+    def _walk(self, dir_, listing):
+        entries = listing.result()
+        subdirs = {
+            name: self.executor.submit(self.listdir, "/".join([dir_, name]))
+            for name, is_dir, _, _ in entries
+            if is_dir
+        }
+        for name, is_dir, modified, size in entries:
+            if is_dir:
+                yield from self._walk("/".join([dir_, name]), subdirs[name])
+            else:
+                url = "/".join(["ftp://" + self.host, dir_, name])
+                yield url, modified, size
+
+    def close(self):
+        self.executor.shutdown()
+        self.pool.close()
+
+
+class ListingCache(object):
+    """(modified, size) of each file seen on the last run, so unchanged
+    files can be skipped. Changes are kept in memory until save().
+    """
+
+    def __init__(self, path):
+        self.path = path
+        try:
+            with open(path) as f:
+                self.seen = {url: tuple(stat) for url, stat in json.load(f).items()}
+        except FileNotFoundError:
+            self.seen = {}
+        self.updated = {}
+
+    def unchanged(self, url, modified, size):
+        return self.seen.get(url) == (modified, size)
+
+    def update(self, url, modified, size):
+        self.updated[url] = (modified, size)
+
+    def save(self):
+        self.seen.update(self.updated)
+        self.updated = {}
+        atomic_write(self.path, self.seen)
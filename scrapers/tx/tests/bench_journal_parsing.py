@@ -0,0 +1,68 @@
+"""
+Time parsing a session's worth of journals with tx.votes.parse_journal,
+serially vs. in a process pool as TXVoteScraper(workers=N) does. The
+journals are built from fixtures/roll_call_vote.html, padded with the
+page breaks, running heads and white-font spacing clean_journal strips.
+
+    $ cd scrapers && python -m tx.tests.bench_journal_parsing --journals 60 --workers 4
+"""
+
+import argparse
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from tx.votes import parse_journal
+
+here = os.path.dirname(__file__)
+URL = "https://journals.senate.texas.gov/SJRNL/87R/HTML/87RSJ01-%02d-F.HTM"
+FILLER = (
+    "<p>EIGHTY-SEVENTH LEGISLATURE — REGULAR SESSION</p>"
+    "<p>SENATE JOURNAL — Day 2</p>"
+    '<div class="textpara">The President laid before the Senate'
+    '<font color="White">iii</font>the following message:</div><br>'
+    '<p></p><hr noshade size="1">'
+)
+
+
+def journal(votes):
+    with open(os.path.join(here, "fixtures", "roll_call_vote.html")) as f:
+        page = f.read()
+    body = re.search(r"<body>(.*)</body>", page, re.S).group(1)
+    return page.replace(body, (body + FILLER * 20) * votes)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--journals", type=int, default=60)
+    parser.add_argument("--votes", type=int, default=150)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    page = journal(args.votes)
+    jobs = [
+        (page, URL % (day % 28 + 1), "upper", "87R", 2021)
+        for day in range(args.journals)
+    ]
+    print(
+        "%d journals of %.1f MB, %d votes each"
+        % (args.journals, len(page) / 1e6, args.votes)
+    )
+
+    start = time.perf_counter()
+    serial = [parse_journal(*job) for job in jobs]
+    elapsed = time.perf_counter() - start
+    print("serial         %6.2fs" % elapsed)
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(args.workers) as pool:
+        pooled = list(pool.map(parse_journal, *zip(*jobs)))
+    elapsed = time.perf_counter() - start
+    print("%2d processes   %6.2fs" % (args.workers, elapsed))
+
+    assert [len(votes) for votes in serial] == [len(votes) for votes in pooled]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Time matching a full session's witness lists to its bills, the old way
+(a scan of every witness list per bill) vs. TXBillScraper's index.
+
+    $ cd scrapers && python -m tx.tests.bench_witness_lookup --bills 10000 --witnesses 4000
+"""
+
+import argparse
+import collections
+import random
+import time
+
+from tx.bills import TXBillScraper
+
+WITNESS_URL = (
+    "ftp://ftp.legis.state.tx.us/bills/87R/witlistbill/html/{chamber}_bills/"
+    "{prefix}{low:05d}_{prefix}{high:05d}/{prefix}{num:05d}{slug}.htm"
+)
+
+
+def session(bills, witnesses):
+    bill_ids = []
+    for prefix in ("HB", "SB"):
+        bill_ids += ["{} {}".format(prefix, num) for num in range(1, bills // 2 + 1)]
+
+    random.seed(0)
+    urls = []
+    for bill_id in random.sample(bill_ids, witnesses):
+        prefix, num = bill_id.split()
+        num = int(num)
+        low = num // 100 * 100 or 1
+        urls.append(
+            WITNESS_URL.format(
+                chamber="house" if prefix == "HB" else "senate",
+                prefix=prefix,
+                low=low,
+                high=low + 99,
+                num=num,
+                slug=random.choice("IEHSF"),
+            )
+        )
+    return bill_ids, urls
+
+
+def linear(bill_ids, urls):
+    witnesses = [(TXBillScraper._get_bill_id_from_file_path(url), url) for url in urls]
+    return sum(len([x for x in witnesses if x[0] == bill_id]) for bill_id in bill_ids)
+
+
+def indexed(bill_ids, urls):
+    witnesses = collections.defaultdict(list)
+    for url in urls:
+        witnesses[TXBillScraper._get_bill_id_from_file_path(url)].append(url)
+    return sum(
+        len(witnesses.get(TXBillScraper._normalize_bill_id(bill_id), ()))
+        for bill_id in bill_ids
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bills", type=int, default=10000)
+    parser.add_argument("--witnesses", type=int, default=4000)
+    args = parser.parse_args()
+
+    bill_ids, urls = session(args.bills, args.witnesses)
+    for name, func in (("linear", linear), ("indexed", indexed)):
+        start = time.perf_counter()
+        found = func(bill_ids, urls)
+        elapsed = time.perf_counter() - start
+        print(
+            "%-7s %6d witness lists matched to %d bills  %8.3fs"
+            % (name, found, len(bill_ids), elapsed)
+        )
+
+
+if __name__ == "__main__":
+    main()
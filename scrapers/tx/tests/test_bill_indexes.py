@@ -0,0 +1,53 @@
+import tempfile
+import unittest
+
+import lxml.html
+from openstates.scrape import Bill
+
+from tx.bills import TXBillScraper
+
+COMPANIONS = """
+<table id="Table6">
+  <tr><td><a href="BillSummary.aspx?LegSess=87R&amp;Bill=SB1">SB 1</a></td></tr>
+</table>
+"""
+
+
+class CompanionScraper(TXBillScraper):
+    pages = 0
+
+    def lxmlize(self, url):
+        self.pages += 1
+        return lxml.html.fromstring(COMPANIONS)
+
+
+class TestBillIndexes(unittest.TestCase):
+    def test_normalize_bill_id(self):
+        for bill_id in ("HB 1", "HB1", "hb 0001", " HB 01"):
+            self.assertEqual(TXBillScraper._normalize_bill_id(bill_id), "HB 1")
+        self.assertEqual(TXBillScraper._normalize_bill_id("HJR 12"), "HJR 12")
+
+    def related(self, scraper, bill_id):
+        bill = Bill(bill_id, legislative_session="87", chamber="lower", title="T")
+        scraper._get_companion(bill)
+        return [(b["identifier"], b["legislative_session"]) for b in bill.related_bills]
+
+    def test_companions_fetched_once_per_bill(self):
+        scraper = CompanionScraper(None, tempfile.mkdtemp())
+        scraper.companions = {}
+        for bill_id in ("HB 1", "HB1", "HB 1"):
+            self.assertEqual(self.related(scraper, bill_id), [("SB1", "87")])
+        self.assertEqual(scraper.pages, 1)
+
+    def test_each_bill_fetches_its_own_companions(self):
+        scraper = CompanionScraper(None, tempfile.mkdtemp())
+        scraper.companions = {}
+        self.related(scraper, "HB 1")
+        # HB 1's page listed SB 1, but only SB 1's page lists all of its own
+        self.assertEqual(self.related(scraper, "SB 1"), [("SB1", "87")])
+        self.assertEqual(scraper.pages, 2)
+        self.assertEqual(sorted(scraper.companions["87R"]), ["HB 1", "SB 1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
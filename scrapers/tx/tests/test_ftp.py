@@ -0,0 +1,154 @@
+import os
+import shutil
+import stat
+import tempfile
+import threading
+import time
+import unittest
+
+from tx.bills import TXBillScraper
+from tx.ftp import FTPWalker, parse_list_line
+
+try:
+    from pyftpdlib.authorizers import DummyAuthorizer
+    from pyftpdlib.filesystems import AbstractedFS
+    from pyftpdlib.handlers import FTPHandler
+    from pyftpdlib.servers import FTPServer
+except ImportError:  # pragma: no cover
+    FTPServer = None
+
+fixtures = os.path.join(os.path.dirname(__file__), "fixtures", "ftp")
+
+if FTPServer:
+
+    class DOSFilesystem(AbstractedFS):
+        """LIST output in the format ftp.legis.state.tx.us uses."""
+
+        def format_list(self, basedir, listing, ignore_err=True):
+            for name in listing:
+                st = os.stat(os.path.join(basedir, name))
+                when = time.strftime("%m-%d-%y  %I:%M%p", time.localtime(st.st_mtime))
+                if stat.S_ISDIR(st.st_mode):
+                    line = "{}       <DIR>          {}".format(when, name)
+                else:
+                    line = "{} {:>20} {}".format(when, st.st_size, name)
+                yield (line + "\r\n").encode("utf8")
+
+    class CountingHandler(FTPHandler):
+        abstracted_fs = DOSFilesystem
+        logins = 0
+
+        def on_login(self, username):
+            type(self).logins += 1
+
+
+@unittest.skipUnless(FTPServer, "pyftpdlib is not installed")
+class TestFTP(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        shutil.copytree(fixtures, os.path.join(self.root, "ftp"))
+        self.root = os.path.join(self.root, "ftp")
+
+        authorizer = DummyAuthorizer()
+        authorizer.add_anonymous(self.root)
+        CountingHandler.authorizer = authorizer
+        CountingHandler.logins = 0
+        self.server = FTPServer(("127.0.0.1", 0), CountingHandler)
+        self.host = "127.0.0.1:%d" % self.server.address[1]
+        thread = threading.Thread(
+            target=self.server.serve_forever, kwargs={"handle_exit": False}
+        )
+        thread.daemon = True
+        thread.start()
+
+    def tearDown(self):
+        self.server.close_all()
+
+    def scraper(self):
+        scraper = TXBillScraper(None, tempfile.mkdtemp())
+        scraper._FTP_ROOT = self.host
+        scraper.listing_cache_path = os.path.join(self.root, "..", "listing.json")
+        scraper.requests_per_minute = 0
+        scraper.cache_storage = None
+        return scraper
+
+    def bills(self, **kwargs):
+        return list(self.scraper().scrape(session="87", **kwargs))
+
+    def identifiers(self, **kwargs):
+        return [bill.identifier for bill in self.bills(**kwargs)]
+
+    def test_walk_order_and_connections(self):
+        expected = []
+        for dirpath, dirnames, filenames in os.walk(
+            os.path.join(self.root, "bills", "87R")
+        ):
+            dirnames.sort()
+            for name in sorted(filenames):
+                path = os.path.relpath(os.path.join(dirpath, name), self.root)
+                expected.append("ftp://{}/{}".format(self.host, path))
+
+        walker = FTPWalker(self.host, workers=3)
+        try:
+            urls = [url for url, modified, size in walker.walk("bills/87R")]
+        finally:
+            walker.close()
+        self.assertEqual(urls, expected)
+        # a dozen directories, but no more logins than there are workers
+        self.assertLessEqual(CountingHandler.logins, 3)
+
+    def test_unchanged_files_are_skipped(self):
+        self.assertEqual(self.identifiers(), ["HB 1", "HB 2", "HB 3", "SB 1", "SB 2"])
+        self.assertEqual(self.identifiers(), [])
+
+        # a new witness list brings its bill back
+        witness = os.path.join(
+            self.root,
+            "bills/87R/witlistbill/html/house_bills/HB00001_HB00099/HB00002H.htm",
+        )
+        os.utime(witness, (time.time() + 3600, time.time() + 3600))
+        self.assertEqual(self.identifiers(), ["HB 2"])
+        self.assertEqual(self.identifiers(), [])
+
+        self.assertEqual(len(self.identifiers(full="true")), 5)
+
+    def test_unchanged_run_succeeds(self):
+        self.bills()
+        scraper = self.scraper()
+        record = scraper.do_scrape(session="87")
+        self.assertEqual(record["objects"], {})
+        self.assertEqual(scraper.unchanged, 5)
+
+    def test_witness_lists(self):
+        witnesses = {
+            bill.identifier: [doc["note"] for doc in bill.documents]
+            for bill in self.bills()
+        }
+        self.assertEqual(
+            witnesses,
+            {
+                "HB 1": ["Witness List (House Committee Report)"],
+                "HB 2": ["Witness List (House Committee Report)"],
+                "HB 3": [],
+                "SB 1": ["Witness List (Senate Committee Report)"],
+                "SB 2": [],
+            },
+        )
+
+    def test_chamber(self):
+        self.assertEqual(self.identifiers(chamber="upper"), ["SB 1", "SB 2"])
+        self.assertEqual(self.identifiers(), ["HB 1", "HB 2", "HB 3"])
+
+    def test_parse_list_line(self):
+        self.assertEqual(
+            parse_list_line("02-21-21  10:15AM       <DIR>          house_bills"),
+            ("house_bills", True, "02-21-21 10:15AM", None),
+        )
+        self.assertEqual(
+            parse_list_line("05-01-21  03:02PM                 2048 HB00001.xml"),
+            ("HB00001.xml", False, "05-01-21 03:02PM", 2048),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
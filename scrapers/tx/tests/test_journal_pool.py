@@ -0,0 +1,70 @@
+import datetime
+import os
+import tempfile
+import unittest
+
+from tx.votes import TXVoteScraper
+
+here = os.path.dirname(__file__)
+
+HOUSE_DATE = '<div class="textpara">SECOND DAY — TUESDAY, JANUARY 12, 2021</div>'
+
+
+def journal(date=""):
+    with open(os.path.join(here, "fixtures", "roll_call_vote.html")) as f:
+        return f.read().replace("<body>", "<body>" + date)
+
+
+class FixtureScraper(TXVoteScraper):
+    """Serves journals from memory instead of the legislature's site."""
+
+    journals = [
+        ("https://journals.senate.texas.gov/SJRNL/87R/HTML/87RSJ01-12-F.HTM", "upper"),
+        ("https://journals.house.texas.gov/HJRNL/87R/HTML/87RDAY01FINAL.HTM", "lower"),
+        ("https://journals.senate.texas.gov/SJRNL/87R/HTML/87RSJ01-13-F.HTM", "upper"),
+        ("https://journals.house.texas.gov/HJRNL/87R/HTML/87RDAY02FINAL.HTM", "lower"),
+        ("https://journals.senate.texas.gov/SJRNL/87R/HTML/87RSJ01-14-F.HTM", "upper"),
+    ]
+    pages = {
+        journals[0][0]: journal(),
+        journals[1][0]: journal(HOUSE_DATE),
+        journals[3][0]: journal(HOUSE_DATE),
+        journals[4][0]: journal(),
+    }
+
+    def journal_urls(self, session, chambers):
+        return [j for j in self.journals if j[1] in chambers]
+
+    def fetch_journal(self, url):
+        return self.pages.get(url)
+
+    def get_session_year(self, session):
+        return 2021
+
+
+def scraped(**kwargs):
+    scraper = FixtureScraper(None, tempfile.mkdtemp())
+    votes = []
+    for vote in scraper.scrape(session="87", **kwargs):
+        votes.append((vote.dedupe_key, vote.as_dict()))
+        votes[-1][1].pop("_id")
+    return votes
+
+
+class TestJournalPool(unittest.TestCase):
+    def test_pool_matches_serial(self):
+        serial = scraped()
+        self.assertEqual(
+            [key for key, vote in serial],
+            [FixtureScraper.journals[i][0] + "#0" for i in (0, 1, 3, 4)],
+        )
+        self.assertEqual(serial[1][1]["start_date"], datetime.date(2021, 1, 12))
+        self.assertEqual(serial[3][1]["start_date"], datetime.date(2021, 1, 14))
+        self.assertEqual(scraped(workers="2"), serial)
+
+    def test_chamber(self):
+        self.assertEqual(len(scraped(chamber="lower", workers="3")), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,9 +4,11 @@ from urllib import parse as urlparse
 import datetime
 import scrapelib
 import collections
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 import lxml.html
 from openstates.scrape import Scraper, VoteEvent
+from utils.futures import ordered_map
 
 
 def next_tag(el):
@@ -329,8 +331,51 @@ def viva_voce_votes(root, session, chamber):
         yield v
 
 
+def parse_journal(page, url, chamber, session, year):
+    """
+    Return the votes in a journal page, dated and ready to save.
+
+    Kept at module level so it can run in a worker process; `year` is the
+    session's start year, needed for senate journals.
+    """
+    root = lxml.html.fromstring(page)
+    clean_journal(root)
+
+    if chamber == "lower":
+        div = root.xpath("//div[@class = 'textpara']")[0]
+        date_str = " ".join(div.text.split()[-4:]).strip()
+        date = datetime.datetime.strptime(date_str, "%A, %B %d, %Y").date()
+    else:
+        if year is None:
+            return []
+        fname = os.path.split(urlparse.urlparse(url).path)[-1]
+        date_str = (
+            re.match(r"%sSJ(\d\d-\d\d).*\.HTM" % session, fname).group(1) + " %s" % year
+        )
+        date = datetime.datetime.strptime(date_str, "%m-%d %Y").date()
+
+    journal_votes = []
+    for vn, vote in enumerate(votes(root, session, chamber)):
+        vote.start_date = date
+        vote.add_source(url)
+
+        # no good identifier on votes, so we'll try this.
+        # vote pages in journal shouldn't change so ordering should be OK
+        # but might cause an issue if they do change a journal page
+        vote.dedupe_key = "{}#{}".format(url, vn)
+        journal_votes.append(vote)
+    return journal_votes
+
+
+def parse_journal_args(args):
+    """parse_journal for a tuple of its arguments, for ordered_map."""
+    return parse_journal(*args)
+
+
 class TXVoteScraper(Scraper):
-    def scrape(self, session=None, chamber=None):
+    # workers=4 fetches that many journals at once, and parses them in as
+    # many processes
+    def scrape(self, session=None, chamber=None, workers=1):
         if not session:
             session = self.latest_session()
             self.info("No session specified; using %s", session)
@@ -343,7 +388,24 @@ class TXVoteScraper(Scraper):
             session = "%sR" % session
 
         chambers = [chamber] if chamber else ["upper", "lower"]
+        journals = self.journal_urls(session, chambers)
+
+        workers = int(workers)
+        if workers > 1:
+            yield from self.scrape_journals(journals, session, workers)
+            return
+
+        for journal_url, journal_chamber in journals:
+            page = self.fetch_journal(journal_url)
+            if page is not None:
+                yield from self.scrape_journal(
+                    journal_url, journal_chamber, session, page
+                )
 
+    def journal_urls(self, session, chambers):
+        """
+        Yield (url, chamber) for every journal that could exist this year.
+        """
         # go through every day this year before today
         # and see if there were any journals that day
         today = datetime.datetime.today()
@@ -358,12 +420,7 @@ class TXVoteScraper(Scraper):
                 journal_url = (
                     journal_root + session + "DAY" + str(day_num).zfill(2) + "FINAL.HTM"
                 )
-                try:
-                    self.get(journal_url)
-                except scrapelib.HTTPError:
-                    pass
-                else:
-                    yield from self.scrape_journal(journal_url, "lower", session)
+                yield journal_url, "lower"
 
             if "upper" in chambers:
                 journal_root = (
@@ -374,46 +431,55 @@ class TXVoteScraper(Scraper):
                     str(journal_day.month).zfill(2),
                     str(journal_day.day).zfill(2),
                 )
-                try:
-                    self.get(journal_url)
-                except scrapelib.HTTPError:
-                    pass
-                else:
-                    yield from self.scrape_journal(journal_url, "upper", session)
+                yield journal_url, "upper"
 
             journal_day += datetime.timedelta(days=1)
             day_num += 1
 
-    def scrape_journal(self, url, chamber, session):
-        page = self.get(url).text
-
-        root = lxml.html.fromstring(page)
-        clean_journal(root)
+    def fetch_journal(self, url):
+        try:
+            return self.get(url).text
+        except scrapelib.HTTPError:
+            return None
 
-        if chamber == "lower":
-            div = root.xpath("//div[@class = 'textpara']")[0]
-            date_str = " ".join(div.text.split()[-4:]).strip()
-            date = datetime.datetime.strptime(date_str, "%A, %B %d, %Y").date()
-        else:
+    def fetch_journals(self, journals, workers):
+        """
+        Yield (url, chamber, page) for each journal, in order, fetching up
+        to `workers` at once. page is None where there is no journal.
+        """
+        def fetch(journal):
+            url, chamber = journal
+            return url, chamber, self.fetch_journal(url)
+
+        with ThreadPoolExecutor(workers) as pool:
+            yield from ordered_map(pool, fetch, journals, workers * 2)
+
+    def scrape_journals(self, journals, session, workers):
+        """
+        Parse journals in a pool of `workers` processes, yielding their
+        votes in journal order.
+        """
+        def pages():
+            year = None
+            for url, chamber, page in self.fetch_journals(journals, workers):
+                if page is None:
+                    continue
+                if chamber == "upper" and year is None:
+                    year = self.get_session_year(session)
+                yield page, url, chamber, session, year
+
+        with ProcessPoolExecutor(workers) as pool:
+            for votes in ordered_map(pool, parse_journal_args, pages(), workers * 2):
+                yield from votes
+
+    def scrape_journal(self, url, chamber, session, page=None):
+        if page is None:
+            page = self.get(url).text
+
+        year = None
+        if chamber == "upper":
             year = self.get_session_year(session)
-            if year is None:
-                return
-            fname = os.path.split(urlparse.urlparse(url).path)[-1]
-            date_str = (
-                re.match(r"%sSJ(\d\d-\d\d).*\.HTM" % session, fname).group(1)
-                + " %s" % year
-            )
-            date = datetime.datetime.strptime(date_str, "%m-%d %Y").date()
-
-        for vn, vote in enumerate(votes(root, session, chamber)):
-            vote.start_date = date
-            vote.add_source(url)
-
-            # no good identifier on votes, so we'll try this.
-            # vote pages in journal shouldn't change so ordering should be OK
-            # but might cause an issue if they do change a journal page
-            vote.dedupe_key = "{}#{}".format(url, vn)
-            yield vote
+        yield from parse_journal(page, url, chamber, session, year)
 
     def get_session_year(self, session):
         if "R" in session:
@@ -1,11 +1,23 @@
+import collections
 import datetime
+import io
+import json
 import lxml
+import lxml.etree
 import pytz
 import re
 import scrapelib
+import threading
+import time
 import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
 
 from openstates.scrape import Bill, Scraper
+from utils.files import atomic_write
+from utils.futures import ordered_map
+from utils.incremental import IncrementalMixin
+from utils.settings import cache_path, truthy
 
 # NOTE: This is a US federal bill scraper designed to output bills in the
 # openstates format, for compatibility with systems that already ingest the pupa format.
@@ -13,8 +25,69 @@ from openstates.scrape import Bill, Scraper
 # If you're looking to just collect federal bill data, you're probably better off with
 # https://github.com/unitedstates/congress which offers more backdata.
 
+WATERMARK_PATH = cache_path("usa", "watermarks.json")
 
-class USBillScraper(Scraper):
+
+class HostRateLimiter(object):
+    """Spaces out requests to each host, across however many threads are
+    making them.
+
+    ``requests_per_minute`` maps host names to a rate, with the None key
+    used for any other host; a rate of 0 or None means no limit.
+    """
+
+    def __init__(self, requests_per_minute):
+        self.requests_per_minute = requests_per_minute
+        self._lock = threading.Lock()
+        self._next_slot = {}
+
+    def wait(self, url):
+        host = urlparse(url).netloc
+        rpm = self.requests_per_minute.get(host, self.requests_per_minute.get(None))
+        if not rpm:
+            return
+
+        # reserve the next free slot for this host, then sleep until it comes
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + 60.0 / rpm
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class WatermarkStore(object):
+    """The newest sitemap lastmods seen by earlier runs, per session:
+
+        {session: {"index": {chamber: Last-Modified of the sitemap index},
+                   "sitemaps": {sitemap url: {"lastmod": its lastmod in the index,
+                                              "bills": newest bill lastmod in it}}}}
+
+    Only written through save(), which a run calls once a sitemap has been
+    scraped all the way through.
+    """
+
+    def __init__(self, path=WATERMARK_PATH):
+        self.path = path
+        try:
+            with open(path) as f:
+                self.data = json.load(f)
+        except FileNotFoundError:
+            self.data = {}
+
+    def session(self, session):
+        return self.data.setdefault(session, {"index": {}, "sitemaps": {}})
+
+    def save(self):
+        atomic_write(self.path, self.data)
+
+
+def parse_lastmod(lastmod):
+    # 2020-12-01T03:45:09.204Z
+    return datetime.datetime.fromisoformat(lastmod[:-1])
+
+
+class USBillScraper(IncrementalMixin, Scraper):
     # https://www.govinfo.gov/rss/billstatus-batch.xml
     # https://github.com/usgpo/bill-status/blob/master/BILLSTATUS-XML_User_User-Guide.md
 
@@ -32,6 +105,43 @@ class USBillScraper(Scraper):
     chambers = {"House": "lower", "Joint": "joint", "Senate": "upper"}
     chamber_map = {"upper": "s", "lower": "h"}
 
+    sitemap_url = "https://www.govinfo.gov/sitemap/bulkdata/BILLSTATUS/sitemapindex.xml"
+
+    # with workers > 1, requests per minute allowed to each host (None for
+    # any other host), instead of the scraper-wide throttle
+    host_requests_per_minute = {"www.govinfo.gov": 300, None: 60}
+    rate_limiter = None
+
+    watermark_path = WATERMARK_PATH
+
+    # parse sitemaps and BILLSTATUS files incrementally instead of building
+    # the whole tree; see iterparse_sitemap and iterparse_bill
+    streaming = False
+
+    # single values read from each BILLSTATUS file
+    bill_fields = (
+        "bill/billNumber",
+        "bill/billType",
+        "bill/originChamber",
+        "bill/title",
+        "bill/congress",
+    )
+    # the repeated BILLSTATUS elements handed to each scrape_* method
+    bill_rows = {
+        "actions": "bill/actions/item",
+        "amendments": "bill/amendments/amendment",
+        "cbo": "bill/cboCostEstimates/item",
+        "committee_reports": "bill/committeeReports/committeeReport",
+        "cosponsors": "bill/cosponsors/item",
+        "laws": "bill/laws/item",
+        "related_bills": "bill/relatedBills/item",
+        "sponsors": "bill/sponsors/item",
+        "subjects": "bill/subjects/billSubjects/legislativeSubjects/item",
+        "summaries": "bill/summaries/billSummaries/item",
+        "titles": "bill/titles/item",
+        "versions": "bill/textVersions/item",
+    }
+
     classifications = {
         "HRES": "resolution",
         "HCONRES": "resolution",
@@ -44,26 +154,50 @@ class USBillScraper(Scraper):
     }
 
     # to scrape everything UPDATED after a given date/time, start="2020-01-01 22:01:01"
-    def scrape(self, chamber=None, session=None, start=None):
+    # (a backfill like that doesn't move the watermarks)
+    # otherwise only bills updated since the last run are scraped, going by
+    # the watermarks in WATERMARK_PATH
+    # workers=8 fetches that many BILLSTATUS files at once
+    # streaming=true parses them a piece at a time, for less memory
+    def scrape(
+        self, chamber=None, session=None, start=None, workers=1, streaming=False
+    ):
+        workers = int(workers)
+        if truthy(streaming):
+            self.streaming = True
+        if workers > 1:
+            self.rate_limiter = HostRateLimiter(self.host_requests_per_minute)
+            self.requests_per_minute = 0
+
         if not session:
             session = self.latest_session()
             self.info("no session specified, using %s", session)
 
+        watermarks = WatermarkStore(self.watermark_path)
+        seen = watermarks.session(session)
+        index_key = chamber or "all"
+
+        headers = {}
+        incremental = not start
         if start:
             start = datetime.datetime.strptime(start, "%Y-%m-%d %H:%I:%S")
         else:
             start = datetime.datetime(1980, 1, 1, 0, 0, 1)
+            if seen["index"].get(index_key):
+                headers["If-Modified-Since"] = seen["index"][index_key]
 
-        sitemap_url = (
-            "https://www.govinfo.gov/sitemap/bulkdata/BILLSTATUS/sitemapindex.xml"
-        )
-        sitemaps = self.get(sitemap_url).content
-        root = ET.fromstring(sitemaps)
+        response = self.get(self.sitemap_url, headers=headers)
+        if response.status_code == 304:
+            self.info("sitemap index unchanged since %s", headers["If-Modified-Since"])
+            self.unchanged += 1
+            return
+        root = ET.fromstring(response.content)
 
         # if you want to test a bill:
         # yield from self.parse_bill('https://www.govinfo.gov/bulkdata/BILLSTATUS/116/hr/BILLSTATUS-116hr3884.xml')
 
-        for link in root.findall("us:sitemap/us:loc", self.ns):
+        for sitemap in root.findall("us:sitemap", self.ns):
+            link = sitemap.find("us:loc", self.ns)
             # split by /, then check that "116s" matches the chamber
             if chamber:
                 link_parts = link.text.split("/")
@@ -72,16 +206,63 @@ class USBillScraper(Scraper):
                     continue
 
             if session in link.text:
-                yield from self.parse_bill_list(link.text, start)
+                lastmod = self.get_xpath(sitemap, "us:lastmod")
+                previous = seen["sitemaps"].get(link.text)
+                if incremental and previous:
+                    if lastmod and lastmod == previous["lastmod"]:
+                        self.info("%s unchanged since %s", link.text, lastmod)
+                        self.unchanged += 1
+                        continue
+                    sitemap_start = max(start, parse_lastmod(previous["bills"]))
+                else:
+                    sitemap_start = start
 
-    def parse_bill_list(self, url, start):
+                newest = yield from self.parse_bill_list(
+                    link.text, sitemap_start, workers
+                )
+                # a backfill from an explicit start leaves the watermarks
+                # alone, so the next incremental run still sees what it missed
+                if not incremental:
+                    continue
+                if previous and (
+                    not newest
+                    or parse_lastmod(previous["bills"]) > parse_lastmod(newest)
+                ):
+                    newest = previous["bills"]
+                if newest:
+                    seen["sitemaps"][link.text] = {"lastmod": lastmod, "bills": newest}
+                    watermarks.save()
+
+        # only once every sitemap has been scraped, so a failed run is retried
+        if incremental and response.headers.get("Last-Modified"):
+            seen["index"][index_key] = response.headers["Last-Modified"]
+            watermarks.save()
+
+    def get(self, url, **kwargs):
+        if self.rate_limiter:
+            self.rate_limiter.wait(url)
+        return super().get(url, **kwargs)
+
+    def parse_bill_list(self, url, start, workers=1):
+        """Scrape the bills in a sitemap updated after `start`, returning
+        the newest lastmod in the sitemap once they have all been yielded.
+        """
         sitemap = self.get(url).content
-        root = ET.fromstring(sitemap)
-        for row in root.findall("us:url", self.ns):
-            date = datetime.datetime.fromisoformat(
-                self.get_xpath(row, "us:lastmod")[:-1]
+        if self.streaming:
+            rows = self.iterparse_sitemap(sitemap)
+        else:
+            rows = (
+                (self.get_xpath(row, "us:loc"), self.get_xpath(row, "us:lastmod"))
+                for row in ET.fromstring(sitemap).findall("us:url", self.ns)
             )
 
+        bill_urls = []
+        newest = None
+        for loc, lastmod in rows:
+            date = parse_lastmod(lastmod)
+            if newest is None or date > parse_lastmod(newest):
+                newest = lastmod
+
             if date > start:
                 self.info(
                     "{} > {}, scraping".format(
@@ -89,26 +270,108 @@ class USBillScraper(Scraper):
                         datetime.datetime.strftime(start, "%c"),
                     )
                 )
-                bill_url = self.get_xpath(row, "us:loc")
-                yield from self.parse_bill(bill_url)
+                bill_urls.append(loc)
+            else:
+                self.unchanged += 1
+
+        for bill_url, content in self.fetch_all(bill_urls, workers):
+            yield from self.parse_bill(bill_url, content)
+
+        return newest
+
+    def iterparse_sitemap(self, content):
+        """Yield (loc, lastmod) for each url in a sitemap, dropping each
+        element once it has been read.
+        """
+        url_tag = "{%s}url" % self.ns["us"]
+        root = None
+        for event, elem in ET.iterparse(io.BytesIO(content), events=("start", "end")):
+            if root is None:
+                root = elem
+            elif event == "end" and elem.tag == url_tag:
+                yield (
+                    elem.findtext("us:loc", namespaces=self.ns),
+                    elem.findtext("us:lastmod", namespaces=self.ns),
+                )
+                root.clear()
+
+    def iterparse_bill(self, content):
+        """Read the bill_fields and bill_rows out of a BILLSTATUS file in a
+        single pass, clearing each section of <bill> once it has been read.
+        """
+        names = {path: path for path in self.bill_fields}
+        names.update((path, name) for name, path in self.bill_rows.items())
+        # the paths that could end at each tag, with <bill>'s own children
+        # included (as None) so each section can be cleared when it ends
+        candidates = collections.defaultdict(list)
+        for path, name in names.items():
+            tags = path.split("/")
+            candidates[tags[-1]].append((tags, name))
+            if (tags[:2], None) not in candidates[tags[1]]:
+                candidates[tags[1]].append((tags[:2], None))
+
+        fields = {}
+        rows = {name: [] for name in self.bill_rows}
+        for event, elem in lxml.etree.iterparse(
+            io.BytesIO(content), events=("end",), tag=list(candidates)
+        ):
+            for tags, name in candidates[elem.tag]:
+                if not self.at_path(elem, tags):
+                    continue
+                if name in rows:
+                    rows[name].append(elem)
+                elif name and name not in fields:
+                    fields[name] = elem.text
+                if len(tags) == 2:
+                    elem.clear()
+                break
+        return fields, rows
+
+    def at_path(self, elem, tags):
+        """Whether `elem` is at `tags` below the document root."""
+        for tag in reversed(tags):
+            if elem is None or elem.tag != tag:
+                return False
+            elem = elem.getparent()
+        return elem is not None and elem.getparent() is None
+
+    def fetch_all(self, urls, workers=1):
+        """Yield (url, content) for each of `urls`, in order, fetching up to
+        `workers` of them at once.
+        """
+        if workers <= 1:
+            for url in urls:
+                yield url, self.get(url).content
+            return
+
+        with ThreadPoolExecutor(workers) as pool:
+            yield from ordered_map(
+                pool, lambda url: (url, self.get(url).content), urls, workers * 2
+            )
 
-    def parse_bill(self, url):
-        xml = self.get(url).content
-        xml = ET.fromstring(xml)
+    def parse_bill(self, url, content=None):
+        if content is None:
+            content = self.get(url).content
+        if self.streaming:
+            fields, rows = self.iterparse_bill(content)
+        else:
+            xml = ET.fromstring(content)
+            fields = {path: self.get_xpath(xml, path) for path in self.bill_fields}
+            rows = {name: xml.findall(path) for name, path in self.bill_rows.items()}
 
-        bill_num = self.get_xpath(xml, "bill/billNumber")
-        bill_type = self.get_xpath(xml, "bill/billType")
+        bill_num = fields["bill/billNumber"]
+        bill_type = fields["bill/billType"]
 
         bill_id = "{} {}".format(bill_type, bill_num)
 
-        chamber_name = self.get_xpath(xml, "bill/originChamber")
+        chamber_name = fields["bill/originChamber"]
         chamber = self.chambers[chamber_name]
 
-        title = self.get_xpath(xml, "bill/title")
+        title = fields["bill/title"]
 
         classification = self.classifications[bill_type]
 
-        session = self.get_xpath(xml, "bill/congress")
+        session = fields["bill/congress"]
 
         bill = Bill(
             bill_id,
@@ -118,18 +381,18 @@ class USBillScraper(Scraper):
             classification=classification,
         )
 
-        self.scrape_actions(bill, xml)
-        self.scrape_amendments(bill, xml, session, chamber, bill_id)
-        self.scrape_cbo(bill, xml)
-        self.scrape_committee_reports(bill, xml)
-        self.scrape_cosponsors(bill, xml)
-        self.scrape_laws(bill, xml)
-        self.scrape_related_bills(bill, xml)
-        self.scrape_sponsors(bill, xml)
-        self.scrape_subjects(bill, xml)
-        self.scrape_summaries(bill, xml)
-        self.scrape_titles(bill, xml)
-        self.scrape_versions(bill, xml)
+        self.scrape_actions(bill, rows["actions"])
+        self.scrape_amendments(bill, rows["amendments"], session, chamber, bill_id)
+        self.scrape_cbo(bill, rows["cbo"])
+        self.scrape_committee_reports(bill, rows["committee_reports"])
+        self.scrape_cosponsors(bill, rows["cosponsors"])
+        self.scrape_laws(bill, rows["laws"])
+        self.scrape_related_bills(bill, rows["related_bills"])
+        self.scrape_sponsors(bill, rows["sponsors"])
+        self.scrape_subjects(bill, rows["subjects"])
+        self.scrape_summaries(bill, rows["summaries"])
+        self.scrape_titles(bill, rows["titles"])
+        self.scrape_versions(bill, rows["versions"])
 
         # https://www.congress.gov/bill/116th-congress/house-bill/1
         xml_url = "https://www.govinfo.gov/bulkdata/BILLSTATUS/{congress}/{type}/BILLSTATUS-{congress}{type}{num}.xml"
@@ -209,16 +472,17 @@ class USBillScraper(Scraper):
         return None
 
     def get_xpath(self, xml, xpath):
-        if not xml.findall(xpath, self.ns):
+        match = xml.find(xpath, self.ns)
+        if match is None:
             return
-        return xml.findall(xpath, self.ns)[0].text
+        return match.text
 
-    def scrape_actions(self, bill, xml):
+    def scrape_actions(self, bill, rows):
         # TODO: Skip all LOC actions? just some LOC actions?
 
         # list for deduping
         actions = []
-        for row in xml.findall("bill/actions/item"):
+        for row in rows:
             action_text = self.get_xpath(row, "text")
             if action_text not in actions:
                 source = self.get_xpath(row, "sourceSystem/name")
@@ -263,7 +527,7 @@ class USBillScraper(Scraper):
                 )
                 actions.append(action_text)
 
-    def scrape_amendments(self, bill, xml, session, chamber, bill_id):
+    def scrape_amendments(self, bill, rows, session, chamber, bill_id):
         slugs = {
             "HAMDT": "house-amendment",
             "SAMDT": "senate-amendment",
@@ -273,7 +537,7 @@ class USBillScraper(Scraper):
         )
         amdt_name = "{type} {num}"
 
-        for row in xml.findall("bill/amendments/amendment"):
+        for row in rows:
             session = self.get_xpath(row, "congress")
             num = self.get_xpath(row, "number")
 
@@ -323,8 +587,8 @@ class USBillScraper(Scraper):
                 return
 
     # CBO cost estimates
-    def scrape_cbo(self, bill, xml):
-        for row in xml.findall("bill/cboCostEstimates/item"):
+    def scrape_cbo(self, bill, rows):
+        for row in rows:
             bill.add_document_link(
                 note="CBO: {}".format(self.get_xpath(row, "title")),
                 url=self.get_xpath(row, "url"),
@@ -332,11 +596,11 @@ class USBillScraper(Scraper):
             )
 
     # ex: https://www.govinfo.gov/bulkdata/BILLSTATUS/116/hr/BILLSTATUS-116hr1218.xml
-    def scrape_committee_reports(self, bill, xml):
+    def scrape_committee_reports(self, bill, rows):
         crpt_url = "https://www.congress.gov/{session}/crpt/{chamber}rpt{num}/CRPT-{session}{chamber}rpt{num}.pdf"
         regex = r"(?P<chamber>[H|S|J])\.\s+Rept\.\s+(?P<session>\d+)-(?P<num>\d+)"
 
-        for row in xml.findall("bill/committeeReports/committeeReport"):
+        for row in rows:
             report = self.get_xpath(row, "citation")
             match = re.search(regex, report)
 
@@ -348,9 +612,9 @@ class USBillScraper(Scraper):
 
             bill.add_document_link(note=report, url=url, media_type="application/pdf")
 
-    def scrape_cosponsors(self, bill, xml):
+    def scrape_cosponsors(self, bill, rows):
         all_sponsors = []
-        for row in xml.findall("bill/cosponsors/item"):
+        for row in rows:
             if not self.get_xpath(row, "sponsorshipWithdrawnDate"):
                 bill.add_sponsorship(
                     self.build_sponsor_name(row),
@@ -361,10 +625,10 @@ class USBillScraper(Scraper):
                 all_sponsors.append(self.get_xpath(row, "bioguideId"))
         bill.extras["cosponsor_bioguides"] = all_sponsors
 
-    def scrape_laws(self, bill, xml):
+    def scrape_laws(self, bill, rows):
         law_format = "{type} {num}"
         laws = []
-        for row in xml.findall("bill/laws/item"):
+        for row in rows:
             laws.append(
                 law_format.format(
                     type=self.get_xpath(row, "type"),
@@ -373,8 +637,8 @@ class USBillScraper(Scraper):
             )
         bill.extras["laws"] = laws
 
-    def scrape_related_bills(self, bill, xml):
-        for row in xml.findall("bill/relatedBills/item"):
+    def scrape_related_bills(self, bill, rows):
+        for row in rows:
             identifier = "{type} {num}".format(
                 type=self.get_xpath(row, "type"), num=self.get_xpath(row, "number")
             )
@@ -385,9 +649,9 @@ class USBillScraper(Scraper):
                 relation_type="companion",
             )
 
-    def scrape_sponsors(self, bill, xml):
+    def scrape_sponsors(self, bill, rows):
         all_sponsors = []
-        for row in xml.findall("bill/sponsors/item"):
+        for row in rows:
             if not row.findall("sponsorshipWithdrawnDate"):
                 bill.add_sponsorship(
                     self.build_sponsor_name(row),
@@ -398,13 +662,13 @@ class USBillScraper(Scraper):
                 all_sponsors.append(self.get_xpath(row, "bioguideId"))
         bill.extras["sponsor_bioguides"] = all_sponsors
 
-    def scrape_subjects(self, bill, xml):
-        for row in xml.findall("bill/subjects/billSubjects/legislativeSubjects/item"):
+    def scrape_subjects(self, bill, rows):
+        for row in rows:
             bill.add_subject(self.get_xpath(row, "name"))
 
-    def scrape_summaries(self, bill, xml):
+    def scrape_summaries(self, bill, rows):
         seen_abstracts = set()
-        for row in xml.findall("bill/summaries/billSummaries/item"):
+        for row in rows:
             abstract = self.get_xpath(row, "text")
 
             if abstract not in seen_abstracts:
@@ -414,12 +678,12 @@ class USBillScraper(Scraper):
                 )
                 seen_abstracts.add(abstract)
 
-    def scrape_titles(self, bill, xml):
+    def scrape_titles(self, bill, rows):
         all_titles = set()
         # add current title to prevent dupes
         all_titles.add(bill.title)
 
-        for alt_title in xml.findall("bill/titles/item"):
+        for alt_title in rows:
             all_titles.add(self.get_xpath(alt_title, "title"))
 
         all_titles.remove(bill.title)
@@ -427,8 +691,8 @@ class USBillScraper(Scraper):
         for title in all_titles:
             bill.add_title(title)
 
-    def scrape_versions(self, bill, xml):
-        for row in xml.findall("bill/textVersions/item"):
+    def scrape_versions(self, bill, rows):
+        for row in rows:
             version_title = self.get_xpath(row, "type")
 
             for version in row.findall("formats/item"):
@@ -0,0 +1,124 @@
+"""
+Time and peak memory of USBillScraper's sitemap and BILLSTATUS parsing,
+building the whole tree vs. streaming=true, on the recorded fixtures
+scaled up to the size of real sitemaps and long-running bills.
+
+Each measurement runs in its own process so the peak RSS (which, unlike
+tracemalloc, includes lxml's allocations) isn't shared between them.
+
+    $ cd scrapers && python -m usa.tests.bench_bill_parsing --urls 20000 --repeat 200
+"""
+
+import argparse
+import contextlib
+import functools
+import io
+import os
+import re
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+
+from usa.bills import USBillScraper
+
+fixtures = os.path.join(os.path.dirname(__file__), "fixtures")
+SITEMAP = "sitemap/bulkdata/BILLSTATUS/116s/sitemap.xml"
+BILLSTATUS = "bulkdata/BILLSTATUS/116/s/BILLSTATUS-116s2.xml"
+
+
+def read(path):
+    with open(os.path.join(fixtures, path), "rb") as f:
+        return f.read()
+
+
+def repeat_rows(content, parent, count):
+    """Repeat every child of each <parent> element `count` times."""
+    pattern = re.compile(
+        rb"(<%s>)(.*?)(</%s>)" % (parent.encode(), parent.encode()), re.S
+    )
+    return pattern.sub(lambda m: m.group(1) + m.group(2) * count + m.group(3), content)
+
+
+def sitemap(urls):
+    content = read(SITEMAP)
+    rows = re.findall(rb"<url>.*?</url>", content, re.S)
+    body = b"".join(rows[i % len(rows)] for i in range(urls))
+    return re.sub(rb"<url>.*</url>", lambda m: body, content, flags=re.S)
+
+
+def billstatus(repeat):
+    content = read(BILLSTATUS)
+    # rows that the scraper dedupes, so the bill itself stays the same
+    for parent in ("actions", "summaries", "titles"):
+        content = repeat_rows(content, parent, repeat)
+    return content
+
+
+def parse_sitemap(scraper, content):
+    if scraper.streaming:
+        rows = scraper.iterparse_sitemap(content)
+    else:
+        rows = (
+            (scraper.get_xpath(row, "us:loc"), scraper.get_xpath(row, "us:lastmod"))
+            for row in ET.fromstring(content).findall("us:url", scraper.ns)
+        )
+    for row in rows:
+        pass
+
+
+def parse_bills(scraper, content, count):
+    # scrape_versions prints each version url
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(count):
+            for bill in scraper.parse_bill(BILLSTATUS, content):
+                pass
+
+
+def measure(args):
+    scraper = USBillScraper(None, tempfile.mkdtemp())
+    scraper.streaming = args.mode == "stream"
+    if args.what == "sitemap":
+        content, count = sitemap(args.urls), args.urls
+        func = parse_sitemap
+    else:
+        content, count = billstatus(args.repeat), args.bills
+        func = functools.partial(parse_bills, count=count)
+
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    func(scraper, content)
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - before
+    print(
+        "%-6s %-7s %8.0f per second  peak +%6.1f MB  (%.1f MB input)"
+        % (args.mode, args.what, count / elapsed, peak / 1024, len(content) / 1e6)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--urls", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--bills", type=int, default=20)
+    parser.add_argument("--mode", choices=("tree", "stream"))
+    parser.add_argument("--what", choices=("sitemap", "bills"))
+    args = parser.parse_args()
+
+    if args.mode:
+        measure(args)
+        return
+
+    for what in ("sitemap", "bills"):
+        for mode in ("tree", "stream"):
+            subprocess.run(
+                [sys.executable, "-m", __spec__.name, "--mode", mode, "--what", what]
+                + sys.argv[1:],
+                check=True,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import os
+import tempfile
+import time
+import unittest
+
+from usa.bills import HostRateLimiter, USBillScraper
+from utils.tests.fixture_server import FixtureServer, make_scraper
+
+fixtures = os.path.join(os.path.dirname(__file__), "fixtures")
+GOVINFO = b"https://www.govinfo.gov/"
+
+
+def scraper(base_url):
+    datadir = tempfile.mkdtemp()
+    return make_scraper(
+        USBillScraper,
+        datadir,
+        watermark_path=os.path.join(datadir, "watermarks.json"),
+        sitemap_url=base_url + "sitemap/bulkdata/BILLSTATUS/sitemapindex.xml",
+    )
+
+
+def scraped(scraper, **kwargs):
+    bills = []
+    for bill in scraper.scrape(chamber="upper", session="116", **kwargs):
+        bill = bill.as_dict()
+        bill.pop("_id")
+        bills.append(bill)
+    return bills
+
+
+class TestConcurrentFetch(unittest.TestCase):
+    def test_same_bills_in_same_order(self):
+        with FixtureServer(fixtures, GOVINFO) as server:
+            serial = scraped(scraper(server.base_url))
+            concurrent = scraped(scraper(server.base_url), workers="3")
+            streamed = scraped(scraper(server.base_url), streaming="true")
+        self.assertEqual([b["identifier"] for b in serial], ["S 1", "S 2", "S 3"])
+        self.assertEqual(serial, concurrent)
+        self.assertEqual(serial, streamed)
+
+    def test_start(self):
+        with FixtureServer(fixtures, GOVINFO) as server:
+            bills = scraped(
+                scraper(server.base_url), start="2020-11-01 00:01:00", workers="2"
+            )
+        self.assertEqual([b["identifier"] for b in bills], ["S 2", "S 3"])
+
+    def test_host_rate_limit(self):
+        limiter = HostRateLimiter({"slow.example.com": 600, None: 0})
+        start = time.monotonic()
+        for _ in range(4):
+            limiter.wait("https://slow.example.com/a")
+            limiter.wait("https://fast.example.com/b")
+        # three gaps of 100ms on the slow host, none on the other
+        self.assertGreaterEqual(time.monotonic() - start, 0.3)
+        self.assertLess(time.monotonic() - start, 0.6)
+
+
+if __name__ == "__main__":
+    unittest.main()
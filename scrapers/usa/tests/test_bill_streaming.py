@@ -0,0 +1,66 @@
+import glob
+import os
+import tempfile
+import unittest
+
+from usa.bills import USBillScraper
+
+fixtures = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def scraper(streaming):
+    scraper = USBillScraper(None, tempfile.mkdtemp())
+    scraper.streaming = streaming
+    return scraper
+
+
+def read(path):
+    with open(os.path.join(fixtures, path), "rb") as f:
+        return f.read()
+
+
+class TestStreaming(unittest.TestCase):
+    def test_sitemap_rows(self):
+        content = read("sitemap/bulkdata/BILLSTATUS/116s/sitemap.xml")
+        rows = list(scraper(True).iterparse_sitemap(content))
+        self.assertEqual(
+            rows,
+            [
+                (
+                    "https://www.govinfo.gov/bulkdata/BILLSTATUS/116/s/BILLSTATUS-116s%d.xml"
+                    % num,
+                    lastmod,
+                )
+                for num, lastmod in (
+                    (1, "2020-06-01T14:02:11.512Z"),
+                    (2, "2020-12-01T03:45:09.204Z"),
+                    (3, "2021-01-02T09:30:00.000Z"),
+                )
+            ],
+        )
+
+    def test_same_bills_as_tree(self):
+        paths = sorted(
+            glob.glob(os.path.join(fixtures, "bulkdata/**/*.xml"), recursive=True)
+        )
+        self.assertTrue(paths)
+        for path in paths:
+            content = read(path)
+            tree = [b.as_dict() for b in scraper(False).parse_bill(path, content)]
+            streamed = [b.as_dict() for b in scraper(True).parse_bill(path, content)]
+            for bill in tree + streamed:
+                bill.pop("_id")
+            self.assertEqual(tree, streamed)
+
+    def test_fields_and_rows(self):
+        content = read("bulkdata/BILLSTATUS/116/s/BILLSTATUS-116s2.xml")
+        fields, rows = scraper(True).iterparse_bill(content)
+        self.assertEqual(fields["bill/billType"], "S")
+        self.assertEqual(fields["bill/billNumber"], "2")
+        self.assertEqual(set(rows), set(USBillScraper.bill_rows))
+        self.assertTrue(rows["actions"])
+        self.assertTrue(all(row.tag == "item" for row in rows["actions"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import json
+import os
+import tempfile
+import unittest
+
+from usa.bills import USBillScraper, WatermarkStore
+from utils.tests.fixture_server import FixtureServer, make_scraper
+
+fixtures = os.path.join(os.path.dirname(__file__), "fixtures")
+GOVINFO = b"https://www.govinfo.gov/"
+INDEX = "sitemap/bulkdata/BILLSTATUS/sitemapindex.xml"
+SENATE = "sitemap/bulkdata/BILLSTATUS/116s/sitemap.xml"
+
+
+class TestWatermarks(unittest.TestCase):
+    def setUp(self):
+        self.datadir = tempfile.mkdtemp()
+        self.path = os.path.join(self.datadir, "watermarks.json")
+
+    def scraper(self, server):
+        del server.requests[:]
+        return make_scraper(
+            USBillScraper,
+            self.datadir,
+            sitemap_url=server.url(INDEX),
+            watermark_path=self.path,
+        )
+
+    def scrape(self, server, **kwargs):
+        return [
+            bill.identifier
+            for bill in self.scraper(server).scrape(
+                chamber="upper", session="116", **kwargs
+            )
+        ]
+
+    def test_first_run_records_watermarks(self):
+        with FixtureServer(fixtures, GOVINFO) as server:
+            self.assertEqual(self.scrape(server), ["S 1", "S 2", "S 3"])
+            seen = WatermarkStore(self.path).session("116")
+            self.assertEqual(
+                seen["sitemaps"][server.url(SENATE)],
+                {
+                    "lastmod": "2021-01-02T09:30:00.000Z",
+                    "bills": "2021-01-02T09:30:00.000Z",
+                },
+            )
+            self.assertIn("upper", seen["index"])
+
+    def test_unchanged_index_is_skipped(self):
+        with FixtureServer(fixtures, GOVINFO) as server:
+            self.scrape(server)
+            self.assertEqual(self.scrape(server), [])
+            self.assertEqual(server.requests, ["/" + INDEX])
+
+    def test_unchanged_run_succeeds(self):
+        with FixtureServer(fixtures, GOVINFO) as server:
+            self.scrape(server)
+            # the index is a 304, so there is nothing to save
+            scraper = self.scraper(server)
+            record = scraper.do_scrape(chamber="upper", session="116")
+            self.assertEqual(record["objects"], {})
+            self.assertEqual(scraper.unchanged, 1)
+            self.assertEqual(server.requests, ["/" + INDEX])
+
+    def test_only_newer_bills_are_fetched(self):
+        with FixtureServer(fixtures, GOVINFO) as server:
+            self.scrape(server)
+
+            # as if the last run finished before s3 was updated
+            with open(self.path) as f:
+                data = json.load(f)
+            data["116"]["index"] = {}
+            data["116"]["sitemaps"][server.url(SENATE)] = {
+                "lastmod": "2020-12-01T03:45:09.204Z",
+                "bills": "2020-12-01T03:45:09.204Z",
+            }
+            with open(self.path, "w") as f:
+                json.dump(data, f)
+
+            self.assertEqual(self.scrape(server), ["S 3"])
+            self.assertEqual(
+                WatermarkStore(self.path).session("116")["sitemaps"][
+                    server.url(SENATE)
+                ]["bills"],
+                "2021-01-02T09:30:00.000Z",
+            )
+
+    def test_unchanged_sitemap_is_skipped(self):
+        with FixtureServer(fixtures, GOVINFO) as server:
+            self.scrape(server)
+            data = WatermarkStore(self.path)
+            data.session("116")["index"] = {}
+            data.save()
+
+            self.assertEqual(self.scrape(server), [])
+            self.assertEqual(server.requests, ["/" + INDEX])
+
+    def test_start_ignores_watermarks(self):
+        with FixtureServer(fixtures, GOVINFO) as server:
+            self.scrape(server)
+            self.assertEqual(
+                self.scrape(server, start="2020-11-01 00:01:00"), ["S 2", "S 3"]
+            )
+
+    def test_start_leaves_watermarks_alone(self):
+        with FixtureServer(fixtures, GOVINFO) as server:
+            self.scrape(server, start="2020-11-01 00:01:00")
+            self.assertFalse(os.path.exists(self.path))
+            # so the next incremental run still scrapes everything
+            self.assertEqual(self.scrape(server), ["S 1", "S 2", "S 3"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,13 @@
 import re
 
+from .httpcache import HTTPCacheMixin  # noqa
+from .incremental import IncrementalMixin  # noqa
 from .lxmlize import LXMLMixin  # noqa
+from .lxmlize import ParsedPageMemo  # noqa
 from .lxmlize import url_xpath  # noqa
+from .pdf import PDFTextMixin  # noqa
+from .settings import cache_path  # noqa
+from .settings import truthy  # noqa
 from .state import State  # noqa
 
 
@@ -1,5 +1,5 @@
 import re
-from collections import namedtuple, defaultdict, Iterable
+from collections import namedtuple, defaultdict, Iterable, OrderedDict
 from six import string_types
 
 
@@ -59,6 +59,138 @@ class Rule(namedtuple("Rule", "regexes types stop attrs")):
             return None
 
 
+def _skip_group(pattern, i, close):
+    """Return the index just past the ``close`` ending the group or set
+    opened at ``pattern[i - 1]``, or None if it never closes.
+    """
+    depth = 1
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\":
+            i += 2
+            continue
+        if close == ")" and char == "[":
+            i = _skip_group(pattern, i + 1, "]")
+            if i is None:
+                return None
+            continue
+        if close == "]" and char == "]" and depth == 1:
+            return i + 1
+        if close == ")" and char == "(":
+            depth += 1
+        elif close == ")" and char == ")":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+    return None
+
+
+def _required_literal(regex):
+    """Return the longest run of literal characters that every match of
+    ``regex`` must contain, or "" if there isn't one we can rely on.
+
+    This scans the pattern text rather than parsing it properly, so it
+    gives up on anything it isn't sure of: alternation at the top level
+    and verbose patterns get no literal, and groups, sets, escapes other
+    than escaped punctuation, and characters followed by a quantifier
+    all end a run.
+    """
+    pattern = regex.pattern
+    if not isinstance(pattern, str) or regex.flags & re.VERBOSE:
+        return ""
+    ignorecase = regex.flags & re.IGNORECASE
+
+    runs = [""]
+    literal = False  # whether the last item added a character to the run
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "|":
+            return ""
+        elif char in "*?{":
+            # the previous character may not be there at all
+            if literal:
+                runs[-1] = runs[-1][:-1]
+            runs.append("")
+            literal = False
+            if char == "{":
+                end = pattern.find("}", i)
+                i = len(pattern) if end == -1 else end
+        elif char == "+":
+            # the previous character is there, but maybe repeated
+            runs.append("")
+            literal = False
+        elif char in "([":
+            i = _skip_group(pattern, i + 1, ")" if char == "(" else "]")
+            if i is None:
+                return ""
+            runs.append("")
+            literal = False
+            continue
+        else:
+            if char == "\\":
+                i += 1
+                char = pattern[i : i + 1]
+                literal = bool(char) and not char.isalnum() and char != "_"
+            else:
+                literal = char not in ".^$"
+            if literal and ignorecase and ord(char) > 127:
+                literal = False
+            if literal:
+                runs[-1] += char
+            else:
+                runs.append("")
+        i += 1
+
+    best = max(runs, key=len)
+    return best.lower() if ignorecase else best
+
+
+class CompiledRules(object):
+    """Matches a sequence of rules against action text with less work per rule.
+
+    Each regex gets a literal substring that any match must contain, and
+    the regex is only searched when that substring is in the text. For
+    case-insensitive regexes the check is made against the lowercased
+    text, and only for ASCII text where lowercasing is exact. Results are
+    identical to calling ``Rule.match`` on every rule.
+    """
+
+    def __init__(self, rules):
+        self.rules = list(rules)
+        self._plan = [
+            (
+                rule,
+                [
+                    (regex, _required_literal(regex), regex.flags & re.IGNORECASE)
+                    for regex in rule.regexes
+                ],
+            )
+            for rule in self.rules
+        ]
+
+    def match(self, text):
+        """Yield ``(rule, attrs)`` for each matching rule, in rule order."""
+        lowered = text.lower() if text.isascii() else None
+        for rule, checks in self._plan:
+            attrs = None
+            for regex, literal, ignorecase in checks:
+                if literal:
+                    if not ignorecase:
+                        if literal not in text:
+                            continue
+                    elif lowered is not None and literal not in lowered:
+                        continue
+                m = regex.search(text)
+                if m:
+                    if attrs is None:
+                        attrs = {}
+                    attrs.update(m.groupdict())
+            if attrs is not None:
+                yield rule, attrs
+
+
 class BaseCategorizer(object):
     """A class that exposes a main categorizer function
     and before and after hooks, in case categorization requires specific
@@ -69,35 +201,65 @@ class BaseCategorizer(object):
 
     rules = []
 
+    # Set to True to match rules through CompiledRules and memoize results
+    # for up to `cache_size` distinct action texts.
+    compiled = False
+    cache_size = 4096
+
+    _engine = None
+    _cache = None
+
     def __init__(self):
         pass
 
     def categorize(self, text):
+        if not self.compiled:
+            return self._categorize(text, self._match_rules)
+
+        if self._engine is None:
+            self._engine = CompiledRules(self.rules)
+            self._cache = OrderedDict()
+
+        try:
+            result = self._cache[text]
+            self._cache.move_to_end(text)
+        except KeyError:
+            result = self._categorize(text, self._engine.match)
+            self._cache[text] = result
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+        # callers are free to modify what they get back
+        return {k: list(v) if isinstance(v, list) else v for k, v in result.items()}
+
+    def _match_rules(self, text):
+        for rule in self.rules:
+            attrs = rule.match(text)
+            # matched if attrs is not None - empty attr dict means a match
+            if attrs is not None:
+                yield rule, attrs
+
+    def _categorize(self, text, match_rules):
         # run pre-categorization hook on text
         text = self.pre_categorize(text)
 
         types = set()
         return_val = defaultdict(set)
 
-        for rule in self.rules:
-
-            attrs = rule.match(text)
-
-            # matched if attrs is not None - empty attr dict means a match
-            if attrs is not None:
-                # add types, rule attrs and matched attrs
-                types |= rule.types
+        for rule, attrs in match_rules(text):
+            # add types, rule attrs and matched attrs
+            types |= rule.types
 
-                # Also add its specified attrs.
-                for k, v in attrs.items():
-                    return_val[k].add(v)
+            # Also add its specified attrs.
+            for k, v in attrs.items():
+                return_val[k].add(v)
 
-                return_val.update(**rule.attrs)
+            return_val.update(**rule.attrs)
 
-                # break if there was a match and rule says so, otherwise
-                # continue testing against other rules
-                if rule.stop:
-                    break
+            # break if there was a match and rule says so, otherwise
+            # continue testing against other rules
+            if rule.stop:
+                break
 
         # set type
         return_val["classification"] = list(types)
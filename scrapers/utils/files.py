@@ -0,0 +1,42 @@
+import contextlib
+import json
+import os
+import threading
+
+
+@contextlib.contextmanager
+def replacing(path):
+    """
+    Yields a temporary path to build the new contents of `path` in, which
+    replaces `path` only once the block succeeds, so an interrupted run
+    can't leave a truncated file behind.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    # unique to the thread, for files that several threads may write at once
+    tmp = "%s.%d.%d.tmp" % (path, os.getpid(), threading.get_ident())
+    try:
+        yield tmp
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def atomic_write(path, data):
+    """
+    Replaces the file at `path` with `data`: bytes, an iterator of bytes
+    (e.g. a streamed response's iter_content()), or anything else, which
+    is written as JSON.
+    """
+    if isinstance(data, bytes):
+        data = iter([data])
+    with replacing(path) as tmp:
+        if hasattr(data, "__next__"):
+            with open(tmp, "wb") as f:
+                for chunk in data:
+                    f.write(chunk)
+        else:
+            with open(tmp, "w") as f:
+                json.dump(data, f, indent=2, sort_keys=True)
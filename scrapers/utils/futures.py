@@ -0,0 +1,17 @@
+from collections import deque
+
+
+def ordered_map(executor, fn, items, window):
+    """
+    Yields fn(item) for each of `items`, in order, running them in
+    `executor` but keeping no more than `window` submitted ahead of the
+    caller, so a long or endless `items` isn't all fetched into memory
+    before the first result is used.
+    """
+    pending = deque()
+    for item in items:
+        pending.append(executor.submit(fn, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
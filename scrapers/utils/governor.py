@@ -0,0 +1,234 @@
+"""
+Rate limiting and backoff for the per-state API clients.
+
+Each host gets a token bucket, shared by every thread and client talking
+to it, that adapts to the server: the rate is halved whenever the server
+pushes back (a 429 or 503, or a connection error) and creeps back up to
+its ceiling as requests succeed. A Retry-After from the server pauses the
+whole host for that long.
+
+Ceilings are set by the clients, and can be overridden without a code
+change through OPENSTATES_RATE_LIMITS, a comma separated list of
+host=requests per second, e.g.
+
+    OPENSTATES_RATE_LIMITS=api.iga.in.gov=10,legislation.nysenate.gov=0
+
+where 0 means no limit (only backing off when the server asks).
+"""
+
+import datetime
+import email.utils
+import logging
+import os
+import threading
+import time
+from urllib.parse import urlparse
+
+import scrapelib
+
+logger = logging.getLogger("openstates")
+
+# status codes that mean the server wants us to slow down
+THROTTLED_STATUSES = (429, 503)
+
+
+def parse_rates(value):
+    """Returns {host: requests per second} for an OPENSTATES_RATE_LIMITS value."""
+    rates = {}
+    for item in value.split(","):
+        if item.strip():
+            host, _, rate = item.partition("=")
+            rates[host.strip()] = float(rate)
+    return rates
+
+
+def retry_after_seconds(response):
+    """Seconds to wait according to a response's Retry-After header, which
+    is either a number of seconds or an HTTP date, or None if it has none."""
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    now = datetime.datetime.now(datetime.timezone.utc)
+    return max(0.0, (when - now).total_seconds())
+
+
+class HostGovernor(object):
+    """
+    The token bucket and backoff state for one host.
+
+    `rate` is the ceiling in requests per second (None or 0 for no limit),
+    and `burst` how many requests can go out back to back after a quiet
+    spell. Backoff without a Retry-After starts at `backoff_base` seconds
+    and doubles with each consecutive failure, up to `max_backoff`.
+    """
+
+    def __init__(self, host, rate=None, burst=1, backoff_base=1.0, max_backoff=300.0):
+        self.host = host
+        self.max_rate = rate or None
+        self.rate = self.max_rate
+        self.burst = burst
+        self.backoff_base = backoff_base
+        self.max_backoff = max_backoff
+
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._resume_at = 0.0
+        self._failures = 0
+
+        self.requests = 0
+        self.retries = 0
+        self.wait_time = 0.0
+        self._first_request = None
+        self._last_request = None
+
+    def acquire(self):
+        """Blocks until a request may be sent to the host."""
+        with self._lock:
+            now = time.monotonic()
+            wait = max(0.0, self._resume_at - now)
+            if self.rate:
+                elapsed = now - self._updated
+                self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+                self._updated = now
+                # take the token now, even if that leaves the bucket in debt,
+                # so that waiting threads are served in turn
+                self._tokens -= 1
+                if self._tokens < 0:
+                    wait = max(wait, -self._tokens / self.rate)
+            self.requests += 1
+            self.wait_time += wait
+            if self._first_request is None:
+                self._first_request = now + wait
+            self._last_request = now + wait
+        if wait:
+            time.sleep(wait)
+
+    def throttled(self, retry_after=None):
+        """Records that the server pushed back, halving the rate and pausing
+        the host for `retry_after` seconds, or an exponential backoff if
+        the server didn't say."""
+        with self._lock:
+            self._failures += 1
+            self.retries += 1
+            if retry_after is None:
+                retry_after = min(
+                    self.max_backoff, self.backoff_base * 2 ** (self._failures - 1)
+                )
+            if self.rate:
+                self.rate = max(self.max_rate / 16, self.rate / 2)
+            self._resume_at = max(self._resume_at, time.monotonic() + retry_after)
+            rate = self.rate
+        logger.info(
+            "%s pushed back: pausing %.1f seconds, rate now %s/s",
+            self.host,
+            retry_after,
+            "%.2f" % rate if rate else "unlimited",
+        )
+
+    def succeeded(self):
+        """Records a successful request, letting the rate recover."""
+        with self._lock:
+            self._failures = 0
+            if self.rate and self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.max_rate / 10)
+
+    def call(self, send, retries=5, retry_on=()):
+        """
+        Returns send()'s response, once it isn't a throttled status.
+
+        A scrapelib.HTTPError for a throttled status counts as a throttled
+        response, and exceptions in `retry_on` are backed off from and
+        retried like one. After `retries` retries the last response is
+        returned, or the last exception raised, for the caller to deal with.
+        """
+        for attempt in range(retries + 1):
+            self.acquire()
+            try:
+                response = send()
+            except scrapelib.HTTPError as e:
+                status = getattr(e.response, "status_code", None)
+                if status not in THROTTLED_STATUSES or attempt == retries:
+                    raise
+                self.throttled(retry_after_seconds(e.response))
+                continue
+            except retry_on as e:
+                if attempt == retries:
+                    raise
+                logger.warning("%s: %s, retrying", self.host, e)
+                self.throttled()
+                continue
+
+            status = getattr(response, "status_code", None)
+            if status in THROTTLED_STATUSES and attempt < retries:
+                self.throttled(retry_after_seconds(response))
+                continue
+            self.succeeded()
+            return response
+
+    def metrics(self):
+        with self._lock:
+            if self.requests > 1 and self._last_request > self._first_request:
+                elapsed = self._last_request - self._first_request
+                per_second = (self.requests - 1) / elapsed
+            else:
+                per_second = None
+            return {
+                "requests": self.requests,
+                "requests_per_second": per_second,
+                "retries": self.retries,
+                "wait_time": self.wait_time,
+                "rate": self.rate,
+            }
+
+
+class Governor(object):
+    """The HostGovernors for every host, created as clients ask for them."""
+
+    def __init__(self, rates=None):
+        self.rates = rates if rates is not None else {}
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def host(self, url, rate=None, **kwargs):
+        """
+        Returns the HostGovernor for a URL's host (or a bare host name),
+        creating it with `rate` and the other HostGovernor arguments the
+        first time. A rate configured on the Governor wins over `rate`.
+        """
+        host = urlparse(url).netloc or url
+        with self._lock:
+            if host not in self._hosts:
+                rate = self.rates.get(host, rate)
+                self._hosts[host] = HostGovernor(host, rate, **kwargs)
+            return self._hosts[host]
+
+    def metrics(self):
+        with self._lock:
+            hosts = dict(self._hosts)
+        return {host: governor.metrics() for host, governor in hosts.items()}
+
+    def log_metrics(self, log=logger):
+        for host, metrics in sorted(self.metrics().items()):
+            per_second = metrics["requests_per_second"]
+            log.info(
+                "%s: %d requests (%s/s), %d retries, %.1f seconds waiting",
+                host,
+                metrics["requests"],
+                "%.2f" % per_second if per_second else "-",
+                metrics["retries"],
+                metrics["wait_time"],
+            )
+
+
+# shared by every client in the process, so that scrapers running against
+# the same host share its limit
+governor = Governor(parse_rates(os.environ.get("OPENSTATES_RATE_LIMITS", "")))
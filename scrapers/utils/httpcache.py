@@ -0,0 +1,244 @@
+"""
+An on-disk cache of HTTP responses that scrapers can opt into, so that a
+re-run after a parser fix doesn't download every page again.
+
+Response bodies are stored by the SHA-256 of their content, so a page
+served under several URLs is only kept once, and an SQLite index maps
+each URL to its body, headers and when it was fetched.
+
+How long a response stays fresh depends on its URL (see
+`HTTPCacheMixin.http_cache_ttls`). A stale one is revalidated with
+If-None-Match / If-Modified-Since, so that an unchanged page costs a 304
+instead of the whole body. Once the bodies grow past `max_size` bytes the
+least recently used entries are evicted.
+
+The cache is off unless OPENSTATES_HTTP_CACHE is set, so a scraper using
+the mixin only fetches through it when asked to. It lives in the "http"
+directory of OPENSTATES_CACHE_DIR. Environment variables:
+
+    OPENSTATES_HTTP_CACHE          set to 1 to turn the cache on
+    OPENSTATES_HTTP_CACHE_SIZE     its size limit in bytes (2 GB)
+    OPENSTATES_HTTP_CACHE_OFFLINE  set to 1 to replay from the cache only,
+                                   for parser development and CI (this
+                                   turns the cache on too)
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from .files import atomic_write
+from .settings import cache_path, truthy
+
+HTTP_CACHE_DIR = cache_path("http")
+HTTP_CACHE_SIZE = int(os.environ.get("OPENSTATES_HTTP_CACHE_SIZE", 2 * 1024**3))
+HTTP_CACHE_ENABLED = truthy(os.environ.get("OPENSTATES_HTTP_CACHE"))
+HTTP_CACHE_OFFLINE = truthy(os.environ.get("OPENSTATES_HTTP_CACHE_OFFLINE"))
+
+# response headers kept with the body; the rest are dropped
+KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Content-Disposition")
+
+
+class OfflineCacheMiss(requests.exceptions.ConnectionError):
+    """Raised in offline mode for a request that isn't in the cache."""
+
+
+class ResponseCache(object):
+    """
+    The bodies and index of the cache in `path`. Safe to share between
+    threads.
+    """
+
+    def __init__(self, path=HTTP_CACHE_DIR, max_size=HTTP_CACHE_SIZE):
+        self.path = path
+        self.max_size = max_size
+        os.makedirs(os.path.join(path, "bodies"), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(
+            os.path.join(path, "index.sqlite3"), check_same_thread=False
+        )
+        with self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses (url TEXT PRIMARY KEY, "
+                "status INTEGER, headers TEXT, body TEXT, fetched REAL, used REAL)"
+            )
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS bodies (body TEXT PRIMARY KEY, size INTEGER)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS lru ON responses (used)")
+
+    def body_path(self, body):
+        return os.path.join(self.path, "bodies", body[:2], body)
+
+    def get(self, url):
+        """
+        Returns (response, fetched) for a cached URL, fetched being the
+        time.time() it was last fetched or revalidated, or None.
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT status, headers, body, fetched FROM responses WHERE url = ?",
+                (url,),
+            ).fetchone()
+            if row is None:
+                return None
+            with self._db:
+                self._db.execute(
+                    "UPDATE responses SET used = ? WHERE url = ?", (time.time(), url)
+                )
+        status, headers, body, fetched = row
+        try:
+            with open(self.body_path(body), "rb") as f:
+                content = f.read()
+        except FileNotFoundError:
+            return None
+        return make_response(url, status, json.loads(headers), content), fetched
+
+    def put(self, url, response):
+        content = response.content
+        body = hashlib.sha256(content).hexdigest()
+        headers = {
+            name: response.headers[name]
+            for name in KEPT_HEADERS
+            if name in response.headers
+        }
+        path = self.body_path(body)
+        if not os.path.exists(path):
+            atomic_write(path, content)
+
+        now = time.time()
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR IGNORE INTO bodies VALUES (?, ?)", (body, len(content))
+            )
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (url, response.status_code, json.dumps(headers), body, now, now),
+            )
+            self._evict()
+
+    def touch(self, url):
+        """Marks a cached response as just revalidated."""
+        with self._lock, self._db:
+            now = time.time()
+            self._db.execute(
+                "UPDATE responses SET fetched = ?, used = ? WHERE url = ?",
+                (now, now, url),
+            )
+
+    def size(self):
+        with self._lock:
+            return self._db.execute("SELECT TOTAL(size) FROM bodies").fetchone()[0]
+
+    def _evict(self):
+        size = self._db.execute("SELECT TOTAL(size) FROM bodies").fetchone()[0]
+        if size <= self.max_size:
+            return
+        rows = self._db.execute("SELECT url FROM responses ORDER BY used").fetchall()
+        for (url,) in rows:
+            self._db.execute("DELETE FROM responses WHERE url = ?", (url,))
+            # remove bodies that no other URL is still using
+            for body, body_size in self._db.execute(
+                "SELECT body, size FROM bodies WHERE body NOT IN "
+                "(SELECT body FROM responses)"
+            ).fetchall():
+                self._db.execute("DELETE FROM bodies WHERE body = ?", (body,))
+                try:
+                    os.remove(self.body_path(body))
+                except FileNotFoundError:
+                    pass
+                size -= body_size
+            if size <= self.max_size:
+                return
+
+
+def make_response(url, status, headers, content):
+    response = requests.Response()
+    response.url = url
+    response.status_code = status
+    response.reason = "OK"
+    response.headers = CaseInsensitiveDict(headers)
+    response.encoding = get_encoding_from_headers(response.headers)
+    response._content = content
+    response._content_consumed = True
+    response.fromcache = True
+    return response
+
+
+class HTTPCacheMixin(object):
+    """
+    Mixin that caches a Scraper's GET responses on disk.
+
+    It has to come before Scraper in the bases, since it wraps
+    Scraper.request: ``class ILBillScraper(HTTPCacheMixin, Scraper)``.
+
+    `http_cache_ttls` is a list of (URL regex, seconds), the first match
+    giving how long a response stays fresh; anything else gets
+    `http_cache_ttl`. A TTL of 0, the default, revalidates every time (and
+    so downloads a page served without an ETag or Last-Modified again), and
+    None keeps a response until it's evicted. Offline, every cached
+    response is served, however old.
+
+    Requests go straight to Scraper.request unless `http_cache_enabled`
+    (OPENSTATES_HTTP_CACHE) or `http_cache_offline` is set.
+    """
+
+    http_cache_enabled = HTTP_CACHE_ENABLED
+    http_cache_ttl = 0
+    http_cache_ttls = []
+    http_cache_dir = HTTP_CACHE_DIR
+    http_cache_size = HTTP_CACHE_SIZE
+    http_cache_offline = HTTP_CACHE_OFFLINE
+
+    @property
+    def http_cache(self):
+        if getattr(self, "_http_cache", None) is None:
+            self._http_cache = ResponseCache(self.http_cache_dir, self.http_cache_size)
+        return self._http_cache
+
+    def http_cache_ttl_for(self, url):
+        for pattern, ttl in self.http_cache_ttls:
+            if re.search(pattern, url):
+                return ttl
+        return self.http_cache_ttl
+
+    def request(self, method, url, params=None, data=None, headers=None, **kwargs):
+        enabled = self.http_cache_enabled or self.http_cache_offline
+        if not enabled or method.upper() != "GET" or data is not None:
+            return super().request(
+                method, url, params=params, data=data, headers=headers, **kwargs
+            )
+
+        url = requests.Request(url=url, params=params).prepare().url
+        cached = self.http_cache.get(url)
+        if self.http_cache_offline:
+            if cached is None:
+                raise OfflineCacheMiss("{} is not in the HTTP cache".format(url))
+            return cached[0]
+
+        headers = dict(headers or {})
+        if cached is not None:
+            response, fetched = cached
+            ttl = self.http_cache_ttl_for(url)
+            if ttl is None or time.time() - fetched < ttl:
+                return response
+            if "ETag" in response.headers:
+                headers["If-None-Match"] = response.headers["ETag"]
+            if "Last-Modified" in response.headers:
+                headers["If-Modified-Since"] = response.headers["Last-Modified"]
+
+        fresh = super().request(method, url, headers=headers, **kwargs)
+        if cached is not None and fresh.status_code == 304:
+            self.http_cache.touch(url)
+            return response
+        if fresh.status_code == 200:
+            self.http_cache.put(url, fresh)
+        return fresh
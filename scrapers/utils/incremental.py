@@ -0,0 +1,44 @@
+from openstates.scrape.base import ScrapeError
+from openstates.utils import utcnow
+
+
+class IncrementalMixin(object):
+    """
+    Mixin for scrapers that skip what hasn't changed since their last run.
+
+    Scraper.do_scrape fails any run that returns no objects, which is just
+    what such a scraper returns when nothing has changed. The scraper adds
+    to `self.unchanged` for each page, file or bill it skips, and a run
+    that finishes with no objects but something unchanged is logged and
+    reported as empty instead of failing.
+    """
+
+    unchanged = 0
+
+    def do_scrape(self, **kwargs):
+        self.unchanged = 0
+        start = utcnow()
+        finished = []
+        scrape = self.scrape
+
+        def scrape_to_the_end(**kwargs):
+            yield from scrape(**kwargs) or []
+            finished.append(True)
+
+        self.scrape = scrape_to_the_end
+        try:
+            return super().do_scrape(**kwargs)
+        except ScrapeError:
+            # only the "no objects returned" check, after the whole scrape
+            if not finished or self.output_names or not self.unchanged:
+                raise
+        finally:
+            del self.scrape
+
+        self.info("nothing changed since the last run (%d unchanged)", self.unchanged)
+        return {
+            "objects": {},
+            "start": start,
+            "end": utcnow(),
+            "skipped": getattr(self, "skipped", 0),
+        }
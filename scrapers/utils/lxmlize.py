@@ -1,15 +1,141 @@
+import copy
+import os
+import re
+import threading
+from collections import OrderedDict
+
 import requests
 import lxml.html
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# seconds to wait for a connection, and then for the server to respond
+URL_XPATH_TIMEOUT = float(os.environ.get("URL_XPATH_TIMEOUT", 30))
 
+CHARSET = re.compile(r"charset=[\"']?([\w.:-]+)", re.IGNORECASE)
 
-def url_xpath(url, path, verify=True):
-    doc = lxml.html.fromstring(requests.get(url, verify=verify).text)
+
+def parse_html(response):
+    """Parses a response's bytes, using the charset in its Content-Type if
+    it has one and otherwise leaving lxml to find it in the document."""
+    match = CHARSET.search(response.headers.get("Content-Type", ""))
+    if match:
+        try:
+            parser = lxml.html.HTMLParser(encoding=match.group(1))
+        except LookupError:
+            pass
+        else:
+            return lxml.html.fromstring(response.content, parser=parser)
+    return lxml.html.fromstring(response.content)
+
+
+class ParsedPageMemo(object):
+    """
+    The last `size` pages parsed by `lxmlize`, by URL, for scrapers that
+    request the same page more than once in a run. Counts its hits and
+    misses.
+
+    Each hit is a copy of the stored tree, so callers can still modify the
+    pages they get.
+    """
+
+    def __init__(self, size=128):
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self._pages = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, url):
+        with self._lock:
+            page = self._pages.get(url)
+            if page is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._pages.move_to_end(url)
+        return copy.deepcopy(page)
+
+    def put(self, url, page):
+        page = copy.deepcopy(page)
+        with self._lock:
+            self._pages[url] = page
+            self._pages.move_to_end(url)
+            while len(self._pages) > self.size:
+                self._pages.popitem(last=False)
+
+    def __repr__(self):
+        return "<ParsedPageMemo {} pages, {} hits, {} misses>".format(
+            len(self._pages), self.hits, self.misses
+        )
+
+
+def make_session(pool_connections=10, pool_maxsize=10, retries=3, backoff_factor=1):
+    """
+    Returns a requests Session that keeps connections to up to
+    `pool_connections` hosts alive, `pool_maxsize` per host, and retries
+    connection errors and 429/5xx responses `retries` times, backing off
+    exponentially from `backoff_factor` seconds and honoring Retry-After.
+    """
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=("GET", "HEAD"),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=retry
+    )
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """The session url_xpath uses when it isn't given one, shared by every
+    caller so that connections are reused."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = make_session()
+        return _session
+
+
+def configure_session(**kwargs):
+    """Replaces the shared session with one made by make_session(**kwargs)."""
+    global _session
+    with _session_lock:
+        _session = make_session(**kwargs)
+
+
+def url_xpath(url, path, verify=True, session=None, timeout=URL_XPATH_TIMEOUT):
+    """
+    Fetches a page and returns the results of an XPath query on it.
+
+    Requests go through the shared, pooled session, unless a `session` is
+    given: pass a scraper to use its throttling, retries and caching.
+    """
+    if session is None:
+        session = get_session()
+    response = session.get(url, verify=verify, timeout=timeout)
+    doc = parse_html(response)
     return doc.xpath(path)
 
 
 class LXMLMixin(object):
     """Mixin for adding LXML helper functions to Open States code."""
 
+    # set to how many parsed pages to keep, to parse each page once per run;
+    # each scraper gets its own ParsedPageMemo of that size
+    lxmlize_memo_size = None
+    lxmlize_memo = None
+
     def lxmlize(self, url, raise_exceptions=False):
         """Parses document into an LXML object and makes links absolute.
 
@@ -18,6 +144,13 @@ class LXMLMixin(object):
         Returns:
             Element: Document node representing the page.
         """
+        if self.lxmlize_memo is None and self.lxmlize_memo_size:
+            self.lxmlize_memo = ParsedPageMemo(self.lxmlize_memo_size)
+        if self.lxmlize_memo is not None:
+            page = self.lxmlize_memo.get(url)
+            if page is not None:
+                return page
+
         try:
             # This class is always mixed into subclasses of `Scraper`,
             # which have a `get` method defined.
@@ -32,9 +165,14 @@ class LXMLMixin(object):
         if raise_exceptions:
             response.raise_for_status()
 
-        page = lxml.html.fromstring(response.text)
+        page = parse_html(response)
         page.make_links_absolute(url)
 
+        # only successful responses, so a later call that raises on errors
+        # still gets the chance to
+        if self.lxmlize_memo is not None and response.ok:
+            self.lxmlize_memo.put(url, page)
+
         return page
 
     def get_node(self, base_node, xpath_query):
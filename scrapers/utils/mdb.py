@@ -0,0 +1,184 @@
+"""
+Access databases (.mdb/.accdb) exported once into SQLite.
+
+Some states publish their data as an Access database, which mdbtools can
+only read a whole table at a time. MDBStore exports the tables a scraper
+needs into an indexed SQLite file the first time, and keeps it in the
+"mdb" directory of OPENSTATES_CACHE_DIR until the database on the server
+changes, so later runs skip both the download and the export. The other
+scrapers for the same state add the tables they need to the same file.
+"""
+
+import csv
+import io
+import json
+import os
+import shutil
+import sqlite3
+import subprocess
+import tempfile
+import zipfile
+
+from .files import replacing
+from .settings import cache_path
+
+MDB_CACHE_DIR = cache_path("mdb")
+
+
+def listing_entry(listing, filename):
+    """
+    Returns the line of an FTP directory listing for `filename`, which
+    changes whenever the file's date or size does, or None.
+    """
+    for line in listing.splitlines():
+        if line.split()[-1:] == [filename]:
+            return " ".join(line.split())
+    return None
+
+
+def export_table(mdbfile, table):
+    """Yields the header and then each row of a table, using mdb-export."""
+    command = ["mdb-export", mdbfile, table]
+    try:
+        proc = subprocess.Popen(command, stdout=subprocess.PIPE, close_fds=True)
+    except OSError as e:
+        raise EnvironmentError(
+            "error running %s, have you installed mdbtools? [%s]"
+            % (" ".join(command), e)
+        )
+    with proc:
+        # mdb-export quotes values with newlines in them, so this has to be
+        # a csv.reader over the whole stream rather than split on lines
+        yield from csv.reader(
+            io.TextIOWrapper(proc.stdout, encoding="utf8", newline="")
+        )
+    if proc.returncode:
+        raise EnvironmentError(
+            "%s exited with %d" % (" ".join(command), proc.returncode)
+        )
+
+
+def quote(name):
+    return '"%s"' % name.replace('"', '""')
+
+
+class MDBStore(object):
+    """
+    The tables exported from one Access database, in the SQLite file
+    `path`, with the `validator` (e.g. its listing_entry) of the copy they
+    came from.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._db = None
+        self.validator, self.tables = self._read_meta()
+
+    def _connect(self):
+        if self._db is None:
+            self._db = sqlite3.connect(self.path)
+        return self._db
+
+    def _read_meta(self):
+        if not os.path.exists(self.path):
+            return None, set()
+        try:
+            (meta,) = self._connect().execute("SELECT value FROM meta").fetchone()
+        except (sqlite3.DatabaseError, TypeError):
+            return None, set()
+        meta = json.loads(meta)
+        return meta["validator"], set(meta["tables"])
+
+    def is_current(self, validator, tables):
+        """Whether the store already has `tables` from the copy `validator`."""
+        return (
+            validator is not None
+            and validator == self.validator
+            and set(tables) <= self.tables
+        )
+
+    def refresh(self, scraper, url, validator, tables, indexes=None, member=None):
+        """
+        Downloads the database at `url` with `scraper`, unless the store
+        already has `tables` from the copy described by `validator`, and
+        exports the ones it doesn't have. `member` is the database's name
+        in the archive if `url` is a zip file, and `indexes` a
+        {table: [column, ...]} of the columns to look rows up by.
+        """
+        if self.is_current(validator, tables):
+            scraper.info("%s unchanged since the last run", url)
+            return
+
+        workdir = tempfile.mkdtemp()
+        try:
+            fname, _ = scraper.urlretrieve(url, dir=workdir)
+            if member:
+                with zipfile.ZipFile(fname) as zf:
+                    fname = zf.extract(member, workdir)
+            self.load(fname, tables, indexes or {}, validator)
+        finally:
+            shutil.rmtree(workdir)
+
+    def load(self, mdbfile, tables, indexes, validator):
+        """
+        Exports `tables` from `mdbfile`, adding them to what the store had
+        if that came from the same copy, and otherwise replacing it.
+        """
+        if validator is not None and validator == self.validator:
+            kept = self.tables
+        else:
+            kept = set()
+        tables = kept | set(tables)
+        with replacing(self.path) as tmp:
+            if kept:
+                shutil.copyfile(self.path, tmp)
+            db = sqlite3.connect(tmp)
+            with db:
+                db.execute("DROP TABLE IF EXISTS meta")
+                for table in tables:
+                    if table in kept:
+                        continue
+                    rows = export_table(mdbfile, table)
+                    columns = next(rows)
+                    db.execute(
+                        "CREATE TABLE %s (%s)"
+                        % (quote(table), ", ".join(quote(c) + " TEXT" for c in columns))
+                    )
+                    db.executemany(
+                        "INSERT INTO %s VALUES (%s)"
+                        % (quote(table), ", ".join("?" * len(columns))),
+                        rows,
+                    )
+                    for column in indexes.get(table, ()):
+                        db.execute(
+                            "CREATE INDEX %s ON %s (%s)"
+                            % (quote(table + "_" + column), quote(table), quote(column))
+                        )
+                db.execute("CREATE TABLE meta (value TEXT)")
+                db.execute(
+                    "INSERT INTO meta VALUES (?)",
+                    (json.dumps({"validator": validator, "tables": sorted(tables)}),),
+                )
+            db.close()
+
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+        self.validator, self.tables = validator, tables
+
+    def rows(self, table, where=None, params=()):
+        """
+        Yields each row of `table` as a dict, in the order mdb-export gave
+        them, optionally only those matching the SQL condition `where`.
+        """
+        query = "SELECT * FROM %s" % quote(table)
+        if where:
+            query += " WHERE " + where
+        cursor = self._connect().execute(query + " ORDER BY rowid", params)
+        columns = [column[0] for column in cursor.description]
+        for row in cursor:
+            yield dict(zip(columns, row))
+
+    def lookup(self, table, column, value):
+        """Returns the rows of `table` whose `column` is `value`."""
+        return list(self.rows(table, "%s = ?" % quote(column), (value,)))
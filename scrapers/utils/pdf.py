@@ -0,0 +1,174 @@
+"""
+PDF to text conversion shared by the scrapers that parse roll call PDFs.
+
+Conversions run on a bounded pool of workers, and their output is cached
+on disk under the SHA-256 of the PDF, so a roll call that hasn't changed
+since the last run is never converted again. The text is kept in the
+"pdf_text" directory of OPENSTATES_CACHE_DIR. A conversion that fails or
+times out gives whatever text it got out, which isn't cached.
+
+Environment variables:
+
+    OPENSTATES_PDF_WORKERS     how many conversions run at once (CPU count)
+"""
+
+import hashlib
+import logging
+import os
+import subprocess
+import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from .files import atomic_write
+from .settings import cache_path
+
+logger = logging.getLogger("openstates")
+
+PDF_CACHE_DIR = cache_path("pdf_text")
+PDF_WORKERS = int(os.environ.get("OPENSTATES_PDF_WORKERS", os.cpu_count() or 2))
+
+# the same commands as openstates.utils.convert_pdf
+COMMANDS = {
+    "text": ["pdftotext", "-layout", "{}", "-"],
+    "text-nolayout": ["pdftotext", "{}", "-"],
+    "xml": ["pdftohtml", "-xml", "-stdout", "{}"],
+    "html": ["pdftohtml", "-stdout", "{}"],
+}
+
+
+class PDFConverter(object):
+    """
+    Converts PDF data with pdftotext/pdftohtml on up to `workers` threads
+    at once, caching the output in `cache_dir`.
+    """
+
+    def __init__(self, workers=PDF_WORKERS, cache_dir=PDF_CACHE_DIR, timeout=120):
+        self.workers = workers
+        self.cache_dir = cache_dir
+        self.timeout = timeout
+        self.executor = ThreadPoolExecutor(workers)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def cache_path(self, data, type):
+        digest = hashlib.sha256(data).hexdigest()
+        return os.path.join(self.cache_dir, digest[:2], "{}.{}".format(digest, type))
+
+    def convert(self, data, type="text"):
+        """Returns the output of converting `data`, like convert_pdf."""
+        path = self.cache_path(data, type)
+        try:
+            with open(path, "rb") as f:
+                text = f.read()
+        except FileNotFoundError:
+            pass
+        else:
+            with self._lock:
+                self.hits += 1
+            return text
+
+        with self._lock:
+            self.misses += 1
+        with tempfile.NamedTemporaryFile(suffix=".pdf") as pdf:
+            pdf.write(data)
+            pdf.flush()
+            command = [arg.format(pdf.name) for arg in COMMANDS[type]]
+            try:
+                result = subprocess.run(
+                    command,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                    timeout=self.timeout,
+                )
+            except OSError as e:
+                raise EnvironmentError(
+                    "error running %s, missing executable? [%s]"
+                    % (" ".join(command), e)
+                )
+            except subprocess.TimeoutExpired as e:
+                logger.warning(
+                    "%s took over %s seconds, giving up", " ".join(command), e.timeout
+                )
+                return e.stdout or b""
+
+        # a failed conversion may work next time, so only cache successes
+        if result.returncode == 0:
+            atomic_write(path, result.stdout)
+        return result.stdout
+
+    def submit(self, fn, *args, **kwargs):
+        """Runs fn(*args, **kwargs) on one of the workers, returning a Future."""
+        return self.executor.submit(fn, *args, **kwargs)
+
+
+_converter = None
+_converter_lock = threading.Lock()
+
+
+def get_converter():
+    """The PDFConverter shared by every scraper in the process."""
+    global _converter
+    with _converter_lock:
+        if _converter is None:
+            _converter = PDFConverter()
+        return _converter
+
+
+class PDFTextMixin(object):
+    """
+    Mixin for scrapers that download PDFs and convert them to text.
+
+    Call prefetch_pdfs() with the URLs of a batch of PDFs, e.g. every roll
+    call linked from a bill, to download them and convert them in the
+    background, and then pdf_text() for each one. Errors fetching a PDF
+    are raised by pdf_text(), as they would be by self.get(url).
+
+    Only the conversions run on the workers: the PDFs are downloaded on
+    the scraper's own thread, since scrapelib's throttle isn't thread safe.
+    """
+
+    pdf_converter = None
+
+    def _pdf_converter(self):
+        return self.pdf_converter or get_converter()
+
+    def _pdf_futures(self):
+        if getattr(self, "_pending_pdfs", None) is None:
+            self._pending_pdfs = {}
+        return self._pending_pdfs
+
+    def fetch_pdf_text(self, url, type="text"):
+        return self._pdf_converter().convert(self.get(url).content, type)
+
+    def _submit_pdf(self, url, type):
+        converter = self._pdf_converter()
+        try:
+            data = self.get(url).content
+        except Exception as e:
+            # for pdf_text() to raise
+            future = Future()
+            future.set_exception(e)
+            return future
+        return converter.submit(converter.convert, data, type)
+
+    def prefetch_pdfs(self, urls, type="text"):
+        """
+        Fetches a batch of PDFs and starts converting them. Any left over
+        from the last batch that were never asked for are dropped.
+        """
+        pending = self._pdf_futures()
+        for future in pending.values():
+            future.cancel()
+        pending.clear()
+        for url in urls:
+            if (url, type) not in pending:
+                pending[url, type] = self._submit_pdf(url, type)
+
+    def pdf_text(self, url, type="text"):
+        """Returns the text of the PDF at `url`, as convert_pdf would."""
+        future = self._pdf_futures().pop((url, type), None)
+        if future is None:
+            return self.fetch_pdf_text(url, type)
+        return future.result()
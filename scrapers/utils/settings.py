@@ -0,0 +1,28 @@
+"""
+Settings shared by the scrapers and their caches.
+
+Environment variables:
+
+    OPENSTATES_CACHE_DIR   where scrapers keep caches and state between
+                           runs (_openstates_cache), each in its own
+                           subdirectory
+"""
+
+import os
+
+CACHE_DIR = os.path.abspath(os.environ.get("OPENSTATES_CACHE_DIR", "_openstates_cache"))
+
+
+def cache_path(*names):
+    """A path under CACHE_DIR, e.g. cache_path("tx", "ftp_listing.json")."""
+    return os.path.join(CACHE_DIR, *names)
+
+
+def truthy(value):
+    """
+    Whether a scraper argument or environment variable is switched on:
+    True, or a string such as "1", "true" or "yes" in any case.
+    """
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes", "on")
+    return bool(value)
@@ -0,0 +1,123 @@
+"""
+A local HTTP server for scraper tests, serving recorded files with the
+validators a real site would send, and a factory for scrapers that talk
+to it directly.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+from email.utils import formatdate, parsedate_to_datetime
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FixtureHandler(SimpleHTTPRequestHandler):
+    """Serves the fixtures with an ETag and a Last-Modified, answering
+    If-None-Match and If-Modified-Since with 304, and records each path
+    requested. Links to the server's recorded_host are pointed back at
+    the server."""
+
+    def do_GET(self):
+        path = self.translate_path(self.path)
+        if os.path.isdir(path):
+            # a directory listing
+            super().do_GET()
+            return
+        if not os.path.isfile(path):
+            self.send_error(404)
+            return
+
+        with open(path, "rb") as f:
+            body = f.read()
+        if self.server.recorded_host:
+            body = body.replace(
+                self.server.recorded_host, self.server.base_url.encode()
+            )
+        mtime = int(os.path.getmtime(path))
+        etag = '"%s"' % hashlib.md5(body).hexdigest()
+        self.server.requests.append(self.path)
+
+        match = self.headers.get("If-None-Match")
+        since = self.headers.get("If-Modified-Since")
+        if match is not None:
+            not_modified = match == etag
+        else:
+            not_modified = since and parsedate_to_datetime(since).timestamp() >= mtime
+        if not_modified:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", self.guess_type(path))
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", formatdate(mtime, usegmt=True))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class FixtureServer(object):
+    """
+    Serves `directory` on a local port, between start() and stop() or for
+    the length of a with block.
+
+    `recorded_host` is the URL prefix the fixtures were recorded from, as
+    bytes, and `handler` can replace FixtureHandler for tests that need
+    the server to misbehave.
+    """
+
+    def __init__(self, directory, recorded_host=None, handler=FixtureHandler):
+        self.directory = directory
+        self.recorded_host = recorded_host
+        self.handler = handler
+
+    def start(self):
+        self.httpd = ThreadingHTTPServer(
+            ("127.0.0.1", 0), partial(self.handler, directory=self.directory)
+        )
+        self.httpd.base_url = "http://127.0.0.1:%d/" % self.httpd.server_port
+        self.httpd.recorded_host = self.recorded_host
+        self.httpd.requests = []
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    @property
+    def base_url(self):
+        return self.httpd.base_url
+
+    @property
+    def requests(self):
+        return self.httpd.requests
+
+    def url(self, path):
+        return self.base_url + path
+
+
+def make_scraper(scraper_class, datadir=None, **attrs):
+    """
+    Returns a scraper_class scraper, with `attrs` set on it, that sends
+    every request straight to the server: no throttle, retries or cache.
+    """
+    scraper = scraper_class(None, datadir or tempfile.mkdtemp())
+    scraper.requests_per_minute = 0
+    scraper.retry_attempts = 0
+    scraper.cache_storage = None
+    for name, value in attrs.items():
+        setattr(scraper, name, value)
+    return scraper
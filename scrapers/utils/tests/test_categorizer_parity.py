@@ -0,0 +1,202 @@
+import glob
+import importlib
+import os
+import re
+import sre_constants as c
+import sre_parse
+import unittest
+
+from utils.actions import BaseCategorizer, Rule, _required_literal
+
+here = os.path.dirname(__file__)
+scrapers = os.path.dirname(os.path.dirname(here))
+
+SAMPLE_ACTIONS = [
+    "Introduced and read first time.",
+    "Read first time. To print.",
+    "Read second time and amended. Ordered to third reading.",
+    "Read third time. Passed. (Ayes 38. Noes 0. Page 1234.) To Assembly.",
+    "Read third time. Refused passage.",
+    "Referred to Com. on JUD.",
+    "Referred to Committee on Judiciary and Committee on Ways and Means",
+    "From committee: Do pass and re-refer to Com. on APPR. (Ayes 5. Noes 2.)",
+    "From committee: Filed with the Chief Clerk pursuant to Joint Rule 56.",
+    "Approved by the Governor with item veto.",
+    "Vetoed by Governor.",
+    "Chaptered by Secretary of State - Chapter 12, Statutes of 2019.",
+    "Amendment #3 (Smith) adopted",
+    "Committee recommended ought to pass",
+    "Passed to be engrossed",
+    "Third Reading Passed (Vote: Y: 30/N: 2)",
+    "Governor signed.",
+    "Effective date 7/1/2020.",
+    "Chapter 123, 2020 Laws.",
+    "READ and PASSED, in concurrence.",
+    "Committee Amendment A (S-12) READ and ADOPTED.",
+    "Senate Committee of the Whole: Amended",
+    "Governor Vetoed",
+    "coauthored by Jones, Smith and Brown",
+    "Ayes: 90 Nays: 3",
+    "",
+    "   ",
+]
+
+
+def _example(tokens):
+    """Build a string that tries to match a parsed regex."""
+    out = []
+    for op, av in tokens:
+        if op == c.LITERAL:
+            out.append(chr(av))
+        elif op == c.NOT_LITERAL:
+            out.append("x" if av != ord("x") else "y")
+        elif op == c.ANY:
+            out.append("x")
+        elif op == c.IN:
+            for item_op, item_av in av:
+                if item_op == c.LITERAL:
+                    out.append(chr(item_av))
+                    break
+                if item_op == c.RANGE:
+                    out.append(chr(item_av[0]))
+                    break
+                if item_op == c.CATEGORY:
+                    out.append(_category(item_av))
+                    break
+            else:
+                out.append("x")
+        elif op in (c.MAX_REPEAT, c.MIN_REPEAT):
+            low, _, sub = av
+            out.append(_example(sub) * max(low, 1))
+        elif op == c.SUBPATTERN:
+            out.append(_example(av[-1]))
+        elif op == c.BRANCH:
+            out.append(_example(av[1][0]))
+        elif op == c.CATEGORY:
+            out.append(_category(av))
+    return "".join(out)
+
+
+def _category(av):
+    return {
+        c.CATEGORY_DIGIT: "1",
+        c.CATEGORY_SPACE: " ",
+        c.CATEGORY_WORD: "x",
+        c.CATEGORY_NOT_DIGIT: "x",
+        c.CATEGORY_NOT_SPACE: "x",
+        c.CATEGORY_NOT_WORD: " ",
+    }.get(av, "x")
+
+
+def categorizers():
+    for path in sorted(glob.glob(os.path.join(scrapers, "*", "actions.py"))):
+        state = os.path.basename(os.path.dirname(path))
+        if state == "utils":
+            continue
+        module = importlib.import_module("%s.actions" % state)
+        for obj in vars(module).values():
+            if (
+                isinstance(obj, type)
+                and issubclass(obj, BaseCategorizer)
+                and obj.__module__ == module.__name__
+            ):
+                yield obj
+
+
+def rule_examples(rules):
+    for rule in rules:
+        for regex in rule.regexes:
+            yield _example(sre_parse.parse(regex.pattern, regex.flags))
+
+
+class TestCategorizerParity(unittest.TestCase):
+    def assertParity(self, cls, texts):
+        loop = cls()
+        loop.compiled = False
+        compiled = cls()
+        compiled.compiled = True
+        for text in texts:
+            # twice to go through the cache as well
+            for _ in range(2):
+                self.assertEqual(
+                    loop.categorize(text),
+                    compiled.categorize(text),
+                    "%s: %r" % (cls.__name__, text),
+                )
+
+    def test_existing_rule_tables(self):
+        classes = list(categorizers())
+        self.assertTrue(classes)
+        for cls in classes:
+            examples = list(rule_examples(cls.rules))
+            texts = SAMPLE_ACTIONS + examples
+            # and some texts that set off several rules at once
+            texts += [" ".join(examples[i : i + 3]) for i in range(0, len(examples), 2)]
+            self.assertParity(cls, texts)
+
+    def test_stop_rule(self):
+        class Stopper(BaseCategorizer):
+            rules = [
+                Rule(r"(?P<committees>Judiciary)", "referral-committee", stop=True),
+                Rule(r"Judiciary", "passage"),
+            ]
+
+        self.assertParity(Stopper, ["Referred to Judiciary", "Passed"])
+        cat = Stopper()
+        cat.compiled = True
+        self.assertEqual(
+            cat.categorize("Judiciary")["classification"], ["referral-committee"]
+        )
+
+    def test_case_insensitive_non_ascii(self):
+        class Folding(BaseCategorizer):
+            rules = [
+                Rule(r"(?i)Pass(?P<x>ed)", "passage"),
+                Rule(r"Pas\w", "reading-1"),
+            ]
+
+        # the long s matches "s" under re.IGNORECASE but isn't ASCII
+        self.assertParity(
+            Folding,
+            ["PASSED", "Pa\u017fsed", "Pa\u017f\u017fed", "pas"],
+        )
+
+    def test_required_literal(self):
+        for pattern, literal in [
+            (r"Referred to Com\. on", "Referred to Com. on"),
+            (r"Read (first|second) time", "Read "),
+            (r"Amendments? adopted", "Amendment"),
+            (r"Passed\s*\(Ayes (?P<ayes>\d+)\)", "Passed"),
+            (r"(?i)Vetoed by", "vetoed by"),
+            (r"^Signed$", "Signed"),
+            (r"[Ss]igned by Gov(ernor)?[.]", "igned by Gov"),
+            (r"Chapter \d{1,3}, Session Laws", ", Session Laws"),
+            (r"Ayes{1,2} and", " and"),
+            (r"Passed|Adopted", ""),
+            (r"(?x) Passed", ""),
+        ]:
+            self.assertEqual(_required_literal(re.compile(pattern)), literal, pattern)
+
+    def test_cache_bounded(self):
+        class Small(BaseCategorizer):
+            rules = list(next(categorizers()).rules)
+            compiled = True
+            cache_size = 3
+
+        cat = Small()
+        for text in SAMPLE_ACTIONS:
+            cat.categorize(text)
+        self.assertEqual(len(cat._cache), 3)
+
+    def test_result_is_a_copy(self):
+        class Committees(BaseCategorizer):
+            rules = [Rule(r"to (?P<committees>\w+)", "referral-committee")]
+            compiled = True
+
+        cat = Committees()
+        cat.categorize("to Rules")["committees"].append("Finance")
+        self.assertEqual(cat.categorize("to Rules")["committees"], ["Rules"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from utils.files import atomic_write, replacing
+
+
+class AtomicWriteTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+        self.path = os.path.join(self.dir, "cache", "file")
+
+    def read(self, mode="r"):
+        with open(self.path, mode) as f:
+            return f.read()
+
+    def test_json(self):
+        atomic_write(self.path, {"b": [1, 2], "a": None})
+        self.assertEqual(json.loads(self.read()), {"a": None, "b": [1, 2]})
+
+    def test_bytes(self):
+        atomic_write(self.path, b"%PDF-1.4")
+        self.assertEqual(self.read("rb"), b"%PDF-1.4")
+        atomic_write(self.path, iter([b"a", b"b"]))
+        self.assertEqual(self.read("rb"), b"ab")
+
+    def test_failure_keeps_the_old_file(self):
+        atomic_write(self.path, b"old")
+
+        def chunks():
+            yield b"new"
+            raise IOError("connection reset")
+
+        with self.assertRaises(IOError):
+            atomic_write(self.path, chunks())
+        self.assertEqual(self.read("rb"), b"old")
+        self.assertEqual(os.listdir(os.path.dirname(self.path)), ["file"])
+
+    def test_replacing(self):
+        with replacing(self.path) as tmp:
+            with open(tmp, "w") as f:
+                f.write("built")
+            self.assertFalse(os.path.exists(self.path))
+        self.assertEqual(self.read(), "built")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,34 @@
+import itertools
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.futures import ordered_map
+
+
+class OrderedMapTest(unittest.TestCase):
+    def test_results_in_order_within_the_window(self):
+        submitted = []
+
+        def items():
+            for n in itertools.count():
+                submitted.append(n)
+                yield n
+
+        def slow_square(n):
+            # later items finish first
+            time.sleep(0.01 * (5 - n % 5))
+            return n * n
+
+        with ThreadPoolExecutor(4) as pool:
+            results = ordered_map(pool, slow_square, items(), 3)
+            self.assertEqual(
+                [next(results) for _ in range(10)], [n * n for n in range(10)]
+            )
+            # only `window` items are ever taken ahead of what was yielded
+            self.assertEqual(len(submitted), 12)
+            results.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+import threading
+import time
+import unittest
+
+import requests
+import scrapelib
+
+from utils.governor import Governor, HostGovernor, parse_rates
+
+
+class Response(object):
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+class HostGovernorTest(unittest.TestCase):
+    def test_rate_is_shared_between_threads(self):
+        host = HostGovernor("example.com", rate=50)
+        sent = []
+
+        def worker():
+            for _ in range(5):
+                host.acquire()
+                sent.append(time.monotonic())
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        start = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # the first request goes straight out, the other 19 a 50th apart
+        self.assertGreaterEqual(max(sent) - start, 19 / 50 - 0.02)
+        self.assertEqual(host.metrics()["requests"], 20)
+        self.assertGreater(host.metrics()["wait_time"], 0)
+
+    def test_retry_after_then_recovery(self):
+        host = HostGovernor("example.com", rate=100)
+        # pop() takes from the end, so the 429 comes first
+        responses = [Response(200), Response(429, {"retry-after": "0.2"})]
+        start = time.monotonic()
+        response = host.call(responses.pop)
+        self.assertEqual(response.status_code, 200)
+        self.assertGreaterEqual(time.monotonic() - start, 0.2)
+        self.assertEqual(host.retries, 1)
+        # halved on the 429, and a tenth of the ceiling back on the success
+        self.assertEqual(host.rate, 60)
+
+        for _ in range(10):
+            host.call(lambda: Response(200))
+        self.assertEqual(host.rate, 100)
+
+    def test_exponential_backoff_on_errors(self):
+        host = HostGovernor("example.com", backoff_base=0.01)
+        attempts = []
+
+        def send():
+            attempts.append(time.monotonic())
+            if len(attempts) < 4:
+                raise IOError("connection reset")
+            return Response(200)
+
+        self.assertEqual(host.call(send, retry_on=IOError).status_code, 200)
+        gaps = [b - a for a, b in zip(attempts, attempts[1:])]
+        for gap, backoff in zip(gaps, (0.01, 0.02, 0.04)):
+            self.assertGreaterEqual(gap, backoff)
+
+    def test_gives_up(self):
+        host = HostGovernor("example.com", backoff_base=0)
+        self.assertEqual(host.call(lambda: Response(503), retries=2).status_code, 503)
+        self.assertEqual(host.retries, 2)
+
+        def send():
+            raise IOError("connection reset")
+
+        with self.assertRaises(IOError):
+            host.call(send, retries=2, retry_on=IOError)
+
+    def test_throttled_http_errors(self):
+        # what a scrapelib scraper raises instead of returning a 4xx or 5xx
+        def http_error(status_code, headers=None):
+            response = requests.Response()
+            response.status_code = status_code
+            response.headers.update(headers or {})
+            return scrapelib.HTTPError(response)
+
+        host = HostGovernor("example.com", rate=100)
+        outcomes = [Response(200), http_error(429, {"Retry-After": "0.2"})]
+
+        def send():
+            outcome = outcomes.pop()
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        start = time.monotonic()
+        self.assertEqual(host.call(send).status_code, 200)
+        self.assertGreaterEqual(time.monotonic() - start, 0.2)
+        self.assertEqual(host.retries, 1)
+
+        def not_found():
+            raise http_error(404)
+
+        with self.assertRaises(scrapelib.HTTPError):
+            host.call(not_found)
+        self.assertEqual(host.retries, 1)
+
+
+class GovernorTest(unittest.TestCase):
+    def test_configured_rates(self):
+        self.assertEqual(
+            parse_rates("api.iga.in.gov=10, legislation.nysenate.gov=0"),
+            {"api.iga.in.gov": 10, "legislation.nysenate.gov": 0},
+        )
+        governor = Governor({"api.iga.in.gov": 10})
+        host = governor.host("https://api.iga.in.gov/", rate=2)
+        self.assertEqual(host.max_rate, 10)
+        self.assertIs(governor.host("api.iga.in.gov"), host)
+        self.assertEqual(governor.host("http://example.com/x", rate=2).max_rate, 2)
+        self.assertEqual(set(governor.metrics()), {"api.iga.in.gov", "example.com"})
+
+
+if __name__ == "__main__":
+    unittest.main()
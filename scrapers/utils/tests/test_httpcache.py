@@ -0,0 +1,157 @@
+import collections
+import hashlib
+import os
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from openstates.scrape import Scraper
+
+from utils.httpcache import HTTPCacheMixin, OfflineCacheMiss
+
+
+class PageHandler(BaseHTTPRequestHandler):
+    """Serves self.server.pages, with an ETag that If-None-Match can match."""
+
+    def do_GET(self):
+        body = self.server.pages[self.path]
+        etag = '"%s"' % hashlib.md5(body).hexdigest()
+        self.server.requests[self.path] += 1
+        if self.server.validators and self.headers.get("If-None-Match") == etag:
+            self.server.not_modified += 1
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        if self.server.validators:
+            self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_POST = do_GET
+
+    def log_message(self, *args):
+        pass
+
+
+class CachedScraper(HTTPCacheMixin, Scraper):
+    http_cache_ttls = [(r"/fresh/", 60), (r"\.pdf$", None)]
+
+
+class HTTPCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.server = HTTPServer(("127.0.0.1", 0), PageHandler)
+        self.server.pages = {
+            "/bill": "<p>café</p>".encode("utf-8"),
+            "/fresh/bill": b"<p>fresh</p>",
+            "/vote.pdf": b"%PDF-1.4",
+            "/copy": b"%PDF-1.4",
+        }
+        self.server.requests = collections.Counter()
+        self.server.not_modified = 0
+        self.server.validators = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.root = "http://127.0.0.1:%d" % self.server.server_port
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def scraper(self, **attrs):
+        scraper = CachedScraper(None, tempfile.mkdtemp())
+        scraper.requests_per_minute = 0
+        scraper.cache_storage = None
+        scraper.http_cache_dir = self.cache_dir
+        scraper.http_cache_enabled = True
+        for name, value in attrs.items():
+            setattr(scraper, name, value)
+        return scraper
+
+    def test_revalidates_by_default(self):
+        for _ in range(2):
+            response = self.scraper().get(self.root + "/bill")
+            self.assertEqual(response.text, "<p>café</p>")
+        self.assertEqual(self.server.requests["/bill"], 2)
+        self.assertEqual(self.server.not_modified, 1)
+
+    def test_disabled_cache_is_bypassed(self):
+        for _ in range(2):
+            self.scraper(http_cache_enabled=False).get(self.root + "/fresh/bill")
+        self.assertEqual(self.server.requests["/fresh/bill"], 2)
+        self.assertEqual(os.listdir(self.cache_dir), [])
+
+    def test_fresh_responses_come_from_disk(self):
+        for _ in range(3):
+            scraper = self.scraper()
+            scraper.get(self.root + "/fresh/bill")
+            scraper.urlretrieve(self.root + "/vote.pdf")
+        self.assertEqual(self.server.requests["/fresh/bill"], 1)
+        self.assertEqual(self.server.requests["/vote.pdf"], 1)
+
+    def test_changed_page_is_stored_again(self):
+        self.scraper().get(self.root + "/bill")
+        self.server.pages["/bill"] = b"<p>amended</p>"
+        self.assertEqual(self.scraper().get(self.root + "/bill").text, "<p>amended</p>")
+        self.assertEqual(self.server.not_modified, 0)
+
+    def test_without_validators(self):
+        self.server.validators = False
+        self.scraper().get(self.root + "/bill")
+        self.server.pages["/bill"] = b"<p>amended</p>"
+        self.assertEqual(self.scraper().get(self.root + "/bill").text, "<p>amended</p>")
+
+    def test_offline_replay(self):
+        self.scraper().get(self.root + "/bill")
+        offline = self.scraper(http_cache_offline=True)
+        self.assertEqual(offline.get(self.root + "/bill").text, "<p>café</p>")
+        self.assertEqual(self.server.requests["/bill"], 1)
+        with self.assertRaises(OfflineCacheMiss):
+            offline.get(self.root + "/fresh/bill")
+
+    def test_offline_replay_without_validators(self):
+        self.server.validators = False
+        self.scraper().get(self.root + "/bill")
+        self.server.pages["/bill"] = b"<p>amended</p>"
+        offline = self.scraper(http_cache_offline=True)
+        self.assertEqual(offline.get(self.root + "/bill").text, "<p>café</p>")
+        self.assertEqual(self.server.requests["/bill"], 1)
+
+    def test_bodies_are_content_addressed(self):
+        scraper = self.scraper()
+        scraper.get(self.root + "/vote.pdf")
+        scraper.get(self.root + "/copy")
+        self.assertEqual(scraper.http_cache.size(), len(b"%PDF-1.4"))
+        bodies = [
+            name
+            for _, _, names in os.walk(self.cache_dir + "/bodies")
+            for name in names
+        ]
+        self.assertEqual(len(bodies), 1)
+
+    def test_least_recently_used_evicted(self):
+        scraper = self.scraper(http_cache_size=30)
+        scraper.get(self.root + "/bill")
+        scraper.get(self.root + "/fresh/bill")
+        # using /bill again leaves /fresh/bill as the least recently used
+        scraper.get(self.root + "/bill")
+        scraper.get(self.root + "/vote.pdf")
+        cache = scraper.http_cache
+        self.assertLessEqual(cache.size(), 30)
+        self.assertIsNone(cache.get(self.root + "/fresh/bill"))
+        self.assertIsNotNone(cache.get(self.root + "/bill"))
+        self.assertIsNotNone(cache.get(self.root + "/vote.pdf"))
+
+    def test_posts_are_not_cached(self):
+        scraper = self.scraper(http_cache_offline=True)
+        for _ in range(2):
+            response = scraper.post(self.root + "/bill", data={"a": 1})
+            self.assertEqual(response.text, "<p>café</p>")
+        self.assertEqual(self.server.requests["/bill"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
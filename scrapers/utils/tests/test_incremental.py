@@ -0,0 +1,36 @@
+import tempfile
+import unittest
+
+from openstates.scrape import Scraper
+from openstates.scrape.base import ScrapeError
+
+from utils.incremental import IncrementalMixin
+
+
+class Quiet(IncrementalMixin, Scraper):
+    def scrape(self, unchanged=0, fail=False):
+        self.unchanged += unchanged
+        if fail:
+            raise ScrapeError("the site is down")
+        return []
+
+
+class IncrementalMixinTest(unittest.TestCase):
+    def scraper(self):
+        return Quiet(None, tempfile.mkdtemp())
+
+    def test_nothing_changed(self):
+        record = self.scraper().do_scrape(unchanged=3)
+        self.assertEqual(record["objects"], {})
+
+    def test_empty_run_still_fails(self):
+        with self.assertRaises(ScrapeError):
+            self.scraper().do_scrape()
+
+    def test_errors_are_not_swallowed(self):
+        with self.assertRaisesRegex(ScrapeError, "down"):
+            self.scraper().do_scrape(unchanged=3, fail=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,180 @@
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from utils import lxmlize
+from utils.lxmlize import LXMLMixin, ParsedPageMemo, parse_html, url_xpath
+
+
+def response(content, content_type="text/html", status=200):
+    resp = requests.Response()
+    resp.status_code = status
+    resp.headers = CaseInsensitiveDict({"Content-Type": content_type})
+    resp._content = content
+    return resp
+
+
+class Pages(LXMLMixin):
+    def __init__(self, pages, memo=None):
+        self.pages = pages
+        self.requests = []
+        self.lxmlize_memo = memo
+
+    def get(self, url, **kwargs):
+        self.requests.append(url)
+        return self.pages[url]
+
+
+class ParseHTMLTest(unittest.TestCase):
+    def test_charset_from_header(self):
+        page = parse_html(
+            response("<p>Peña</p>".encode("cp1252"), "text/html; charset=windows-1252")
+        )
+        self.assertEqual(page.text_content(), "Peña")
+
+    def test_charset_from_document(self):
+        html = '<html><head><meta charset="utf-8"></head><body>Peña</body></html>'
+        page = parse_html(response(html.encode("utf-8")))
+        self.assertEqual(page.xpath("string(//body)"), "Peña")
+
+
+class LxmlizeMemoTest(unittest.TestCase):
+    url = "http://example.com/committee"
+
+    def test_not_memoized_by_default(self):
+        scraper = Pages({self.url: response(b'<a href="/member">x</a>')})
+        scraper.lxmlize(self.url)
+        scraper.lxmlize(self.url)
+        self.assertEqual(len(scraper.requests), 2)
+
+    def test_memoized(self):
+        memo = ParsedPageMemo()
+        scraper = Pages({self.url: response(b'<p><a href="/member">x</a></p>')}, memo)
+        first = scraper.lxmlize(self.url)
+        first.xpath("//a")[0].drop_tree()
+        second = scraper.lxmlize(self.url)
+
+        self.assertEqual(scraper.requests, [self.url])
+        # links are still absolute, and changes to one copy don't show up
+        # in the next
+        self.assertEqual(second.xpath("//a/@href"), ["http://example.com/member"])
+        self.assertEqual((memo.hits, memo.misses), (1, 1))
+
+    def test_memo_per_scraper(self):
+        class SizedPages(Pages):
+            lxmlize_memo_size = 8
+
+        pages = {self.url: response(b"<p>x</p>")}
+        for _ in range(2):
+            scraper = SizedPages(pages)
+            scraper.lxmlize(self.url)
+            scraper.lxmlize(self.url)
+            # a new scraper starts with an empty memo
+            self.assertEqual(scraper.requests, [self.url])
+            self.assertEqual(scraper.lxmlize_memo.size, 8)
+
+    def test_bounded(self):
+        memo = ParsedPageMemo(size=2)
+        pages = {"http://example.com/%d" % n: response(b"<p>x</p>") for n in range(3)}
+        scraper = Pages(pages, memo)
+        for url in [
+            "http://example.com/0",
+            "http://example.com/1",
+            "http://example.com/0",
+            "http://example.com/2",
+            "http://example.com/0",
+            "http://example.com/1",
+        ]:
+            scraper.lxmlize(url)
+        # 1 was the least recently used when 2 came in
+        self.assertEqual(
+            scraper.requests,
+            [
+                "http://example.com/0",
+                "http://example.com/1",
+                "http://example.com/2",
+                "http://example.com/1",
+            ],
+        )
+
+    def test_errors_not_memoized(self):
+        memo = ParsedPageMemo()
+        scraper = Pages({self.url: response(b"<p>not found</p>", status=404)}, memo)
+        scraper.lxmlize(self.url)
+        with self.assertRaises(requests.HTTPError):
+            scraper.lxmlize(self.url, raise_exceptions=True)
+
+
+class SessionsHandler(BaseHTTPRequestHandler):
+    """Serves a page over keep-alive connections, failing with a 503 when
+    asked to, and counting requests and connections."""
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def do_GET(self):
+        self.server.requests += 1
+        if self.path == "/flaky" and self.server.requests == 1:
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = b"<ul><li>2021</li><li>2022</li></ul>"
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class URLXPathTest(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), SessionsHandler)
+        # keep-alive connections stay open, so don't wait for their threads
+        self.server.daemon_threads = True
+        self.server.block_on_close = False
+        self.server.requests = 0
+        self.server.connections = 0
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.root = "http://127.0.0.1:%d" % self.server.server_port
+        lxmlize.configure_session(backoff_factor=0)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_connections_reused(self):
+        for _ in range(5):
+            self.assertEqual(url_xpath(self.root, "//li/text()"), ["2021", "2022"])
+        self.assertEqual(self.server.requests, 5)
+        self.assertEqual(self.server.connections, 1)
+
+    def test_retries(self):
+        self.assertEqual(len(url_xpath(self.root + "/flaky", "//li")), 2)
+        self.assertEqual(self.server.requests, 2)
+
+    def test_through_a_session(self):
+        class Session(object):
+            def get(self, url, **kwargs):
+                self.kwargs = kwargs
+                return response(b"<p>from the scraper</p>")
+
+        session = Session()
+        self.assertEqual(
+            url_xpath(self.root, "string(//p)", session=session), "from the scraper"
+        )
+        self.assertEqual(self.server.requests, 0)
+        self.assertEqual(session.kwargs["timeout"], lxmlize.URL_XPATH_TIMEOUT)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+import json
+import os
+import shutil
+import stat
+import sys
+import tempfile
+import unittest
+import zipfile
+from unittest import mock
+
+from utils.mdb import MDBStore, listing_entry
+
+# a stand-in for mdb-export, reading a "database" that is a JSON object of
+# table name to CSV text, so the tests don't need mdbtools installed
+MDB_EXPORT = """#!{python}
+import json, sys
+sys.stdout.write(json.load(open(sys.argv[1]))[sys.argv[2]])
+"""
+
+TABLES = {
+    "Legislation": 'BillID,Title\r\nS  1,"A bill\r\nin two lines"\r\nH  2,Another\r\n',
+    "Actions": "BillID,ActionCode\r\nS  1,7799\r\nH  2,SENT\r\nS  1,SENT\r\n",
+}
+
+
+class FakeScraper(object):
+    def __init__(self, data):
+        self.data = data
+        self.downloads = []
+
+    def info(self, *args):
+        pass
+
+    def urlretrieve(self, url, dir=None):
+        self.downloads.append(url)
+        fname = os.path.join(dir, "download")
+        with open(fname, "wb") as f:
+            f.write(self.data)
+        return fname, None
+
+
+class MDBStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+        bin_dir = os.path.join(self.dir, "bin")
+        os.mkdir(bin_dir)
+        script = os.path.join(bin_dir, "mdb-export")
+        with open(script, "w") as f:
+            f.write(MDB_EXPORT.format(python=sys.executable))
+        os.chmod(script, os.stat(script).st_mode | stat.S_IEXEC)
+        patcher = mock.patch.dict(
+            os.environ, {"PATH": bin_dir + os.pathsep + os.environ["PATH"]}
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.path = os.path.join(self.dir, "cache", "db.sqlite3")
+        self.scraper = FakeScraper(json.dumps(TABLES).encode())
+
+    def refresh(self, validator, tables=("Legislation", "Actions"), **kwargs):
+        store = MDBStore(self.path)
+        store.refresh(self.scraper, "ftp://x/db.mdb", validator, tables, **kwargs)
+        return store
+
+    def test_rows(self):
+        store = self.refresh("1", indexes={"Actions": ["BillID"]})
+        self.assertEqual(
+            list(store.rows("Legislation")),
+            [
+                {"BillID": "S  1", "Title": "A bill\r\nin two lines"},
+                {"BillID": "H  2", "Title": "Another"},
+            ],
+        )
+        self.assertEqual(
+            [row["ActionCode"] for row in store.lookup("Actions", "BillID", "S  1")],
+            ["7799", "SENT"],
+        )
+        self.assertEqual(
+            [row["BillID"] for row in store.rows("Actions", "BillID GLOB ?", ("H*",))],
+            ["H  2"],
+        )
+
+    def test_unchanged_database_is_not_downloaded(self):
+        self.refresh("1")
+        store = self.refresh("1")
+        self.assertEqual(len(self.scraper.downloads), 1)
+        self.assertEqual(len(list(store.rows("Actions"))), 3)
+
+        # a new copy, or an unknown one, is
+        self.refresh("2")
+        self.refresh(None)
+        self.assertEqual(len(self.scraper.downloads), 3)
+
+    def test_new_tables_are_exported(self):
+        self.refresh("1", tables=["Legislation"])
+        store = self.refresh("1")
+        self.assertEqual(len(self.scraper.downloads), 2)
+        self.assertEqual(store.tables, {"Legislation", "Actions"})
+
+    def test_tables_are_added_from_the_same_copy(self):
+        self.refresh("1", tables=["Legislation"])
+        store = self.refresh("1", tables=["Actions"])
+        self.assertEqual(store.tables, {"Legislation", "Actions"})
+        self.assertEqual(len(list(store.rows("Legislation"))), 2)
+        self.assertEqual(MDBStore(self.path).tables, {"Legislation", "Actions"})
+
+        # but not kept from an older one
+        store = self.refresh("2", tables=["Actions"])
+        self.assertEqual(store.tables, {"Actions"})
+
+    def test_zipped_database(self):
+        archive = os.path.join(self.dir, "db.zip")
+        with zipfile.ZipFile(archive, "w") as zf:
+            zf.writestr("DB2016.mdb", json.dumps(TABLES))
+        with open(archive, "rb") as f:
+            self.scraper.data = f.read()
+        store = self.refresh("1", member="DB2016.mdb")
+        self.assertEqual(len(list(store.rows("Legislation"))), 2)
+
+    def test_failed_export_keeps_the_old_store(self):
+        self.refresh("1")
+        with self.assertRaises(EnvironmentError):
+            self.refresh("2", tables=["Legislation", "Missing"])
+        store = MDBStore(self.path)
+        self.assertEqual(store.validator, "1")
+        self.assertEqual(len(list(store.rows("Legislation"))), 2)
+
+
+class ListingEntryTest(unittest.TestCase):
+    def test_listing_entry(self):
+        listing = (
+            "01-04-21  09:12AM             52494336 DB2020.mdb\r\n"
+            "01-04-21  09:13AM              8123456 DB2020.mdb.bak\r\n"
+        )
+        self.assertEqual(
+            listing_entry(listing, "DB2020.mdb"), "01-04-21 09:12AM 52494336 DB2020.mdb"
+        )
+        self.assertIsNone(listing_entry(listing, "DB2021.mdb"))
+
+
+if __name__ == "__main__":
+    unittest.main()
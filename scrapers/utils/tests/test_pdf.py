@@ -0,0 +1,117 @@
+import sys
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+import scrapelib
+
+from utils import pdf
+from utils.pdf import PDFConverter, PDFTextMixin
+
+# stand-ins for pdftotext, so the tests don't need poppler installed
+UPPER = [
+    sys.executable,
+    "-c",
+    "import sys; sys.stdout.write(open(sys.argv[1]).read().upper())",
+    "{}",
+]
+FAIL = [sys.executable, "-c", "import sys; sys.exit(1)", "{}"]
+HANG = [sys.executable, "-c", "import time; time.sleep(10)", "{}"]
+
+
+class ConverterTest(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.dict(pdf.COMMANDS, {"text": UPPER, "xml": FAIL})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.converter = PDFConverter(workers=2, cache_dir=tempfile.mkdtemp())
+
+    def test_convert(self):
+        self.assertEqual(self.converter.convert(b"yea 10"), b"YEA 10")
+        self.assertEqual((self.converter.hits, self.converter.misses), (0, 1))
+
+    def test_unchanged_pdf_comes_from_cache(self):
+        self.converter.convert(b"yea 10")
+        with mock.patch("subprocess.run") as run:
+            self.assertEqual(self.converter.convert(b"yea 10"), b"YEA 10")
+        run.assert_not_called()
+        self.assertEqual((self.converter.hits, self.converter.misses), (1, 1))
+
+        # a changed PDF is converted again
+        self.assertEqual(self.converter.convert(b"yea 11"), b"YEA 11")
+        self.assertEqual(self.converter.misses, 2)
+
+    def test_failures_are_not_cached(self):
+        self.converter.convert(b"nay 3", type="xml")
+        self.converter.convert(b"nay 3", type="xml")
+        self.assertEqual((self.converter.hits, self.converter.misses), (0, 2))
+
+    def test_timeout(self):
+        converter = PDFConverter(
+            workers=1, cache_dir=self.converter.cache_dir, timeout=0.2
+        )
+        with mock.patch.dict(pdf.COMMANDS, {"text": HANG}):
+            self.assertEqual(converter.convert(b"yea 10"), b"")
+        # and isn't cached
+        self.assertEqual(converter.convert(b"yea 10"), b"YEA 10")
+
+    def test_missing_executable(self):
+        with mock.patch.dict(pdf.COMMANDS, {"text": ["not-a-pdftotext", "{}"]}):
+            with self.assertRaises(EnvironmentError):
+                self.converter.convert(b"yea 10")
+
+
+class FakeScraper(PDFTextMixin):
+    def __init__(self, converter, pages):
+        self.pdf_converter = converter
+        self.pages = pages
+        self.fetched = []
+        self.threads = set()
+        self._lock = threading.Lock()
+
+    def get(self, url):
+        with self._lock:
+            self.fetched.append(url)
+            self.threads.add(threading.current_thread())
+        if url not in self.pages:
+            raise scrapelib.HTTPError(mock.Mock(status_code=404, url=url))
+        return mock.Mock(content=self.pages[url])
+
+
+class MixinTest(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.dict(pdf.COMMANDS, {"text": UPPER})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.converter = PDFConverter(workers=2, cache_dir=tempfile.mkdtemp())
+        self.scraper = FakeScraper(
+            self.converter, {"/1.pdf": b"vote one", "/2.pdf": b"vote two"}
+        )
+
+    def test_prefetched(self):
+        self.scraper.prefetch_pdfs(["/1.pdf", "/2.pdf"])
+        self.assertEqual(self.scraper.pdf_text("/2.pdf"), b"VOTE TWO")
+        self.assertEqual(self.scraper.pdf_text("/1.pdf"), b"VOTE ONE")
+        self.assertEqual(sorted(self.scraper.fetched), ["/1.pdf", "/2.pdf"])
+        # only the conversions go to the workers
+        self.assertEqual(self.scraper.threads, {threading.current_thread()})
+
+    def test_not_prefetched(self):
+        self.assertEqual(self.scraper.pdf_text("/1.pdf"), b"VOTE ONE")
+
+    def test_each_result_is_used_once(self):
+        self.scraper.prefetch_pdfs(["/1.pdf"])
+        self.scraper.pdf_text("/1.pdf")
+        self.scraper.pdf_text("/1.pdf")
+        self.assertEqual(self.scraper.fetched, ["/1.pdf", "/1.pdf"])
+
+    def test_errors_are_raised_by_pdf_text(self):
+        self.scraper.prefetch_pdfs(["/1.pdf", "/missing.pdf"])
+        with self.assertRaises(scrapelib.HTTPError):
+            self.scraper.pdf_text("/missing.pdf")
+        self.assertEqual(self.scraper.pdf_text("/1.pdf"), b"VOTE ONE")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,20 @@
+import unittest
+
+from utils.settings import CACHE_DIR, cache_path, truthy
+
+
+class SettingsTest(unittest.TestCase):
+    def test_truthy(self):
+        for value in (True, 1, "1", "true", "True", " yes\n", "ON"):
+            self.assertTrue(truthy(value), value)
+        for value in (False, None, 0, "", "0", "false", "False", "no"):
+            self.assertFalse(truthy(value), value)
+
+    def test_cache_path(self):
+        self.assertEqual(
+            cache_path("tx", "ftp_listing.json"), CACHE_DIR + "/tx/ftp_listing.json"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,10 +1,12 @@
+import io
 import os
 import csv
 import re
 import pytz
 import datetime
+from sys import intern
 from openstates.scrape import Scraper, Bill, VoteEvent
-from collections import defaultdict
+from collections import defaultdict, namedtuple
 
 from .common import SESSION_SITE_IDS
 
@@ -41,143 +43,150 @@ ACTION_CLASSIFIERS = (
 )
 
 
+# the codes VOTE.CSV records each member's vote with
+VOTE_RESULTS = {"Y": "yes", "N": "no", "X": "not voting", "A": "abstain"}
+
+Sponsor = namedtuple("Sponsor", "member_name member_id patron_type")
+Action = namedtuple("Action", "history_date history_description history_refid")
+Vote = namedtuple("Vote", "member_name vote_result")
+Summary = namedtuple("Summary", "summary_doc_id summary_type summary_text")
+TextDoc = namedtuple("TextDoc", "doc_abbr doc_date")
+BillRecord = namedtuple(
+    "BillRecord",
+    "bill_id patron_name bill_description passed failed carried_over approved "
+    "vetoed introduction_date text_docs",
+)
+
+
 class VaCSVBillScraper(Scraper):
+    """
+    Scrapes the bulk CSV files for a session.
+
+    Each file is read once, with the csv module, into an index keyed by
+    bill (or roll call) that keeps only what the scrape uses, as tuples.
+    Member ids, names, dates and vote codes repeat throughout the files,
+    so they're interned and each is stored once.
+    """
 
     _url_base = (
         f"ftp://{os.environ['VIRGINIA_FTP_USER']}:{os.environ['VIRGINIA_FTP_PASSWORD']}"
     )
     _url_base += "@legis.virginia.gov/fromdlas/csv"
-    _members = defaultdict(list)
-    _sponsors = defaultdict(list)
-    _amendments = defaultdict(list)
-    _fiscal_notes = defaultdict(list)
-    _history = defaultdict(list)
-    _votes = defaultdict(list)
-    _bills = defaultdict(list)
-    _summaries = defaultdict(list)
+
+    def read_csv(self, filename):
+        """Returns a csv.reader over one of the session's files."""
+        resp = self.get(self._url_base + filename)
+        content = resp.content
+        # what resp.text would decode with, without guessing at (or
+        # decoding into one big string) a file that's all ASCII
+        encoding = resp.encoding or (
+            "ascii" if content.isascii() else resp.apparent_encoding
+        )
+        return csv.reader(
+            io.TextIOWrapper(io.BytesIO(content), encoding=encoding, newline="")
+        )
 
     # Load members of legislative
     def load_members(self):
-        resp = self.get(self._url_base + "Members.csv").text
-
-        reader = csv.reader(resp.splitlines(), delimiter=",")
+        self._members = {}
         # ['MBR_HOU', 'MBR_MBRNO', 'MBR_NAME']
-        for row in reader:
-            self._members[row[1]].append(
-                {"chamber": row[0], "member_id": row[1], "name": row[2].strip()}
-            )
+        for row in self.read_csv("Members.csv"):
+            self._members.setdefault(intern(row[1]), intern(row[2].strip()))
         self.warning("Total Members Loaded: " + str(len(self._members)))
         return True
 
     def load_sponsors(self):
-        resp = self.get(self._url_base + "Sponsors.csv").text
-
-        reader = csv.reader(resp.splitlines(), delimiter=",")
+        self._sponsors = defaultdict(list)
         # ['MEMBER_NAME', 'MEMBER_ID', 'BILL_NUMBER', 'PATRON_TYPE']
-        for row in reader:
+        for row in self.read_csv("Sponsors.csv"):
             self._sponsors[row[2]].append(
-                {
-                    "member_name": row[0].strip(),
-                    "member_id": row[1],
-                    "bill_number": row[2],
-                    "patron_type": row[3],
-                }
+                Sponsor(intern(row[0].strip()), intern(row[1]), intern(row[3]))
             )
         self.warning("Total Sponsors Loaded: " + str(len(self._sponsors)))
 
     def load_amendments(self):
-        resp = self.get(self._url_base + "Amendments.csv").text
-        reader = csv.reader(resp.splitlines(), delimiter=",")
-
+        self._amendments = defaultdict(list)
         # ['BILL_NUMBER', 'TXT_DOCID']
-        for row in reader:
-            self._amendments[row[0].strip()].append(
-                {"bill_number": row[0].strip(), "txt_docid": row[1].strip()}
-            )
+        for row in self.read_csv("Amendments.csv"):
+            self._amendments[row[0].strip()].append(row[1].strip())
         self.warning("Total Amendments Loaded: " + str(len(self._amendments)))
 
     def load_fiscal_notes(self):
-        resp = self.get(self._url_base + "FiscalImpactStatements.csv").text
-        reader = csv.reader(resp.splitlines(), delimiter=",")
-
+        self._fiscal_notes = defaultdict(list)
         # ['BILL_NUMBER', 'HST_REFID']
-        for row in reader:
-            self._fiscal_notes[row[0].strip()].append({"refid": row[1].strip()})
+        for row in self.read_csv("FiscalImpactStatements.csv"):
+            self._fiscal_notes[row[0].strip()].append(row[1].strip())
         self.warning("Total Fiscal Notes Loaded: " + str(len(self._fiscal_notes)))
 
     def load_history(self):
-        resp = self.get(self._url_base + "HISTORY.CSV").text
-        reader = csv.reader(resp.splitlines(), delimiter=",")
+        self._history = defaultdict(list)
         # ['Bill_id', 'History_date', 'History_description', 'History_refid']
-        for row in reader:
-            self._history[row[0]].append(
-                {
-                    "bill_id": row[0],
-                    "history_date": row[1],
-                    "history_description": row[2],
-                    "history_refid": row[3],
-                }
-            )
+        for row in self.read_csv("HISTORY.CSV"):
+            self._history[row[0]].append(Action(intern(row[1]), row[2], row[3]))
         self.warning("Total Actions Loaded: " + str(len(self._history)))
 
     def load_votes(self):
-        resp = self.get(self._url_base + "VOTE.CSV").text.splitlines()
-        for line in resp:
-            line = line.split(",")
-            # First part of the line is always the history_refid number.
-            #   It has extra quotes around it
-            # Next number is the member_id number found in _members
-            # Y and X represent yes or no
-            history_refid = line[0].replace('"', "")
-            # Checks if votes are present
-            if len(line) > 1:
-                # Not every line has the same number of votes.
-                for v in range(1, len(line), 2):
-                    if (
-                        line[v] != '"H0000"'
-                        and len(self._members[line[v].replace('"', "")]) > 0
-                    ):
-                        member = self._members[line[v].replace('"', "")][0]["name"]
-                        vote_result = line[v + 1].replace('"', "")
-                        if vote_result == "Y":
-                            vote_result = "yes"
-                        elif vote_result == "N":
-                            vote_result = "no"
-                        elif vote_result == "X":
-                            vote_result = "not voting"
-                        elif vote_result == "A":
-                            vote_result = "abstain"
-                        self._votes[history_refid].append(
-                            {"member_id": member, "vote_result": vote_result}
-                        )
+        self._votes = defaultdict(list)
+
+        def make_vote(member_id, vote_result):
+            if member_id == "H0000" or member_id not in self._members:
+                return None
+            return Vote(
+                self._members[member_id],
+                VOTE_RESULTS.get(vote_result) or intern(vote_result),
+            )
+
+        # there are only so many members and vote codes, so every vote is
+        # one of a few hundred shared Votes
+        shared = {}
+        # Each line is a history_refid and then pairs of the member_id of
+        # one of _members and their vote, one of VOTE_RESULTS. Not every
+        # line has the same number of votes.
+        for row in self.read_csv("VOTE.CSV"):
+            if len(row) < 2:
+                continue
+            votes = self._votes[row[0]]
+            for pair in zip(row[1::2], row[2::2]):
+                try:
+                    vote = shared[pair]
+                except KeyError:
+                    vote = shared[pair] = make_vote(*pair)
+                if vote:
+                    votes.append(vote)
         self.warning("Total Votes Loaded: " + str(len(self._votes)))
 
     def load_bills(self):
-        resp = self.get(self._url_base + "BILLS.CSV").text
-        reader = csv.DictReader(resp.splitlines(), delimiter=",")
-        for row in reader:
-            text_doc_data = [
-                {"doc_abbr": row["Full_text_doc1"], "doc_date": row["Full_text_date1"]},
-                {"doc_abbr": row["Full_text_doc2"], "doc_date": row["Full_text_date2"]},
-                {"doc_abbr": row["Full_text_doc3"], "doc_date": row["Full_text_date3"]},
-                {"doc_abbr": row["Full_text_doc4"], "doc_date": row["Full_text_date4"]},
-                {"doc_abbr": row["Full_text_doc5"], "doc_date": row["Full_text_date5"]},
-                {"doc_abbr": row["Full_text_doc6"], "doc_date": row["Full_text_date6"]},
-            ]
-            self._bills[row["Bill_id"]].append(
-                {
-                    "bill_id": row["Bill_id"],
-                    "patron_name": row["Patron_name"],
-                    "bill_description": row["Bill_description"],
-                    "passed": row["Passed"],
-                    "failed": row["Failed"],
-                    "carried_over": row["Carried_over"],
-                    "approved": row["Approved"],
-                    "vetoed": row["Vetoed"],
-                    "introduction_date": row["Introduction_date"],
-                    "text_docs": text_doc_data,
-                }
+        self._bills = {}
+        rows = self.read_csv("BILLS.CSV")
+        columns = {name: i for i, name in enumerate(next(rows))}
+        fields = [
+            columns[name]
+            for name in (
+                "Bill_id",
+                "Patron_name",
+                "Bill_description",
+                "Passed",
+                "Failed",
+                "Carried_over",
+                "Approved",
+                "Vetoed",
+                "Introduction_date",
+            )
+        ]
+        docs = [
+            (columns["Full_text_doc%d" % n], columns["Full_text_date%d" % n])
+            for n in range(1, 7)
+        ]
+        for row in rows:
+            # like csv.DictReader, skip blank lines and pad short ones
+            if not row:
+                continue
+            row += [""] * (len(columns) - len(row))
+            bill = BillRecord(
+                *(row[i] for i in fields),
+                tuple(TextDoc(row[doc], intern(row[date])) for doc, date in docs),
             )
+            self._bills.setdefault(bill.bill_id, bill)
         self.warning("Total Bills Loaded: " + str(len(self._bills)))
 
     # Used to clean summary texts
@@ -186,20 +195,14 @@ class VaCSVBillScraper(Scraper):
         return re.sub(clean, "", text)
 
     def load_summaries(self):
-        resp = self.get(self._url_base + "Summaries.csv").text
-        reader = csv.reader(resp.splitlines(), delimiter=",")
+        self._summaries = defaultdict(list)
         # ["SUM_BILNO", "SUMMARY_DOCID", "SUMMARY_TYPE", "SUMMARY_TEXT"]
-        for row in reader:
+        for row in self.read_csv("Summaries.csv"):
             if row[0] == "SUM_BILNO":
                 continue
 
             self._summaries[row[0]].append(
-                {
-                    "bill_id": row[0],
-                    "summary_doc_id": row[1],
-                    "summary_type": row[2],
-                    "summary_text": self.remove_html_tags(row[3]),
-                }
+                Summary(row[1], intern(row[2]), self.remove_html_tags(row[3]))
             )
         self.warning("Total Sponsors Loaded: " + str(len(self._summaries)))
 
@@ -232,10 +235,8 @@ class VaCSVBillScraper(Scraper):
         self.load_bills()
         self.load_amendments()
 
-        for bill in self._bills:
-            bill = self._bills[bill][0]
-
-            bill_id = bill["bill_id"]
+        for bill in self._bills.values():
+            bill_id = bill.bill_id
             chamber = chamber_types[bill_id[0]]
             bill_type = {"B": "bill", "J": "joint resolution", "R": "resolution"}[
                 bill_id[1]
@@ -243,7 +244,7 @@ class VaCSVBillScraper(Scraper):
             b = Bill(
                 bill_id,
                 session,
-                bill["bill_description"],
+                bill.bill_description,
                 chamber=chamber,
                 classification=bill_type,
             )
@@ -262,49 +263,45 @@ class VaCSVBillScraper(Scraper):
 
             # Sponsors
             if long_bill_id not in self._sponsors:
-                if "patron_name" in bill and bill["patron_name"].strip() != "":
+                if bill.patron_name.strip() != "":
                     b.add_sponsorship(
-                        bill["patron_name"],
+                        bill.patron_name,
                         classification="primary",
                         entity_type="person",
                         primary=True,
                     )
-            for spon in self._sponsors[long_bill_id]:
-                if spon["member_name"].strip() == "":
+            for spon in self._sponsors.get(long_bill_id, ()):
+                if spon.member_name.strip() == "":
                     continue
 
-                sponsor_type = spon["patron_type"]
+                sponsor_type = spon.patron_type
                 if sponsor_type.endswith("Chief Patron"):
                     sponsor_type = "primary"
                 else:
                     sponsor_type = "cosponsor"
                 b.add_sponsorship(
-                    spon["member_name"],
+                    spon.member_name,
                     classification=sponsor_type,
                     entity_type="person",
                     primary=sponsor_type == "primary",
                 )
 
             # Summary
-            summary_texts = self._summaries[long_bill_id]
-            for sum_text in summary_texts:
-                b.add_abstract(sum_text["summary_text"], sum_text["summary_type"])
+            for sum_text in self._summaries.get(long_bill_id, ()):
+                b.add_abstract(sum_text.summary_text, sum_text.summary_type)
 
             # Amendment docs
-            amendments = self._amendments[bill_id]
-            for amend in amendments:
-                doc_link = (
-                    bill_url_base + f"legp604.exe?{session_id}+amd+{amend['txt_docid']}"
-                )
+            for txt_docid in self._amendments.get(bill_id, ()):
+                doc_link = bill_url_base + f"legp604.exe?{session_id}+amd+{txt_docid}"
                 b.add_document_link(
-                    "Amendment: " + amend["txt_docid"], doc_link, media_type="text/html"
+                    "Amendment: " + txt_docid, doc_link, media_type="text/html"
                 )
 
             # fiscal notes
-            for fn in self._fiscal_notes[long_bill_id]:
-                doc_link = bill_url_base + f"legp604.exe?{session_id}+oth+{fn['refid']}"
+            for refid in self._fiscal_notes.get(long_bill_id, ()):
+                doc_link = bill_url_base + f"legp604.exe?{session_id}+oth+{refid}"
                 b.add_document_link(
-                    "Fiscal Impact Statement: " + fn["refid"],
+                    "Fiscal Impact Statement: " + refid,
                     doc_link.replace(".PDF", "+PDF"),
                     media_type="application/pdf",
                 )
@@ -312,12 +309,12 @@ class VaCSVBillScraper(Scraper):
             # actions with 8-digit number followed by D are version titles too
             doc_actions = defaultdict(list)
             # History and then votes
-            for hist in self._history[bill_id]:
-                action = hist["history_description"]
-                action_date = hist["history_date"]
+            for hist in self._history.get(bill_id, ()):
+                action = hist.history_description
+                action_date = hist.history_date
                 date = datetime.datetime.strptime(action_date, "%m/%d/%y").date()
                 chamber = chamber_types[action[0]]
-                vote_id = hist["history_refid"]
+                vote_id = hist.history_refid
                 cleaned_action = action[2:]
 
                 if re.findall(r"\d{8}D", cleaned_action):
@@ -340,14 +337,15 @@ class VaCSVBillScraper(Scraper):
                     total_no = 0
                     total_not_voting = 0
                     total_abstain = 0
-                    for v in self._votes[vote_id]:
-                        if v["vote_result"] == "yes":
+                    votes = self._votes.get(vote_id, ())
+                    for v in votes:
+                        if v.vote_result == "yes":
                             total_yes += 1
-                        elif v["vote_result"] == "no":
+                        elif v.vote_result == "no":
                             total_no += 1
-                        elif v["vote_result"] == "not voting":
+                        elif v.vote_result == "not voting":
                             total_not_voting += 1
-                        elif v["vote_result"] == "abstain":
+                        elif v.vote_result == "abstain":
                             total_abstain += 1
                     vote = VoteEvent(
                         identifier=vote_id,
@@ -368,28 +366,28 @@ class VaCSVBillScraper(Scraper):
                         + f"legp604.exe?{session_id}+vot+{vote_id}+{long_bill_id}"
                     )
                     vote.add_source(vote_url)
-                    for v in self._votes[vote_id]:
-                        vote.vote(v["vote_result"], v["member_id"])
+                    for v in votes:
+                        vote.vote(v.vote_result, v.member_name)
                     yield vote
 
             # Versions
-            for version in bill["text_docs"]:
+            for version in bill.text_docs:
                 # Checks if abbr is blank as not every bill has multiple versions
-                if version["doc_abbr"]:
+                if version.doc_abbr:
                     version_url = (
                         bill_url_base
-                        + f"legp604.exe?{session_id}+ful+{version['doc_abbr']}"
+                        + f"legp604.exe?{session_id}+ful+{version.doc_abbr}"
                     )
 
                     version_date = datetime.datetime.strptime(
-                        version["doc_date"], "%m/%d/%y"
+                        version.doc_date, "%m/%d/%y"
                     ).date()
                     # version text will default to abbreviation provided in CSV
                     # but if there is an unambiguous action from that date with
                     # a version, we'll use that as the document title
-                    version_text = version["doc_abbr"]
-                    if len(doc_actions[version["doc_date"]]) == 1:
-                        version_text = doc_actions[version["doc_date"]][0]
+                    version_text = version.doc_abbr
+                    if len(doc_actions[version.doc_date]) == 1:
+                        version_text = doc_actions[version.doc_date][0]
                     b.add_version_link(
                         version_text,
                         version_url,
@@ -0,0 +1,225 @@
+"""
+Time and peak memory of loading a session's worth of synthetic VA CSV
+files the old way (each file read as one string, VOTE.CSV split on raw
+commas, a dict per row) vs. VaCSVBillScraper's csv.reader indexes,
+checking both find the same votes.
+
+    $ cd scrapers && VIRGINIA_FTP_USER=x VIRGINIA_FTP_PASSWORD=x \
+        python -m va.tests.bench_csv_ingestion --bills 3000
+"""
+
+import argparse
+import csv
+import io
+import random
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+
+from va.csv_bills import VaCSVBillScraper
+
+VOTE_CODES = ["Y"] * 8 + ["N"] * 3 + ["X", "A"]
+
+
+def quoted(rows):
+    out = io.StringIO()
+    csv.writer(out, quoting=csv.QUOTE_ALL).writerows(rows)
+    return out.getvalue().encode()
+
+
+def session_files(bills, members=140, roll_calls_per_bill=2):
+    """Files the size of a full session's, about 17MB in all."""
+    house = ["H%04d" % n for n in range(1, 101)]
+    senate = ["S%02d" % n for n in range(1, members - 100 + 1)]
+    names = {
+        member: "%s, %s" % (random.choice(["Smith", "Jones", "Lee"]), member)
+        for member in house + senate
+    }
+    files = {
+        "Members.csv": quoted(
+            [["MBR_HOU", "MBR_MBRNO", "MBR_NAME"]]
+            + [[m[0], m, names[m]] for m in names]
+        )
+    }
+
+    bill_ids = ["HB%d" % n for n in range(1, bills + 1)]
+    sponsors, history, votes, summaries, bill_rows = [], [], [], [], []
+    refid = 0
+    for bill_id in bill_ids:
+        long_id = "HB%04d" % int(bill_id[2:])
+        for i, member in enumerate(random.sample(house, random.randint(1, 12))):
+            patron = "Chief Patron" if i == 0 else "Patron"
+            sponsors.append([names[member], member, long_id, patron])
+        for day in range(1, 21):
+            history.append([bill_id, "02/%02d/20" % day, "H Read first time", ""])
+        for _ in range(roll_calls_per_bill):
+            refid += 1
+            history.append([bill_id, "02/21/20", "H Passed House", "H%04d" % refid])
+            row = ["H%04d" % refid]
+            for member in house:
+                row += [member, random.choice(VOTE_CODES)]
+            votes.append(row)
+        summaries.append(
+            [long_id, "20101234D", "Introduced", "<p>%s</p>" % ("x" * 2000)]
+        )
+        bill_rows.append(
+            [bill_id, "Taxes; things.", "Smith", "N", "N", "N", "N", "N", "01/08/20"]
+            + ["HB1", "01/08/20"]
+            + [""] * 10
+        )
+
+    files["Sponsors.csv"] = quoted(
+        [["MEMBER_NAME", "MEMBER_ID", "BILL_NUMBER", "PATRON_TYPE"]] + sponsors
+    )
+    files["HISTORY.CSV"] = quoted(
+        [["Bill_id", "History_date", "History_description", "History_refid"]] + history
+    )
+    files["VOTE.CSV"] = quoted(votes)
+    files["Summaries.csv"] = quoted(
+        [["SUM_BILNO", "SUMMARY_DOCID", "SUMMARY_TYPE", "SUMMARY_TEXT"]] + summaries
+    )
+    files["BILLS.CSV"] = quoted(
+        [
+            [
+                "Bill_id",
+                "Bill_description",
+                "Patron_name",
+                "Passed",
+                "Failed",
+                "Carried_over",
+                "Approved",
+                "Vetoed",
+                "Introduction_date",
+            ]
+            + ["Full_text_%s%d" % (f, n) for n in range(1, 7) for f in ("doc", "date")]
+        ]
+        + bill_rows
+    )
+    return files
+
+
+class Response(object):
+    def __init__(self, content):
+        self.content = content
+        self.encoding = None
+        self.apparent_encoding = "utf-8"
+
+    @property
+    def text(self):
+        return self.content.decode(self.apparent_encoding)
+
+
+def whole_text(get):
+    """The loaders as they were, for comparison."""
+    members, sponsors, history, votes, bills, summaries = (
+        defaultdict(list) for _ in range(6)
+    )
+    for row in csv.reader(get("Members.csv").text.splitlines()):
+        members[row[1]].append(
+            {"chamber": row[0], "member_id": row[1], "name": row[2].strip()}
+        )
+    for row in csv.reader(get("Sponsors.csv").text.splitlines()):
+        sponsors[row[2]].append(
+            {
+                "member_name": row[0].strip(),
+                "member_id": row[1],
+                "bill_number": row[2],
+                "patron_type": row[3],
+            }
+        )
+    for row in csv.reader(get("HISTORY.CSV").text.splitlines()):
+        history[row[0]].append(
+            {
+                "bill_id": row[0],
+                "history_date": row[1],
+                "history_description": row[2],
+                "history_refid": row[3],
+            }
+        )
+    for line in get("VOTE.CSV").text.splitlines():
+        line = line.split(",")
+        history_refid = line[0].replace('"', "")
+        if len(line) > 1:
+            for v in range(1, len(line), 2):
+                if line[v] != '"H0000"' and len(members[line[v].replace('"', "")]) > 0:
+                    member = members[line[v].replace('"', "")][0]["name"]
+                    vote_result = line[v + 1].replace('"', "")
+                    vote_result = {
+                        "Y": "yes",
+                        "N": "no",
+                        "X": "not voting",
+                        "A": "abstain",
+                    }.get(vote_result, vote_result)
+                    votes[history_refid].append(
+                        {"member_id": member, "vote_result": vote_result}
+                    )
+    for row in csv.DictReader(get("BILLS.CSV").text.splitlines()):
+        bills[row["Bill_id"]].append(
+            dict(
+                row,
+                text_docs=[
+                    {
+                        "doc_abbr": row["Full_text_doc%d" % n],
+                        "doc_date": row["Full_text_date%d" % n],
+                    }
+                    for n in range(1, 7)
+                ],
+            )
+        )
+    for row in csv.reader(get("Summaries.csv").text.splitlines()):
+        summaries[row[0]].append({"summary_type": row[2], "summary_text": row[3]})
+    return members, sponsors, history, votes, bills, summaries
+
+
+def csv_indexes(get):
+    scraper = VaCSVBillScraper(None, tempfile.mkdtemp())
+    scraper.get = lambda url: get(url.rsplit("/", 1)[1])
+    scraper._url_base += "201/"
+    scraper.warning = lambda *args: None
+    scraper.load_members()
+    scraper.load_sponsors()
+    scraper.load_history()
+    scraper.load_votes()
+    scraper.load_bills()
+    scraper.load_summaries()
+    return scraper
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bills", type=int, default=3000)
+    args = parser.parse_args()
+
+    random.seed(0)
+    files = session_files(args.bills)
+    print("%.1f MB of CSV" % (sum(len(f) for f in files.values()) / 1e6))
+
+    def get(name):
+        return Response(files[name])
+
+    results = {}
+    for label, func in (("text", whole_text), ("csv", csv_indexes)):
+        start = time.perf_counter()
+        results[label] = func(get)
+        elapsed = time.perf_counter() - start
+        # again, for memory, since tracing slows everything down
+        tracemalloc.start()
+        result = func(get)
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(
+            "%-5s %8.3fs  peak %6.1f MB  kept %6.1f MB"
+            % (label, elapsed, peak / 1e6, current / 1e6)
+        )
+        del result
+
+    old_votes = results["text"][3]
+    new_votes = results["csv"]._votes
+    assert set(old_votes) == set(new_votes)
+    for refid, votes in old_votes.items():
+        assert [(v["member_id"], v["vote_result"]) for v in votes] == new_votes[refid]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+import os
+import tempfile
+import unittest
+
+os.environ.setdefault("VIRGINIA_FTP_USER", "user")
+os.environ.setdefault("VIRGINIA_FTP_PASSWORD", "password")
+
+from va.csv_bills import VaCSVBillScraper  # noqa: E402
+
+BILLS_HEADER = (
+    "Bill_id,Bill_description,Patron_id,Patron_name,Last_house_committee_id,"
+    "Last_house_action,Last_house_action_date,Last_senate_committee_id,"
+    "Last_senate_action,Last_senate_action_date,Last_conference_action,"
+    "Last_conference_action_date,Last_governor_action,Last_governor_action_date,"
+    "Emergency,Passed_house,Passed_senate,Passed,Failed,Continued,Approved,"
+    "Vetoed,Full_text_doc1,Full_text_date1,Full_text_doc2,Full_text_date2,"
+    "Full_text_doc3,Full_text_date3,Full_text_doc4,Full_text_date4,"
+    "Full_text_doc5,Full_text_date5,Full_text_doc6,Full_text_date6,"
+    "Last_actid,Last_action,Last_action_date,Introduction_date,Carried_over\r\n"
+)
+
+FILES = {
+    "Members.csv": (
+        '"MBR_HOU","MBR_MBRNO","MBR_NAME"\r\n'
+        '"H","H0001","Smith, Jane "\r\n'
+        '"H","H0002","Doe"\r\n'
+        '"H","H0003","Roe"\r\n'
+    ),
+    "Sponsors.csv": (
+        '"MEMBER_NAME","MEMBER_ID","BILL_NUMBER","PATRON_TYPE"\r\n'
+        '"Smith, Jane ","H0001","HB0001","Chief Patron"\r\n'
+        '"Doe","H0002","HB0001","Patron"\r\n'
+    ),
+    "FiscalImpactStatements.csv": '"BILL_NUMBER","HST_REFID"\r\n"HB0001","HB1F122"\r\n',
+    "Summaries.csv": (
+        '"SUM_BILNO","SUMMARY_DOCID","SUMMARY_TYPE","SUMMARY_TEXT"\r\n'
+        '"HB0001","20101234D","Introduced","<p>Requires\r\nthings.</p>"\r\n'
+    ),
+    "HISTORY.CSV": (
+        '"Bill_id","History_date","History_description","History_refid"\r\n'
+        '"HB1","01/08/20","H Prefiled and ordered printed; offered 01/08/20 20101234D",""\r\n'
+        '"HB1","02/04/20","H Passed House (2-1)","H0123"\r\n'
+    ),
+    "VOTE.CSV": (
+        '"H0123","H0001","Y","H0002","N","H0003","Y","H0000","Y","H0999","Y"\r\n'
+        '"H0124"\r\n'
+        "\r\n"
+    ),
+    "BILLS.CSV": BILLS_HEADER
+    + '"HB1","Taxes; things.","H0001","Smith",,,,,,,,,,,"N","Y","N","N","N","N","N",'
+    '"N","HB1","01/08/20",,,,,,,,,,,"",,,"01/08/20","N"\r\n',
+    "Amendments.csv": '"BILL_NUMBER","TXT_DOCID"\r\n"HB1","HB1AH1"\r\n',
+}
+
+
+class Response(object):
+    def __init__(self, content):
+        self.content = content
+        self.encoding = None
+        self.apparent_encoding = "utf-8"
+
+
+class CSVScraper(VaCSVBillScraper):
+    def get(self, url):
+        (name,) = [name for name in FILES if url.endswith("/" + name)]
+        return Response(FILES[name].encode())
+
+
+class CSVIngestionTest(unittest.TestCase):
+    def setUp(self):
+        self.scraper = CSVScraper(None, tempfile.mkdtemp())
+        self.scraper._url_base += "201/"
+        self.scraper.load_members()
+
+    def test_members(self):
+        self.assertEqual(self.scraper._members["H0001"], "Smith, Jane")
+
+    def test_votes(self):
+        self.scraper.load_votes()
+        self.assertEqual(
+            self.scraper._votes["H0123"],
+            [("Smith, Jane", "yes"), ("Doe", "no"), ("Roe", "yes")],
+        )
+        self.assertNotIn("H0124", self.scraper._votes)
+        # the same name and vote strings are shared by every roll call
+        self.assertIs(
+            self.scraper._votes["H0123"][0].member_name, self.scraper._members["H0001"]
+        )
+
+    def test_bills(self):
+        self.scraper.load_bills()
+        bill = self.scraper._bills["HB1"]
+        self.assertEqual(bill.patron_name, "Smith")
+        self.assertEqual(bill.text_docs[0], ("HB1", "01/08/20"))
+        self.assertEqual(bill.text_docs[1], ("", ""))
+
+    def test_scrape(self):
+        bill, vote = None, None
+        scraper = CSVScraper(None, tempfile.mkdtemp())
+        for obj in scraper.scrape("2020"):
+            if obj.__class__.__name__ == "Bill":
+                bill = obj
+            else:
+                vote = obj
+
+        self.assertEqual([s["name"] for s in bill.sponsorships], ["Smith, Jane", "Doe"])
+        self.assertEqual(bill.abstracts[0]["note"], "Introduced")
+        self.assertEqual(bill.abstracts[0]["abstract"], "Requires\r\nthings.")
+        self.assertEqual(len(bill.actions), 2)
+        self.assertEqual(
+            [v["note"] for v in bill.versions],
+            ["Prefiled and ordered printed; offered 01/08/20 20101234D"],
+        )
+        self.assertEqual(
+            sorted(d["note"] for d in bill.documents),
+            ["Amendment: HB1AH1", "Fiscal Impact Statement: HB1F122"],
+        )
+
+        counts = {c["option"]: c["value"] for c in vote.counts}
+        self.assertEqual((counts["yes"], counts["no"]), (2, 1))
+        self.assertEqual(vote.result, "pass")
+        self.assertEqual(
+            [(v["option"], v["voter_name"]) for v in vote.votes],
+            [("yes", "Smith, Jane"), ("no", "Doe"), ("yes", "Roe")],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -112,6 +112,7 @@ _categorizer_rules = (
 
 class Categorizer(BaseCategorizer):
     rules = _categorizer_rules
+    compiled = True
 
     def categorize(self, text):
         """Wrap categorize and add boilerplate committees.